@@ -30,4 +30,58 @@ class ExecutedTrade(BaseModel):
     quantity: float
     fill_price: float
     status: str # 'FILLED', 'PARTIALLY_FILLED', 'REJECTED'
-    timestamp: str # Consider datetime object
\ No newline at end of file
+    timestamp: str # Consider datetime object
+
+class ArticleRecord:
+    """
+    Compact, slotted article record used on the ingestion -> sentiment hot path.
+    Holds only the fields downstream stages read. Supports the dict-style `get` and
+    `[]` access the pipeline already uses, so it can stand in for the old article dicts.
+    The raw feed entry is only kept when explicitly requested.
+    """
+
+    __slots__ = (
+        "title",
+        "link",
+        "published_date",
+        "content",
+        "source_type",
+        "original_entry",
+    )
+
+    def __init__(
+        self,
+        title: str,
+        link: str,
+        published_date: str,
+        content: str,
+        source_type: str,
+        original_entry: dict = None,
+    ):
+        self.title = title
+        self.link = link
+        self.published_date = published_date
+        self.content = content
+        self.source_type = source_type
+        self.original_entry = original_entry
+
+    def get(self, key: str, default=None):
+        if key in self.__slots__:
+            value = getattr(self, key)
+            return default if value is None else value
+        return default
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def to_dict(self) -> dict:
+        """Returns the record as a plain dict (omitting `original_entry` if not kept)."""
+        return {key: getattr(self, key) for key in self.__slots__ if key in self}
+
+    def __repr__(self) -> str:
+        return f"ArticleRecord(title={self.title!r}, link={self.link!r})"
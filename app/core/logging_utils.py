@@ -0,0 +1,60 @@
+# app/core/logging_utils.py
+# Leveled, sampled logging for hot paths. DEBUG/INFO messages from a call site are only
+# emitted once every `sample_every` calls; WARNING and above always go through. When
+# the level is disabled a call costs one `isEnabledFor` check and formats nothing.
+import logging
+import os
+import threading
+
+DEFAULT_SAMPLE_EVERY = int(os.environ.get("LOG_SAMPLE_EVERY", "100"))
+
+
+class SampledLogger:
+    """
+    Wraps a `logging.Logger`, sampling DEBUG and INFO per message template (the format
+    string), so a message repeated once per article logs at 1/`sample_every` of the rate
+    while distinct messages are still seen. Use %-style arguments, not f-strings, so
+    suppressed messages are never formatted.
+    """
+
+    __slots__ = ("logger", "sample_every", "_seen", "_lock")
+
+    def __init__(
+        self, logger: logging.Logger, sample_every: int = DEFAULT_SAMPLE_EVERY
+    ):
+        self.logger = logger
+        self.sample_every = max(1, sample_every)
+        self._seen = {}  # message template -> calls so far
+        self._lock = threading.Lock()  # call sites log from many threads
+
+    def _sampled(self, level: int, msg: str, args: tuple, kwargs: dict):
+        if not self.logger.isEnabledFor(level):
+            return
+        with self._lock:
+            calls = self._seen.get(msg, 0)
+            self._seen[msg] = calls + 1
+        if calls % self.sample_every == 0:
+            kwargs.setdefault("stacklevel", 3)
+            self.logger.log(level, msg, *args, **kwargs)
+
+    def debug(self, msg: str, *args, **kwargs):
+        self._sampled(logging.DEBUG, msg, args, kwargs)
+
+    def info(self, msg: str, *args, **kwargs):
+        self._sampled(logging.INFO, msg, args, kwargs)
+
+    def warning(self, msg: str, *args, **kwargs):
+        self.logger.warning(msg, *args, **kwargs)
+
+    def error(self, msg: str, *args, **kwargs):
+        self.logger.error(msg, *args, **kwargs)
+
+    def exception(self, msg: str, *args, **kwargs):
+        self.logger.exception(msg, *args, **kwargs)
+
+
+def get_sampled_logger(
+    name: str, sample_every: int = DEFAULT_SAMPLE_EVERY
+) -> SampledLogger:
+    """Sampled logger for module `name` (pass `__name__`)."""
+    return SampledLogger(logging.getLogger(name), sample_every)
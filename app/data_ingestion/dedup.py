@@ -0,0 +1,228 @@
+# app/data_ingestion/dedup.py
+import hashlib
+import math
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterable, Iterator
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core.metrics import metrics
+
+# Query parameters that only carry tracking information and never change the article.
+_TRACKING_PARAM_PREFIXES = ("utm_", "mc_", "ga_")
+_TRACKING_PARAMS = {"fbclid", "gclid", "ncid", "soc_src", "soc_trk", "cmpid", ".tsrc"}
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+# Texts shorter than this (in normalized words) are too generic to identify a story:
+# boilerplate summaries like "Read more..." would make unrelated articles collide.
+MIN_FINGERPRINT_TOKENS = 8
+# Inserts between commits within one `filter_new` call.
+_COMMIT_EVERY = 256
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes an article URL so trivially different links to the same story compare equal:
+    lowercases scheme and host, drops 'www.', fragments, tracking parameters and trailing
+    slashes, and sorts the remaining query parameters.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in _TRACKING_PARAMS and not key.startswith(_TRACKING_PARAM_PREFIXES)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(query), ""))
+
+
+def content_fingerprint(text: str, min_tokens: int = MIN_FINGERPRINT_TOKENS) -> str:
+    """
+    Fingerprint of an article's text that ignores markup, case, punctuation and whitespace,
+    so syndicated copies of the same story hash identically. Returns "" for texts of fewer
+    than `min_tokens` words.
+    """
+    normalized = _NON_WORD_RE.sub(" ", _TAG_RE.sub(" ", text or "").lower()).strip()
+    if not normalized or normalized.count(" ") + 1 < min_tokens:
+        return ""
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings. Memory is bounded by `expected_items` and
+    `false_positive_rate`; membership tests may return false positives but never false negatives.
+    """
+
+    def __init__(self, expected_items: int, false_positive_rate: float = 0.01):
+        num_bits = int(
+            -expected_items * math.log(false_positive_rate) / (math.log(2) ** 2)
+        )
+        self.num_bits = max(num_bits, 8)
+        self.num_hashes = max(1, round(self.num_bits / expected_items * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> Iterator[int]:
+        # Kirsch-Mitzenmacher double hashing from one 128-bit digest.
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key)
+        )
+
+    def clear(self):
+        self._bits = bytearray(len(self._bits))
+
+
+class ArticleDeduplicator:
+    """
+    Persistent, cross-run article deduplication index.
+    Each article is keyed on both its normalized URL and its content fingerprint, so the
+    same story is dropped whether it reappears under the same link or is syndicated
+    elsewhere. An in-memory Bloom filter answers most lookups for unseen articles without
+    touching disk; only possible hits are confirmed against the SQLite-backed set, which
+    also holds first-seen timestamps for time-based expiry. Expired keys are purged (and
+    the Bloom filter rebuilt) every `purge_interval` seconds while articles are filtered.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: float = 7 * 24 * 3600,
+        expected_items: int = 1_000_000,
+        false_positive_rate: float = 0.01,
+        purge_interval: float = 3600.0,
+    ):
+        """
+        Initializes the index, loading unexpired keys from `db_path` into the Bloom filter.
+        Args:
+            db_path (str): SQLite database file backing the index (':memory:' for tests).
+            ttl_seconds (float, optional): How long a seen article suppresses repeats. Defaults to 7 days.
+            expected_items (int, optional): Bloom filter sizing; memory is about 1.2 bytes per item at 1% FPR.
+            false_positive_rate (float, optional): Target Bloom filter false positive rate.
+            purge_interval (float, optional): Seconds between purges of expired keys.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+        self._bloom = BloomFilter(expected_items, false_positive_rate)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_keys (key TEXT PRIMARY KEY, first_seen REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS seen_keys_first_seen ON seen_keys (first_seen)"
+        )
+        self.purge_expired()
+
+    @staticmethod
+    def article_keys(article: dict) -> list[str]:
+        """
+        Returns the dedup keys for an article: normalized URL and content fingerprint (of the
+        content, or the title if the content is too short to fingerprint).
+        """
+        keys = []
+        url = normalize_url(article.get("link", ""))
+        if url:
+            keys.append("u:" + url)
+        fingerprint = content_fingerprint(
+            article.get("content", "")
+        ) or content_fingerprint(article.get("title", ""))
+        if fingerprint:
+            keys.append("c:" + fingerprint)
+        return keys
+
+    def _seen(self, keys: list[str], now: float) -> bool:
+        candidates = [key for key in keys if key in self._bloom]
+        if not candidates:
+            return False
+        placeholders = ",".join("?" * len(candidates))
+        row = self._conn.execute(
+            f"SELECT 1 FROM seen_keys WHERE key IN ({placeholders}) AND first_seen >= ? LIMIT 1",
+            (*candidates, now - self.ttl_seconds),
+        ).fetchone()
+        return row is not None
+
+    def is_duplicate(self, article: dict) -> bool:
+        """Returns True if the article (by URL or content) was seen within the TTL."""
+        with self._lock:
+            return self._seen(self.article_keys(article), time.time())
+
+    def filter_new(self, articles: Iterable[dict]) -> Iterator[dict]:
+        """
+        Yields only articles not seen within the TTL (including earlier in the same batch)
+        and records them as seen. Articles without a URL or any text are passed through.
+        New keys are committed every few hundred articles and when the iteration ends.
+        """
+        uncommitted = 0
+        try:
+            for article in articles:
+                keys = self.article_keys(article)
+                if not keys:
+                    yield article
+                    continue
+                with self._lock:
+                    now = time.time()
+                    if now >= self._next_purge:
+                        self._purge_expired(now)
+                    if self._seen(keys, now):
+                        metrics.count("duplicate_articles_dropped")
+                        continue
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO seen_keys (key, first_seen) VALUES (?, ?)",
+                        [(key, now) for key in keys],
+                    )
+                    uncommitted += 1
+                    if uncommitted >= _COMMIT_EVERY:
+                        self._conn.commit()
+                        uncommitted = 0
+                    for key in keys:
+                        self._bloom.add(key)
+                yield article
+        finally:
+            if uncommitted:
+                with self._lock:
+                    self._conn.commit()
+
+    def _purge_expired(self, now: float):
+        # Caller holds self._lock.
+        self._conn.execute(
+            "DELETE FROM seen_keys WHERE first_seen < ?", (now - self.ttl_seconds,)
+        )
+        self._conn.commit()
+        self._bloom.clear()
+        for (key,) in self._conn.execute("SELECT key FROM seen_keys"):
+            self._bloom.add(key)
+        self._next_purge = now + self.purge_interval
+        metrics.count("dedup_purges")
+
+    def purge_expired(self):
+        """Deletes expired keys from disk and rebuilds the Bloom filter from what remains."""
+        with self._lock:
+            self._purge_expired(time.time())
+
+    def close(self):
+        """Closes the backing database."""
+        with self._lock:
+            self._conn.close()
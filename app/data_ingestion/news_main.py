@@ -1,22 +1,143 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator
+from urllib.parse import urlsplit
+
+from app.data_ingestion.dedup import ArticleDeduplicator
+from app.data_ingestion.scrapers.feed_cache import FeedValidatorCache
 from app.data_ingestion.scrapers.rss_scraper import (
     fetch_articles_from_rss,
     parse_rss_article,
 )
 
+# Defaults for concurrent ingestion. Feeds are mostly I/O bound, so a thread pool
+# far wider than the core count is fine; the per-host cap keeps us polite to
+# providers that serve many of our feeds (e.g. Yahoo).
+DEFAULT_MAX_WORKERS = 32
+DEFAULT_MAX_PER_HOST = 4
+DEFAULT_FEED_TIMEOUT = 10.0
+
+
+def run_news_ingestion_pipeline(
+    sources_config: list[dict],
+    concurrent: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    feed_timeout: float = DEFAULT_FEED_TIMEOUT,
+    feed_cache: FeedValidatorCache = None,
+    deduplicator: ArticleDeduplicator = None,
+    keep_original_entry: bool = False,
+) -> list[dict]:
+    """
+    Orchestrates the fetching and initial processing of news from RSS sources.
+    Args:
+        sources_config (list[dict]): Source definitions, each with 'type' and 'url'.
+        concurrent (bool, optional): Fetch feeds in parallel so the cycle time tracks the
+                                     slowest feed instead of the sum of all feeds.
+        max_workers (int, optional): Size of the fetch thread pool (concurrent mode only).
+        max_per_host (int, optional): Maximum simultaneous requests to one host (concurrent mode only).
+        feed_timeout (float, optional): Per-feed download deadline in seconds (concurrent mode only).
+        feed_cache (FeedValidatorCache, optional): Enables conditional GETs and drops entries
+                                                   already seen on the previous poll. Saved
+                                                   after each run.
+        deduplicator (ArticleDeduplicator, optional): Drops articles already ingested in
+                                                      this or an earlier run (by URL or content).
+        keep_original_entry (bool, optional): Keep the raw feed entry under 'original_entry'
+                                              on each article.
+    Returns:
+        list[dict]: Parsed articles from all sources.
+    """
+    if concurrent:
+        articles = iter_news_ingestion_concurrent(
+            sources_config,
+            max_workers=max_workers,
+            max_per_host=max_per_host,
+            feed_timeout=feed_timeout,
+            feed_cache=feed_cache,
+            keep_original_entry=keep_original_entry,
+        )
+        if deduplicator is not None:
+            articles = deduplicator.filter_new(articles)
+        return list(articles)
 
-def run_news_ingestion_pipeline(sources_config: list[dict]) -> list[dict]:
-    """Orchestrates the fetching and initial processing of news from RSS sources."""
     articles = []
     for source in sources_config:
         if source["type"] == "rss":
             rss_url = source["url"]
-            raw_articles = fetch_articles_from_rss(rss_url)
+            raw_articles = fetch_articles_from_rss(rss_url, feed_cache=feed_cache)
             for raw_article in raw_articles:
-                article = parse_rss_article(raw_article)
+                article = parse_rss_article(
+                    raw_article, keep_original_entry=keep_original_entry
+                )
                 articles.append(article)
+    if feed_cache is not None:
+        feed_cache.save()
+    if deduplicator is not None:
+        articles = list(deduplicator.filter_new(articles))
     return articles
 
 
+def iter_rss_feeds_concurrent(
+    sources_config: list[dict],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    feed_timeout: float = DEFAULT_FEED_TIMEOUT,
+    feed_cache: FeedValidatorCache = None,
+) -> Iterator[tuple[dict, list[dict]]]:
+    """
+    Fetches all RSS sources on a thread pool and yields `(source, raw_entries)` as each
+    feed completes, fastest first. A slow or failing feed only delays itself.
+    """
+    rss_sources = [source for source in sources_config if source["type"] == "rss"]
+    if not rss_sources:
+        return
+
+    # One semaphore per host caps concurrent connections to that host.
+    host_slots = {
+        urlsplit(source["url"]).netloc: threading.BoundedSemaphore(max_per_host)
+        for source in rss_sources
+    }
+
+    def _fetch(source: dict) -> list[dict]:
+        with host_slots[urlsplit(source["url"]).netloc]:
+            return fetch_articles_from_rss(
+                source["url"], timeout=feed_timeout, feed_cache=feed_cache
+            )
+
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(rss_sources)))
+    try:
+        futures = {pool.submit(_fetch, source): source for source in rss_sources}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # If the consumer stops early, don't start feeds nobody will read.
+        pool.shutdown(wait=False, cancel_futures=True)
+        if feed_cache is not None:
+            feed_cache.save()
+
+
+def iter_news_ingestion_concurrent(
+    sources_config: list[dict],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    feed_timeout: float = DEFAULT_FEED_TIMEOUT,
+    feed_cache: FeedValidatorCache = None,
+    keep_original_entry: bool = False,
+) -> Iterator[dict]:
+    """Yields parsed articles as soon as the feed they belong to has been fetched."""
+    for _, raw_articles in iter_rss_feeds_concurrent(
+        sources_config,
+        max_workers=max_workers,
+        max_per_host=max_per_host,
+        feed_timeout=feed_timeout,
+        feed_cache=feed_cache,
+    ):
+        for raw_article in raw_articles:
+            yield parse_rss_article(
+                raw_article, keep_original_entry=keep_original_entry
+            )
+
+
 def store_raw_articles(articles: list[dict]):
     """Stores raw fetched articles into the database/data store."""
     # Placeholder for database interaction
@@ -27,3 +148,64 @@ def store_raw_articles(articles: list[dict]):
     #     save_article(article_data, db_session)
     # db_session.close()
     pass
+
+
+if __name__ == "__main__":
+    # Benchmark: sequential vs concurrent ingestion against a local HTTP server
+    # that serves small RSS feeds with an artificial per-feed latency.
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    NUM_FEEDS = 40
+    MAX_LATENCY = 0.5  # seconds; latencies are spread evenly up to this value
+
+    rss_body = (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>Bench</title>'
+        + "".join(
+            f"<item><title>Story {i}</title><link>http://example.com/{i}</link>"
+            f"<description>Body of story {i}</description></item>"
+            for i in range(20)
+        )
+        + "</channel></rss>"
+    ).encode()
+
+    class _LatencyFeedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            feed_index = int(self.path.strip("/").split("/")[-1])
+            time.sleep(MAX_LATENCY * (feed_index + 1) / NUM_FEEDS)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(rss_body)))
+            self.end_headers()
+            self.wfile.write(rss_body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LatencyFeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    bench_sources = [
+        {"type": "rss", "url": f"{base_url}/feed/{i}", "name": f"feed-{i}"}
+        for i in range(NUM_FEEDS)
+    ]
+
+    start = time.perf_counter()
+    sequential_articles = run_news_ingestion_pipeline(bench_sources)
+    sequential_elapsed = time.perf_counter() - start
+
+    # All feeds share one host here, so lift the per-host cap to measure the pool itself.
+    start = time.perf_counter()
+    concurrent_articles = run_news_ingestion_pipeline(
+        bench_sources, concurrent=True, max_per_host=NUM_FEEDS
+    )
+    concurrent_elapsed = time.perf_counter() - start
+
+    server.shutdown()
+    print(f"\nFeeds: {NUM_FEEDS}, slowest feed latency: {MAX_LATENCY:.2f}s")
+    print(
+        f"Sequential: {len(sequential_articles)} articles in {sequential_elapsed:.2f}s"
+    )
+    print(
+        f"Concurrent: {len(concurrent_articles)} articles in {concurrent_elapsed:.2f}s"
+    )
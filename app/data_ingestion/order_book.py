@@ -0,0 +1,360 @@
+# app/data_ingestion/order_book.py
+# Limit order book (LOB) engine fed by incremental add / modify / delete messages.
+# Prices are integer ticks. Each side keeps its price levels in a sorted array
+# (binary search on insert/remove) plus a level -> aggregate size map, so best
+# bid/ask is O(1), level updates are O(log n) to locate, and depth-N is O(N).
+# Ask levels are stored negated so that on both sides the best level is the last
+# element: top-of-book inserts and removals never shift the array.
+# Recorded message files are fixed-width binary records (see MESSAGE_DTYPE) that
+# replay without any per-message parsing.
+import bisect
+from typing import Callable
+
+import numpy as np
+
+MSG_ADD = 0
+MSG_MODIFY = 1
+MSG_DELETE = 2
+
+SIDE_BID = 0
+SIDE_ASK = 1
+
+# One recorded message. `price` is in ticks; `quantity` is the new resting size for
+# MODIFY and is ignored for DELETE.
+MESSAGE_DTYPE = np.dtype(
+    [
+        ("timestamp", "<i8"),
+        ("msg_type", "u1"),
+        ("side", "u1"),
+        ("order_id", "<u8"),
+        ("price", "<i8"),
+        ("quantity", "<i8"),
+    ]
+)
+
+
+class _BookSide:
+    """
+    One side of the book: ascending array of level keys plus aggregate size per level.
+    A level's key is its price for bids and minus its price for asks, so the best level
+    is always the last key.
+    """
+
+    __slots__ = ("is_bid", "sign", "prices", "sizes")
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self.sign = 1 if is_bid else -1
+        self.prices = []  # ascending level keys (sign * price tick) with non-zero size
+        self.sizes = {}  # price tick -> aggregate resting quantity
+
+    def add(self, price: int, quantity: int):
+        size = self.sizes.get(price)
+        if size is None:
+            bisect.insort(self.prices, self.sign * price)
+            self.sizes[price] = quantity
+        else:
+            self.sizes[price] = size + quantity
+
+    def remove(self, price: int, quantity: int):
+        remaining = self.sizes[price] - quantity
+        if remaining > 0:
+            self.sizes[price] = remaining
+        else:
+            del self.sizes[price]
+            prices = self.prices
+            key = self.sign * price
+            # Most activity happens at the top of book, the end of the array.
+            if prices[-1] == key:
+                prices.pop()
+            else:
+                del prices[bisect.bisect_left(prices, key)]
+
+    def best(self) -> int | None:
+        if not self.prices:
+            return None
+        return self.sign * self.prices[-1]
+
+    def depth(self, levels: int) -> list[tuple[int, int]]:
+        sign = self.sign
+        return [
+            (sign * key, self.sizes[sign * key]) for key in self.prices[-levels:][::-1]
+        ]
+
+
+class OrderBook:
+    """
+    Order-by-order limit order book for one instrument.
+    Maintains resting orders by ID and aggregate size per price level, and answers
+    top-of-book queries without scanning the book.
+    """
+
+    def __init__(self, symbol: str = "", tick_size: float = 0.01):
+        """
+        Args:
+            symbol (str, optional): Instrument symbol, for reporting.
+            tick_size (float, optional): Price of one tick, used to convert ticks to prices.
+        """
+        self.symbol = symbol
+        self.tick_size = tick_size
+        self.bids = _BookSide(is_bid=True)
+        self.asks = _BookSide(is_bid=False)
+        self.orders = {}  # order_id -> (side, price_tick, quantity)
+        self.last_timestamp = None
+        self.messages_applied = 0
+
+    def _side(self, side: int) -> _BookSide:
+        return self.bids if side == SIDE_BID else self.asks
+
+    def add_order(self, order_id: int, side: int, price: int, quantity: int):
+        """Adds a new resting order. Re-using a live order ID replaces the old order."""
+        if order_id in self.orders:
+            self.delete_order(order_id)
+        self.orders[order_id] = (side, price, quantity)
+        self._side(side).add(price, quantity)
+
+    def modify_order(self, order_id: int, quantity: int, price: int = None):
+        """
+        Changes an order's resting size (and optionally its price). A size of zero or less
+        deletes the order. Unknown order IDs are ignored.
+        """
+        order = self.orders.get(order_id)
+        if order is None:
+            return
+        side, old_price, old_quantity = order
+        if quantity <= 0:
+            self.delete_order(order_id)
+            return
+        book_side = self._side(side)
+        if price is None or price == old_price:
+            if quantity > old_quantity:
+                book_side.add(old_price, quantity - old_quantity)
+            elif quantity < old_quantity:
+                book_side.remove(old_price, old_quantity - quantity)
+            self.orders[order_id] = (side, old_price, quantity)
+        else:
+            book_side.remove(old_price, old_quantity)
+            book_side.add(price, quantity)
+            self.orders[order_id] = (side, price, quantity)
+
+    def delete_order(self, order_id: int):
+        """Removes an order from the book. Unknown order IDs are ignored."""
+        order = self.orders.pop(order_id, None)
+        if order is not None:
+            side, price, quantity = order
+            self._side(side).remove(price, quantity)
+
+    def best_bid(self) -> tuple[int, int] | None:
+        """Returns `(price_tick, size)` of the best bid, or None if the side is empty."""
+        price = self.bids.best()
+        return None if price is None else (price, self.bids.sizes[price])
+
+    def best_ask(self) -> tuple[int, int] | None:
+        """Returns `(price_tick, size)` of the best ask, or None if the side is empty."""
+        price = self.asks.best()
+        return None if price is None else (price, self.asks.sizes[price])
+
+    def depth(self, levels: int = 5) -> dict[str, list[tuple[int, int]]]:
+        """Returns the top `levels` price levels per side as `(price_tick, size)`, best first."""
+        return {"bids": self.bids.depth(levels), "asks": self.asks.depth(levels)}
+
+    def mid_price(self) -> float | None:
+        """Midpoint of best bid and ask in price units, or None if either side is empty."""
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2 * self.tick_size
+
+    def microprice(self) -> float | None:
+        """
+        Size-weighted mid: leans toward the side with less resting size, which is the
+        side more likely to be taken out next.
+        """
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        (bid_price, bid_size), (ask_price, ask_size) = bid, ask
+        return (
+            (bid_price * ask_size + ask_price * bid_size)
+            / (bid_size + ask_size)
+            * self.tick_size
+        )
+
+    def apply_messages(
+        self, messages: np.ndarray, on_message: Callable[["OrderBook"], None] = None
+    ) -> int:
+        """
+        Applies an array of MESSAGE_DTYPE records in order.
+        Args:
+            messages (np.ndarray): Structured array of messages.
+            on_message (Callable, optional): Called with the book after each message
+                                             (e.g. to sample features). Slows replay.
+        Returns:
+            int: Number of messages applied.
+        Raises:
+            ValueError: If any message has an unknown `msg_type` or `side`; nothing is
+                        applied in that case.
+        """
+        if len(messages) == 0:
+            return 0
+        if messages["msg_type"].max() > MSG_DELETE:
+            bad = int(messages["msg_type"][messages["msg_type"] > MSG_DELETE][0])
+            raise ValueError(f"Unknown msg_type {bad} in message batch")
+        if messages["side"].max() > SIDE_ASK:
+            bad = int(messages["side"][messages["side"] > SIDE_ASK][0])
+            raise ValueError(f"Unknown side {bad} in message batch")
+        # Plain Python lists iterate far faster than indexing a structured array per message.
+        columns = zip(
+            messages["msg_type"].tolist(),
+            messages["side"].tolist(),
+            messages["order_id"].tolist(),
+            messages["price"].tolist(),
+            messages["quantity"].tolist(),
+        )
+        # The ADD and DELETE paths (the bulk of real feeds) are inlined with local
+        # bindings; MODIFY goes through the method.
+        orders = self.orders
+        level_prices = (self.bids.prices, self.asks.prices)
+        level_sizes = (self.bids.sizes, self.asks.sizes)
+        level_signs = (self.bids.sign, self.asks.sign)
+        insort = bisect.insort
+        bisect_left = bisect.bisect_left
+        for msg_type, side, order_id, price, quantity in columns:
+            if msg_type == MSG_ADD:
+                if order_id in orders:
+                    self.delete_order(order_id)
+                orders[order_id] = (side, price, quantity)
+                sizes = level_sizes[side]
+                size = sizes.get(price)
+                if size is None:
+                    prices = level_prices[side]
+                    key = level_signs[side] * price
+                    if not prices or key > prices[-1]:
+                        prices.append(key)  # new best level
+                    else:
+                        insort(prices, key)
+                    sizes[price] = quantity
+                else:
+                    sizes[price] = size + quantity
+            elif msg_type == MSG_DELETE:
+                order = orders.pop(order_id, None)
+                if order is not None:
+                    side, price, quantity = order
+                    sizes = level_sizes[side]
+                    remaining = sizes[price] - quantity
+                    if remaining > 0:
+                        sizes[price] = remaining
+                    else:
+                        del sizes[price]
+                        prices = level_prices[side]
+                        key = level_signs[side] * price
+                        if prices[-1] == key:
+                            prices.pop()
+                        else:
+                            del prices[bisect_left(prices, key)]
+            else:  # MSG_MODIFY; other types were rejected above
+                self.modify_order(order_id, quantity, price)
+            if on_message is not None:
+                on_message(self)
+        self.messages_applied += len(messages)
+        self.last_timestamp = int(messages["timestamp"][-1])
+        return len(messages)
+
+
+def write_message_file(path: str, messages: np.ndarray):
+    """Writes MESSAGE_DTYPE records to `path` in the raw replay format."""
+    np.asarray(messages, dtype=MESSAGE_DTYPE).tofile(path)
+
+
+def load_message_file(path: str) -> np.ndarray:
+    """Memory-maps a recorded message file as a read-only MESSAGE_DTYPE array."""
+    return np.memmap(path, dtype=MESSAGE_DTYPE, mode="r")
+
+
+def replay_message_file(
+    path: str, book: OrderBook = None, chunk_size: int = 1_000_000
+) -> OrderBook:
+    """
+    Replays a recorded message file into `book` (a new book if omitted), chunk by chunk
+    so memory stays bounded for very large files.
+    """
+    book = book if book is not None else OrderBook()
+    messages = load_message_file(path)
+    for start in range(0, len(messages), chunk_size):
+        book.apply_messages(messages[start : start + chunk_size])
+    return book
+
+
+def generate_synthetic_messages(
+    num_messages: int, mid_tick: int = 10_000, seed: int = 0
+) -> np.ndarray:
+    """
+    Generates a plausible random message stream around `mid_tick` (roughly 50% adds,
+    35% deletes, 15% modifies of live orders). Used for benchmarks and demos.
+    """
+    rng = np.random.default_rng(seed)
+    kinds = rng.random(num_messages).tolist()
+    offsets = rng.geometric(0.15, num_messages).tolist()
+    new_sides = rng.integers(0, 2, num_messages).tolist()
+    sizes = (rng.integers(1, 50, num_messages) * 100).tolist()
+    picks = rng.random(num_messages).tolist()
+    msg_types, sides, order_ids, prices, quantities = [], [], [], [], []
+    live = []  # (order_id, side, price) of resting orders
+    next_order_id = 1
+    for i in range(num_messages):
+        if kinds[i] < 0.5 or len(live) < 100:
+            side = new_sides[i]
+            price = mid_tick - offsets[i] if side == SIDE_BID else mid_tick + offsets[i]
+            order_id, msg_type, quantity = next_order_id, MSG_ADD, sizes[i]
+            live.append((order_id, side, price))
+            next_order_id += 1
+        else:
+            j = int(picks[i] * len(live))
+            order_id, side, price = live[j]
+            if kinds[i] < 0.85:
+                live[j] = live[-1]
+                live.pop()
+                msg_type, quantity = MSG_DELETE, 0
+            else:
+                msg_type, quantity = MSG_MODIFY, sizes[i]
+        msg_types.append(msg_type)
+        sides.append(side)
+        order_ids.append(order_id)
+        prices.append(price)
+        quantities.append(quantity)
+
+    messages = np.zeros(num_messages, dtype=MESSAGE_DTYPE)
+    messages["timestamp"] = np.arange(num_messages, dtype=np.int64) * 1_000
+    messages["msg_type"] = msg_types
+    messages["side"] = sides
+    messages["order_id"] = order_ids
+    messages["price"] = prices
+    messages["quantity"] = quantities
+    return messages
+
+
+if __name__ == "__main__":
+    # Throughput benchmark: replay a recorded synthetic message file.
+    import os
+    import tempfile
+    import time
+
+    NUM_MESSAGES = 2_000_000
+
+    print(f"Generating {NUM_MESSAGES:,} synthetic messages...")
+    messages = generate_synthetic_messages(NUM_MESSAGES)
+    with tempfile.TemporaryDirectory(prefix="lob_") as tmp_dir:
+        path = os.path.join(tmp_dir, "messages.bin")
+        write_message_file(path, messages)
+
+        start = time.perf_counter()
+        book = replay_message_file(path, OrderBook(symbol="SYNTH", tick_size=0.01))
+        elapsed = time.perf_counter() - start
+    print(
+        f"Replayed {book.messages_applied:,} messages in {elapsed:.2f}s "
+        f"({book.messages_applied / elapsed / 1e6:.2f}M msg/s)"
+    )
+    print(f"Resting orders: {len(book.orders):,}")
+    print(f"Best bid: {book.best_bid()}, best ask: {book.best_ask()}")
+    print(f"Mid: {book.mid_price()}, microprice: {book.microprice():.4f}")
+    print(f"Depth-3: {book.depth(3)}")
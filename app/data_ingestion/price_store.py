@@ -0,0 +1,311 @@
+# app/data_ingestion/price_store.py
+# On-disk columnar store for OHLCV bars.
+# Each symbol is a directory holding one flat binary file per column
+# (timestamp as int64 nanoseconds since the epoch, prices and volume as float64).
+# Appends write raw bytes to the end of each column file; reads memory-map the
+# columns, binary-search the timestamps and copy out only the requested window.
+# At most `max_open_maps` columns stay mapped (each map holds a file descriptor);
+# the least recently used are closed beyond that.
+import mmap
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+_COLUMN_DTYPES = {"timestamp": np.int64, **{c: np.float64 for c in OHLCV_COLUMNS}}
+DEFAULT_MAX_OPEN_MAPS = 256
+
+
+def to_epoch_ns(value) -> int:
+    """Converts a date string, datetime, np.datetime64 or epoch-ns int to epoch nanoseconds."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if hasattr(value, "tzinfo") and value.tzinfo is not None:
+        value = value.replace(tzinfo=None) - value.utcoffset()
+    return int(np.datetime64(value, "ns").astype(np.int64))
+
+
+class PriceStore:
+    """
+    Memory-mapped columnar store of OHLCV bars, one directory per symbol.
+    Bars must be appended in increasing timestamp order; bars at or before the last
+    stored timestamp are skipped, so re-appending an overlapping download is safe.
+    """
+
+    def __init__(self, root_dir: str, max_open_maps: int = DEFAULT_MAX_OPEN_MAPS):
+        """
+        Args:
+            root_dir (str): Directory holding the store. Created if missing.
+            max_open_maps (int, optional): Column files kept memory-mapped at once. Each map
+                                           holds an open file descriptor, so keep this well
+                                           under the process fd limit.
+        """
+        self.root_dir = root_dir
+        self.max_open_maps = max(max_open_maps, len(_COLUMN_DTYPES))
+        os.makedirs(root_dir, exist_ok=True)
+        # (symbol, column) -> (mmap or None, array over it), least recently used first
+        self._maps = OrderedDict()
+        self._lengths = {}  # symbol -> number of complete bars on disk
+        self._lock = threading.Lock()
+
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.root_dir, symbol.upper())
+
+    def _column_path(self, symbol: str, column: str) -> str:
+        return os.path.join(self._symbol_dir(symbol), f"{column}.bin")
+
+    def symbols(self) -> list[str]:
+        """Returns the symbols present in the store."""
+        return sorted(
+            name
+            for name in os.listdir(self.root_dir)
+            if os.path.isdir(os.path.join(self.root_dir, name))
+        )
+
+    def _num_bars(self, symbol: str) -> int:
+        # Caller holds self._lock. A crash mid-append can leave columns of unequal
+        # length; trust the shortest (the next append truncates the rest to match).
+        num_bars = self._lengths.get(symbol)
+        if num_bars is None:
+            sizes = []
+            for column, dtype in _COLUMN_DTYPES.items():
+                path = self._column_path(symbol, column)
+                size = os.path.getsize(path) if os.path.exists(path) else 0
+                sizes.append(size // np.dtype(dtype).itemsize)
+            num_bars = min(sizes)
+            self._lengths[symbol] = num_bars
+        return num_bars
+
+    def _timestamp_at(self, symbol: str, index: int) -> int:
+        # Caller holds self._lock. Reads one value without mapping the column.
+        itemsize = np.dtype(np.int64).itemsize
+        with open(self._column_path(symbol, "timestamp"), "rb") as f:
+            f.seek(index * itemsize)
+            return int(np.frombuffer(f.read(itemsize), dtype=np.int64)[0])
+
+    def _close_map(self, key: tuple):
+        # Caller holds self._lock.
+        entry = self._maps.pop(key, None)
+        if entry is None or entry[0] is None:
+            return
+        mapped = entry[0]
+        del entry
+        try:
+            mapped.close()
+        except BufferError:
+            pass  # a reader still holds the array; the map closes once it is freed
+
+    def _column(self, symbol: str, column: str) -> np.ndarray | None:
+        """Returns a read-only array over the memory-mapped column file, or None if missing."""
+        symbol = symbol.upper()
+        key = (symbol, column)
+        with self._lock:
+            entry = self._maps.get(key)
+            if entry is not None:
+                self._maps.move_to_end(key)
+                return entry[1]
+            if not os.path.isdir(self._symbol_dir(symbol)):
+                return None
+            num_bars = self._num_bars(symbol)
+            dtype = _COLUMN_DTYPES[column]
+            mapped = None
+            if num_bars == 0:
+                values = np.empty(0, dtype=dtype)
+            else:
+                with open(self._column_path(symbol, column), "rb") as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                values = np.frombuffer(mapped, dtype=dtype, count=num_bars)
+            self._maps[key] = (mapped, values)
+            while len(self._maps) > self.max_open_maps:
+                self._close_map(next(iter(self._maps)))
+            return values
+
+    def last_timestamp(self, symbol: str) -> int | None:
+        """Returns the last stored bar time for `symbol` in epoch ns, or None if empty."""
+        timestamps = self._column(symbol, "timestamp")
+        if timestamps is None or len(timestamps) == 0:
+            return None
+        return int(timestamps[-1])
+
+    def append_bars(
+        self,
+        symbol: str,
+        timestamps,
+        opens,
+        highs,
+        lows,
+        closes,
+        volumes,
+    ) -> int:
+        """
+        Appends bars for `symbol`. Timestamps may be anything `to_epoch_ns` accepts or an
+        int64/datetime64 array; they must be increasing.
+        Returns:
+            int: The number of bars actually appended (older bars are skipped).
+        """
+        timestamps = np.asarray(timestamps)
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            timestamps = timestamps.astype("datetime64[ns]").astype(np.int64)
+        elif not np.issubdtype(timestamps.dtype, np.integer):
+            timestamps = np.array([to_epoch_ns(t) for t in timestamps], dtype=np.int64)
+        timestamps = timestamps.astype(np.int64, copy=False)
+        if len(timestamps) > 1 and np.any(np.diff(timestamps) <= 0):
+            raise ValueError(f"Timestamps for {symbol} must be strictly increasing")
+
+        new_columns = {"timestamp": timestamps}
+        for column, values in zip(OHLCV_COLUMNS, (opens, highs, lows, closes, volumes)):
+            new_columns[column] = np.asarray(values, dtype=np.float64)
+            if len(new_columns[column]) != len(timestamps):
+                raise ValueError(f"Column '{column}' length does not match timestamps")
+
+        symbol = symbol.upper()
+        # The overlap check and the write happen under one lock hold, so concurrent
+        # appenders of the same bars cannot both see the old end and both write.
+        with self._lock:
+            os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+            num_bars = self._num_bars(symbol)
+            last = self._timestamp_at(symbol, num_bars - 1) if num_bars else None
+            start = (
+                0 if last is None else int(np.searchsorted(timestamps, last, "right"))
+            )
+            if start >= len(timestamps):
+                return 0
+
+            # Drop the stale maps before growing the files; they are reopened on next read.
+            for column in _COLUMN_DTYPES:
+                self._close_map((symbol, column))
+            self._lengths.pop(symbol, None)
+            for column, values in new_columns.items():
+                with open(self._column_path(symbol, column), "ab") as f:
+                    # Cut any torn tail left by an interrupted append so every column
+                    # continues from the same bar.
+                    f.truncate(num_bars * values.itemsize)
+                    f.write(values[start:].tobytes())
+        return len(timestamps) - start
+
+    def first_timestamp(self, symbol: str) -> int | None:
+        """Returns the first stored bar time for `symbol` in epoch ns, or None if empty."""
+        timestamps = self._column(symbol, "timestamp")
+        if timestamps is None or len(timestamps) == 0:
+            return None
+        return int(timestamps[0])
+
+    def drop_symbol(self, symbol: str):
+        """Deletes every stored bar of `symbol` (e.g. to reload it with earlier history)."""
+        symbol = symbol.upper()
+        with self._lock:
+            for column in _COLUMN_DTYPES:
+                self._close_map((symbol, column))
+            self._lengths.pop(symbol, None)
+            shutil.rmtree(self._symbol_dir(symbol), ignore_errors=True)
+
+    def append_dataframe(self, symbol: str, df) -> int:
+        """
+        Appends a pandas DataFrame of bars indexed by datetime with Open/High/Low/Close/Volume
+        columns (the layout returned by `yfinance.download`).
+        """
+        if df is None or df.empty:
+            return 0
+        if df.columns.nlevels > 1:  # yfinance adds a ticker level to the columns
+            df = df.copy()
+            df.columns = df.columns.get_level_values(0)
+        index = df.index
+        if getattr(index, "tz", None) is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        by_name = {str(c).lower(): c for c in df.columns}
+        return self.append_bars(
+            symbol,
+            index.values.astype("datetime64[ns]"),
+            *(df[by_name[column]].to_numpy() for column in OHLCV_COLUMNS),
+        )
+
+    def read_bars(
+        self, symbol: str, start=None, end=None, columns: tuple = None
+    ) -> dict[str, np.ndarray]:
+        """
+        Returns bars for `symbol` with `start <= timestamp <= end` as a dict of column arrays.
+        The window is copied out of the memory-mapped files, so the arrays stay valid after
+        the maps are closed and hold no file descriptors. Missing symbols return empty arrays.
+        Args:
+            symbol (str): Symbol to read.
+            start, end (optional): Inclusive window bounds (see `to_epoch_ns`).
+            columns (tuple, optional): Subset of OHLCV columns to return (the timestamp column is
+                                       always included). Only these columns are mapped.
+        """
+        wanted = ("timestamp",) + tuple(
+            c for c in (columns or OHLCV_COLUMNS) if c != "timestamp"
+        )
+        timestamps = self._column(symbol, "timestamp")
+        if timestamps is None:
+            return {c: np.empty(0, dtype=_COLUMN_DTYPES[c]) for c in wanted}
+        lo = (
+            0 if start is None else int(np.searchsorted(timestamps, to_epoch_ns(start)))
+        )
+        hi = (
+            len(timestamps)
+            if end is None
+            else int(np.searchsorted(timestamps, to_epoch_ns(end), "right"))
+        )
+        return {c: self._column(symbol, c)[lo:hi].copy() for c in wanted}
+
+    def read_universe(
+        self, symbols: list[str], start=None, end=None, columns: tuple = None
+    ) -> dict[str, dict]:
+        """Returns `read_bars` for each symbol, keyed by symbol."""
+        start = None if start is None else to_epoch_ns(start)
+        end = None if end is None else to_epoch_ns(end)
+        return {
+            symbol: self.read_bars(symbol, start, end, columns) for symbol in symbols
+        }
+
+
+if __name__ == "__main__":
+    # Benchmark: 2,000 symbols x 10 years of daily bars, then windowed reads.
+    import tempfile
+    import time
+
+    NUM_SYMBOLS = 2000
+    NUM_BARS = 2520  # ~10 years of trading days
+
+    root = tempfile.mkdtemp(prefix="price_store_")
+    try:
+        store = PriceStore(root)
+        rng = np.random.default_rng(0)
+        timestamps = np.arange(
+            np.datetime64("2015-01-01"), np.datetime64("2015-01-01") + NUM_BARS
+        ).astype("datetime64[ns]")
+        start_time = time.perf_counter()
+        for i in range(NUM_SYMBOLS):
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, NUM_BARS)))
+            store.append_bars(
+                f"S{i:04d}",
+                timestamps,
+                close,
+                close * 1.01,
+                close * 0.99,
+                close,
+                np.full(NUM_BARS, 1e6),
+            )
+        print(
+            f"Wrote {NUM_SYMBOLS} x {NUM_BARS} bars in {time.perf_counter() - start_time:.2f}s"
+        )
+
+        # Fresh store so the first read below includes opening every memory map.
+        store = PriceStore(root)
+        symbols = store.symbols()
+        for label in ("cold", "page cache warm"):
+            start_time = time.perf_counter()
+            universe = store.read_universe(symbols, "2018-01-01", "2022-12-31")
+            elapsed = time.perf_counter() - start_time
+            total_bars = sum(len(bars["close"]) for bars in universe.values())
+            print(
+                f"Read {total_bars} bars for {len(symbols)} symbols ({label}): {elapsed * 1000:.1f} ms"
+            )
+
+        added = store.append_bars("S0000", timestamps[-5:], *([np.ones(5)] * 5))
+        print(f"Re-appending overlapping bars added {added} bars (expected 0)")
+    finally:
+        shutil.rmtree(root)
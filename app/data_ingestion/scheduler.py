@@ -0,0 +1,335 @@
+# app/data_ingestion/scheduler.py
+import heapq
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from app.core.logging_utils import get_sampled_logger
+from app.core.metrics import metrics
+from app.data_ingestion.dedup import ArticleDeduplicator
+from app.data_ingestion.news_main import DEFAULT_FEED_TIMEOUT
+from app.data_ingestion.scrapers.feed_cache import FeedValidatorCache
+from app.data_ingestion.scrapers.rss_scraper import (
+    fetch_articles_from_rss,
+    parse_rss_article,
+)
+
+log = get_sampled_logger(__name__)
+
+
+class FeedPollState:
+    """Per-source polling state: observed publish rate and the current poll interval."""
+
+    __slots__ = (
+        "source",
+        "interval",
+        "rate",
+        "last_poll",
+        "next_poll",
+        "polls",
+        "items",
+        "errors",
+        "consecutive_errors",
+    )
+
+    def __init__(self, source: dict, interval: float):
+        self.source = source
+        self.interval = interval
+        self.rate = None  # EWMA of new items per second; None until the second poll
+        self.last_poll = None
+        self.next_poll = 0.0
+        self.polls = 0
+        self.items = 0
+        self.errors = 0  # failed fetches and failed `on_articles` calls
+        self.consecutive_errors = 0  # failed fetches since the last successful one
+
+
+class AdaptivePollingScheduler:
+    """
+    Long-running news poller that adapts each feed's poll interval to its observed
+    publish rate. Busy feeds are polled often enough to pick up about
+    `target_items_per_poll` new entries each time; feeds that return nothing back off
+    geometrically. A failed fetch (network error, timeout, HTTP error) is not taken as a
+    quiet poll: it leaves the rate estimate alone and the feed is retried on a separate
+    error backoff, from `min_interval` doubling per consecutive failure. Poll times are jittered so feeds don't synchronise, and at most
+    `max_concurrent_polls` fetches run at once across all sources.
+    Relies on a FeedValidatorCache so each poll returns only entries not seen before,
+    which is what the publish-rate estimate is based on.
+    """
+
+    def __init__(
+        self,
+        sources_config: list[dict],
+        on_articles: Callable[[dict, list], None],
+        feed_cache: FeedValidatorCache = None,
+        deduplicator: ArticleDeduplicator = None,
+        min_interval: float = 30.0,
+        max_interval: float = 3600.0,
+        initial_interval: float = 300.0,
+        target_items_per_poll: float = 2.0,
+        backoff_factor: float = 2.0,
+        rate_smoothing: float = 0.3,
+        jitter: float = 0.1,
+        max_concurrent_polls: int = 8,
+        feed_timeout: float = DEFAULT_FEED_TIMEOUT,
+        keep_original_entry: bool = False,
+        save_interval: float = 60.0,
+    ):
+        """
+        Args:
+            sources_config (list[dict]): Source definitions; only 'rss' sources are polled.
+            on_articles (Callable): Called as `on_articles(source, articles)` after each poll
+                                    that produced new articles. Runs on a worker thread.
+            feed_cache (FeedValidatorCache, optional): Validator cache; an in-memory one is
+                                                       created if omitted.
+            deduplicator (ArticleDeduplicator, optional): Cross-source dedup applied to new articles.
+            min_interval (float, optional): Fastest any feed is polled, in seconds.
+            max_interval (float, optional): Slowest any feed is polled, in seconds.
+            initial_interval (float, optional): Interval used until a rate has been observed.
+            target_items_per_poll (float, optional): New items a poll should ideally find.
+            backoff_factor (float, optional): Interval multiplier after a poll finds nothing,
+                                              and between retries of a failing feed.
+            rate_smoothing (float, optional): EWMA weight of the newest rate observation.
+            jitter (float, optional): Relative random spread applied to every interval.
+            max_concurrent_polls (int, optional): Global cap on simultaneous fetches.
+            feed_timeout (float, optional): Per-feed download deadline in seconds.
+            keep_original_entry (bool, optional): Keep the raw feed entry under
+                                                  'original_entry' on each article.
+            save_interval (float, optional): Seconds between saves of the validator cache
+                                             while running (it is also saved on exit).
+        """
+        self.on_articles = on_articles
+        self.feed_cache = feed_cache if feed_cache is not None else FeedValidatorCache()
+        self.deduplicator = deduplicator
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_items_per_poll = target_items_per_poll
+        self.backoff_factor = backoff_factor
+        self.rate_smoothing = rate_smoothing
+        self.jitter = jitter
+        self.max_concurrent_polls = max_concurrent_polls
+        self.feed_timeout = feed_timeout
+        self.keep_original_entry = keep_original_entry
+        self.save_interval = save_interval
+
+        self.states = [
+            FeedPollState(source, initial_interval)
+            for source in sources_config
+            if source["type"] == "rss"
+        ]
+        self._heap = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent_polls)
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+    def _jittered(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _update_interval(self, state: FeedPollState, new_items: int, now: float):
+        """Updates the publish-rate estimate and picks the next interval for `state`."""
+        if state.last_poll is not None:
+            observed = new_items / max(now - state.last_poll, 1e-6)
+            state.rate = (
+                observed
+                if state.rate is None
+                else (1 - self.rate_smoothing) * state.rate
+                + self.rate_smoothing * observed
+            )
+        if new_items == 0:
+            interval = state.interval * self.backoff_factor
+        elif state.rate:
+            interval = self.target_items_per_poll / state.rate
+        else:
+            interval = state.interval
+        state.interval = min(self.max_interval, max(self.min_interval, interval))
+        state.last_poll = now
+
+    def poll_source(self, state: FeedPollState):
+        """Fetches one source, hands new articles to `on_articles` and reschedules it."""
+        url = state.source["url"]
+        fetch_failed = callback_failed = False
+        try:
+            raw_entries = fetch_articles_from_rss(
+                url,
+                timeout=self.feed_timeout,
+                feed_cache=self.feed_cache,
+                raise_errors=True,
+            )
+        except Exception:
+            # Already logged and counted by fetch_articles_from_rss.
+            raw_entries = []
+            fetch_failed = True
+        try:
+            articles = [
+                parse_rss_article(entry, keep_original_entry=self.keep_original_entry)
+                for entry in raw_entries
+            ]
+            if self.deduplicator is not None:
+                articles = list(self.deduplicator.filter_new(articles))
+            if articles:
+                self.on_articles(state.source, articles)
+        except Exception as e:
+            # The feed did publish; a downstream failure must not read as a quiet feed
+            # and push its interval into backoff.
+            log.warning(
+                "Error handling %d new entries from %s: %s", len(raw_entries), url, e
+            )
+            metrics.count("poll_callback_errors")
+            callback_failed = True
+        finally:
+            self._slots.release()
+
+        now = time.monotonic()
+        with self._lock:
+            if fetch_failed:
+                # Not an observation of the feed; retry on the error backoff instead.
+                state.consecutive_errors += 1
+                delay = min(
+                    self.max_interval,
+                    self.min_interval
+                    * self.backoff_factor ** (state.consecutive_errors - 1),
+                )
+            else:
+                state.consecutive_errors = 0
+                self._update_interval(state, len(raw_entries), now)
+                delay = state.interval
+            state.polls += 1
+            state.items += len(raw_entries)
+            state.errors += fetch_failed or callback_failed
+            state.next_poll = now + self._jittered(delay)
+            heapq.heappush(self._heap, (state.next_poll, id(state), state))
+        self._wakeup.set()
+
+    def run(self, duration: float = None):
+        """
+        Polls sources until `stop()` is called (or for `duration` seconds). Blocks the calling
+        thread; the validator cache is saved every `save_interval` seconds and on exit.
+        """
+        start = time.monotonic()
+        last_save = start
+        self._stop.clear()
+        with self._lock:
+            self._heap = []
+            for state in self.states:
+                # Spread the first round of polls instead of hitting every feed at once.
+                state.next_poll = start + random.uniform(
+                    0, self.min_interval * self.jitter
+                )
+                heapq.heappush(self._heap, (state.next_poll, id(state), state))
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_polls) as pool:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if duration is not None and now - start >= duration:
+                    break
+                if now - last_save >= self.save_interval:
+                    self.feed_cache.save()
+                    last_save = now
+                with self._lock:
+                    due = self._heap[0][0] if self._heap else None
+                    if due is not None and due <= now:
+                        _, _, state = heapq.heappop(self._heap)
+                    else:
+                        state = None
+                if state is None:
+                    wait = 1.0 if due is None else due - now
+                    wait = min(wait, last_save + self.save_interval - now)
+                    if duration is not None:
+                        wait = min(wait, duration - (now - start))
+                    self._wakeup.wait(max(wait, 0))
+                    self._wakeup.clear()
+                    continue
+                # Global concurrency budget: wait for a free slot before dispatching.
+                while not self._slots.acquire(timeout=0.5):
+                    if self._stop.is_set():
+                        break
+                else:
+                    pool.submit(self.poll_source, state)
+        self.feed_cache.save()
+
+    def stop(self):
+        """Asks a running `run()` loop to exit."""
+        self._stop.set()
+        self._wakeup.set()
+
+    def stats(self) -> list[dict]:
+        """Returns per-source polling statistics."""
+        with self._lock:
+            return [
+                {
+                    "url": state.source["url"],
+                    "polls": state.polls,
+                    "items": state.items,
+                    "errors": state.errors,
+                    "consecutive_errors": state.consecutive_errors,
+                    "interval": state.interval,
+                    "rate_per_min": (state.rate or 0.0) * 60,
+                }
+                for state in self.states
+            ]
+
+
+if __name__ == "__main__":
+    # Demo: one busy feed, one slow feed, one dead feed and one that is down (HTTP 503)
+    # served locally. After a short run the busy feed is polled far more often than the
+    # quiet ones, and the failing feed shows up in `errors` rather than as a quiet feed.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    PUBLISH_EVERY = {
+        "busy": 0.2,
+        "slow": 3.0,
+        "dead": None,
+        "down": None,
+    }  # seconds per new item
+    server_start = time.monotonic()
+
+    class _PublishingFeedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            name = self.path.strip("/")
+            if name == "down":
+                self.send_error(503)
+                return
+            period = PUBLISH_EVERY[name]
+            count = (
+                1
+                if period is None
+                else 1 + int((time.monotonic() - server_start) / period)
+            )
+            items = "".join(
+                f"<item><guid>{name}-{i}</guid><title>{name} {i}</title>"
+                f"<description>{name} story {i}</description></item>"
+                for i in range(max(0, count - 20), count)
+            )
+            body = f'<rss version="2.0"><channel>{items}</channel></rss>'.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PublishingFeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    scheduler = AdaptivePollingScheduler(
+        [{"type": "rss", "url": f"{base_url}/{name}"} for name in PUBLISH_EVERY],
+        on_articles=lambda source, articles: None,
+        min_interval=0.2,
+        max_interval=5.0,
+        initial_interval=1.0,
+        max_concurrent_polls=2,
+    )
+    scheduler.run(duration=10.0)
+    server.shutdown()
+    for row in scheduler.stats():
+        print(
+            f"{row['url']}: {row['polls']} polls, {row['items']} new items, "
+            f"{row['errors']} errors, "
+            f"interval {row['interval']:.2f}s, rate {row['rate_per_min']:.1f}/min"
+        )
@@ -0,0 +1,96 @@
+# app/data_ingestion/scrapers/feed_cache.py
+import json
+import os
+import tempfile
+import threading
+
+from app.core.logging_utils import get_sampled_logger
+
+log = get_sampled_logger(__name__)
+
+
+class FeedValidatorCache:
+    """
+    Persistent per-URL cache of HTTP validators (ETag / Last-Modified) and the entry IDs
+    seen on the previous fetch of each feed.
+    Used by `fetch_articles_from_rss` to issue conditional GETs, so unchanged feeds
+    come back as 304 and are never reparsed, and entries already seen are dropped
+    before `parse_rss_article` runs.
+    """
+
+    def __init__(self, cache_path: str = None):
+        """
+        Initializes the cache, loading any previously saved state.
+        Args:
+            cache_path (str, optional): JSON file backing the cache. If omitted, the cache
+                                        lives in memory only.
+        """
+        self.cache_path = cache_path
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # one save at a time, in snapshot order
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                log.warning("Could not load feed cache %s: %s", cache_path, e)
+
+    def get_validators(self, url: str) -> tuple[str | None, str | None]:
+        """Returns the `(etag, last_modified)` pair stored for `url`."""
+        with self._lock:
+            entry = self._entries.get(url, {})
+            return entry.get("etag"), entry.get("modified")
+
+    def filter_new_entries(self, url: str, entries: list[dict]) -> list[dict]:
+        """
+        Returns only the entries not present in the previous fetch of `url`, and remembers
+        the current entry IDs for the next fetch.
+        """
+        current_ids = [entry_id(entry) for entry in entries]
+        with self._lock:
+            entry = self._entries.setdefault(url, {})
+            previous_ids = set(entry.get("seen_ids", []))
+            entry["seen_ids"] = current_ids
+        return [e for e, eid in zip(entries, current_ids) if eid not in previous_ids]
+
+    def update_validators(self, url: str, etag: str = None, modified: str = None):
+        """Stores the validators returned by the server for `url`."""
+        with self._lock:
+            entry = self._entries.setdefault(url, {})
+            entry["etag"] = etag
+            entry["modified"] = modified
+
+    def save(self):
+        """
+        Writes the cache to `cache_path` atomically. No-op for in-memory caches. Safe to call
+        from several threads (e.g. the scheduler's periodic save and a pipeline's final one).
+        """
+        if not self.cache_path:
+            return
+        with self._save_lock:
+            with self._lock:
+                payload = json.dumps(self._entries)
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=os.path.dirname(os.path.abspath(self.cache_path)),
+                prefix=os.path.basename(self.cache_path),
+                suffix=".tmp",
+                delete=False,
+            ) as f:
+                f.write(payload)
+            try:
+                os.replace(f.name, self.cache_path)
+            except OSError:
+                os.unlink(f.name)
+                raise
+
+
+def entry_id(article_entry: dict) -> str:
+    """Stable identifier for a feed entry: its GUID, falling back to link, then title."""
+    return (
+        article_entry.get("id")
+        or article_entry.get("link")
+        or article_entry.get("title", "")
+    )
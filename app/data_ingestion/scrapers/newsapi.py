@@ -2,8 +2,23 @@ from newsapi import NewsApiClient
 import pandas as pd
 import re
 import os
+import functools
+import itertools
+import threading
+import time
+import requests
+from typing import Iterable, Iterator
 from dotenv import load_dotenv
 
+from app.core.logging_utils import get_sampled_logger
+
+log = get_sampled_logger(__name__)
+
+# NewsAPI rejects `q` longer than 500 characters and pages larger than 100 articles.
+NEWSAPI_MAX_QUERY_LENGTH = 500
+NEWSAPI_MAX_PAGE_SIZE = 100
+DEFAULT_CACHE_TTL = 15 * 60  # seconds
+
 # TODO: Refactor path loading and API key management.
 # This should ideally use app.core.config_loader or expect env vars.
 # load_dotenv('/Users/ashfi/code/new_python/sentrade/token.env') # Replace with your own path
@@ -25,18 +40,182 @@ def fetch_news_from_newsapi(query: str, api_key: str) -> list[dict]:
         list[dict]: A list of articles, or an empty list if an error occurs.
     """
     try:
-        newsapi_client = NewsApiClient(api_key=api_key)
+        newsapi_client = get_newsapi_client(api_key)
         response = newsapi_client.get_everything(q=query)
         if response.get("status") == "ok":
             return response.get("articles", [])
         else:
-            print(f"Error from NewsAPI: {response.get('message')}")
+            log.warning("Error from NewsAPI: %s", response.get("message"))
             return []
     except Exception as e:
-        print(f"An error occurred while fetching news from NewsAPI: {e}")
+        log.warning("An error occurred while fetching news from NewsAPI: %s", e)
         return []
 
 
+@functools.lru_cache(maxsize=None)
+def get_newsapi_client(api_key: str) -> NewsApiClient:
+    """Returns a NewsApiClient shared across calls for `api_key`, so its connections are reused."""
+    return NewsApiClient(api_key=api_key, session=requests.Session())
+
+
+def plan_ticker_queries(
+    tickers: Iterable[str],
+    aliases: dict = None,
+    max_query_length: int = NEWSAPI_MAX_QUERY_LENGTH,
+) -> list[tuple[str, list[str]]]:
+    """
+    Packs many tickers into as few OR-queries as fit within NewsAPI's query length limit.
+    Args:
+        tickers (Iterable[str]): Ticker symbols to cover.
+        aliases (dict, optional): Maps a ticker to extra search terms (e.g. company names),
+                                  which are quoted and ORed in alongside the ticker.
+        max_query_length (int, optional): Maximum characters per query.
+    Returns:
+        list[tuple[str, list[str]]]: `(query, tickers_in_query)` pairs.
+    """
+    aliases = aliases or {}
+    plans = []
+    terms, batch_tickers, length = [], [], 0
+    for ticker in dict.fromkeys(tickers):  # de-duplicate, keep order
+        ticker_terms = [ticker] + [f'"{alias}"' for alias in aliases.get(ticker, [])]
+        if len(" OR ".join(ticker_terms)) > max_query_length:
+            log.warning(
+                "Search terms for %s exceed the query limit; using the ticker only.",
+                ticker,
+            )
+            ticker_terms = [ticker]
+        ticker_length = len(" OR ".join(ticker_terms))
+        if terms and length + len(" OR ") + ticker_length > max_query_length:
+            plans.append((" OR ".join(terms), batch_tickers))
+            terms, batch_tickers, length = [], [], 0
+        length += ticker_length + (len(" OR ") if terms else 0)
+        terms.extend(ticker_terms)
+        batch_tickers.append(ticker)
+    if terms:
+        plans.append((" OR ".join(terms), batch_tickers))
+    return plans
+
+
+class TTLResponseCache:
+    """Thread-safe in-memory cache whose entries expire `ttl` seconds after being stored."""
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] >= now}
+                if len(self._entries) >= self.max_entries:
+                    # Still full: drop the oldest insertion.
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+
+class NewsApiQueryPlanner:
+    """
+    Fetches NewsAPI coverage for a large ticker universe on a small request budget:
+    tickers are packed into OR-queries, result pages are fetched lazily only as the
+    consumer iterates, and responses are cached by query, time window and page.
+    """
+
+    def __init__(
+        self,
+        client: NewsApiClient,
+        cache: TTLResponseCache = None,
+        page_size: int = NEWSAPI_MAX_PAGE_SIZE,
+        max_pages: int = None,
+        language: str = "en",
+        max_query_length: int = NEWSAPI_MAX_QUERY_LENGTH,
+    ):
+        """
+        Args:
+            client (NewsApiClient): Client used for requests (see `get_newsapi_client`).
+            cache (TTLResponseCache, optional): Response cache. Defaults to a 15 minute TTL cache.
+            page_size (int, optional): Articles per page, at most 100.
+            max_pages (int, optional): Stop paginating a query after this many pages.
+            language (str, optional): Article language filter.
+            max_query_length (int, optional): Maximum characters per packed query.
+        """
+        self.client = client
+        self.cache = cache if cache is not None else TTLResponseCache()
+        self.page_size = min(page_size, NEWSAPI_MAX_PAGE_SIZE)
+        self.max_pages = max_pages
+        self.language = language
+        self.max_query_length = max_query_length
+        self.requests_made = 0
+
+    def _get_page(self, query: str, from_date: str, to_date: str, page: int) -> dict:
+        key = (query, from_date, to_date, page, self.page_size, self.language)
+        response = self.cache.get(key)
+        if response is None:
+            self.requests_made += 1
+            response = self.client.get_everything(
+                q=query,
+                from_param=from_date,
+                to=to_date,
+                language=self.language,
+                page=page,
+                page_size=self.page_size,
+            )
+            if response.get("status") == "ok":
+                self.cache.put(key, response)
+        return response
+
+    def iter_query_articles(
+        self, query: str, from_date: str = None, to_date: str = None
+    ) -> Iterator[dict]:
+        """Yields articles for a single query, requesting the next page only when needed."""
+        for page in itertools.count(1):
+            if self.max_pages is not None and page > self.max_pages:
+                return
+            try:
+                response = self._get_page(query, from_date, to_date, page)
+            except Exception as e:
+                log.warning("An error occurred while fetching news from NewsAPI: %s", e)
+                return
+            if response.get("status") != "ok":
+                log.warning("Error from NewsAPI: %s", response.get("message"))
+                return
+            articles = response.get("articles", [])
+            yield from articles
+            if not articles or page * self.page_size >= response.get("totalResults", 0):
+                return
+
+    def iter_articles(
+        self,
+        tickers: Iterable[str],
+        from_date: str = None,
+        to_date: str = None,
+        aliases: dict = None,
+    ) -> Iterator[dict]:
+        """
+        Yields articles covering all `tickers`, one packed query after another.
+        Args:
+            tickers (Iterable[str]): Ticker universe.
+            from_date (str, optional): ISO date/time lower bound of the window.
+            to_date (str, optional): ISO date/time upper bound of the window.
+            aliases (dict, optional): Extra search terms per ticker (see `plan_ticker_queries`).
+        """
+        for query, _ in plan_ticker_queries(tickers, aliases, self.max_query_length):
+            yield from self.iter_query_articles(query, from_date, to_date)
+
+
 def _process_articles_to_dataframe(articles: list[dict]):
     """Helper to process articles into a pandas DataFrame (internal use or for testing)."""
     if not articles:
@@ -82,3 +261,72 @@ def _process_articles_to_dataframe(articles: list[dict]):
 # flat = pd.json_normalize(stock_news['articles'], sep='_')
 # safe_name = re.sub(r'[^A-Za-z0-9_]+', '_', user_input.strip())[:50]
 # flat.to_csv(f'{safe_name}_reviews.csv', index=False)
+
+
+if __name__ == "__main__":
+    # Demo against a local NewsAPI stub: a 500-ticker universe packed into OR-queries,
+    # paginated lazily, then re-run inside the cache TTL without any new requests.
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlsplit
+
+    TOTAL_RESULTS_PER_QUERY = 250
+
+    class _NewsApiStubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = parse_qs(urlsplit(self.path).query)
+            page = int(params["page"][0])
+            page_size = int(params["pageSize"][0])
+            start = (page - 1) * page_size
+            count = max(0, min(page_size, TOTAL_RESULTS_PER_QUERY - start))
+            body = json.dumps(
+                {
+                    "status": "ok",
+                    "totalResults": TOTAL_RESULTS_PER_QUERY,
+                    "articles": [
+                        {
+                            "title": f"Article {start + i}",
+                            "url": f"http://stub/{start + i}",
+                        }
+                        for i in range(count)
+                    ],
+                }
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _NewsApiStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stub_base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    class _StubSession(requests.Session):
+        """Routes the client's newsapi.org requests to the local stub."""
+
+        def get(self, url, **kwargs):
+            return super().get(url.replace("https://newsapi.org", stub_base), **kwargs)
+
+    universe = [f"T{i:03d}" for i in range(500)]
+    planner = NewsApiQueryPlanner(
+        NewsApiClient(api_key="stub-key", session=_StubSession())
+    )
+    plans = plan_ticker_queries(universe)
+    print(f"{len(universe)} tickers packed into {len(plans)} queries")
+
+    first_hundred = list(itertools.islice(planner.iter_articles(universe), 100))
+    print(f"First 100 articles cost {planner.requests_made} request(s)")
+
+    all_articles = list(planner.iter_articles(universe))
+    print(
+        f"Full sweep: {len(all_articles)} articles, {planner.requests_made} requests so far"
+    )
+    list(planner.iter_articles(universe))
+    print(
+        f"Repeat sweep within TTL: {planner.requests_made} requests total (served from cache)"
+    )
+    server.shutdown()
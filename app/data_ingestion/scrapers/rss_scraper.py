@@ -1,31 +1,147 @@
 import feedparser
-import time  # For potential future use like adding delays
+import time
+import urllib.error
+import urllib.request
 
+from app.core.data_models import ArticleRecord
+from app.core.logging_utils import get_sampled_logger
+from app.core.metrics import metrics
+from app.data_ingestion.scrapers.feed_cache import FeedValidatorCache
 
-def fetch_articles_from_rss(rss_url: str) -> list[dict]:
+# Size of each read from the socket when downloading a feed body ourselves.
+_READ_CHUNK_SIZE = 64 * 1024
+
+log = get_sampled_logger(__name__)
+
+
+def _lowercase_headers(headers) -> dict:
+    return {name.lower(): value for name, value in headers.items()}
+
+
+def _download_feed(
+    rss_url: str, timeout: float, request_headers: dict = None
+) -> tuple[int, bytes, dict]:
+    """
+    Downloads the raw feed body, enforcing `timeout` as a total deadline for the feed
+    (connect plus every read), not just a per-socket-operation timeout.
+    Returns `(status, body, response_headers)`; a 304 comes back with an empty body.
+    Header names are lower-cased, since servers vary in how they capitalize them.
+    """
+    deadline = time.monotonic() + timeout
+    headers = {"User-Agent": "sentrade/1.0"}
+    headers.update(request_headers or {})
+    request = urllib.request.Request(rss_url, headers=headers)
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, b"", _lowercase_headers(e.headers)
+        raise
+    with response:
+        chunks = []
+        while True:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Feed {rss_url} exceeded {timeout}s deadline")
+            chunk = response.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return response.status, b"".join(chunks), _lowercase_headers(response.headers)
+
+
+def fetch_articles_from_rss(
+    rss_url: str,
+    timeout: float = None,
+    feed_cache: FeedValidatorCache = None,
+    raise_errors: bool = False,
+) -> list[dict]:
     """
     Fetches articles from a given RSS feed URL using feedparser.
     Returns a list of feedparser entry objects (which are dict-like).
+    Args:
+        rss_url (str): The RSS feed URL.
+        timeout (float, optional): Total deadline in seconds for downloading the feed.
+                                   If omitted, feedparser fetches the URL itself without a deadline.
+        feed_cache (FeedValidatorCache, optional): Validator cache. When given, the request is a
+                                   conditional GET (a 304 returns [] without parsing) and only
+                                   entries not seen on the previous fetch are returned.
+        raise_errors (bool, optional): Re-raise download and HTTP errors (after logging and
+                                       counting them) instead of returning [], so callers
+                                       can tell a failed feed from a quiet one.
     """
+    with metrics.timer("rss_fetch") as timer:
+        entries = _fetch_entries(rss_url, timeout, feed_cache, raise_errors)
+        timer.items = len(entries)
+    return entries
+
+
+def _fetch_entries(
+    rss_url: str, timeout: float, feed_cache: FeedValidatorCache, raise_errors: bool
+) -> list[dict]:
     try:
-        print(f"Fetching articles from RSS feed: {rss_url}")
-        feed = feedparser.parse(rss_url)
+        log.debug("Fetching articles from RSS feed: %s", rss_url)
+        etag, modified = (
+            feed_cache.get_validators(rss_url) if feed_cache else (None, None)
+        )
+        if timeout is None:
+            feed = feedparser.parse(rss_url, etag=etag, modified=modified)
+            status = feed.get("status")
+            if status is not None and status >= 400:
+                raise urllib.error.HTTPError(
+                    rss_url, status, "feed request failed", feed.get("headers"), None
+                )
+            new_etag, new_modified = feed.get("etag"), feed.get("modified")
+        else:
+            request_headers = {}
+            if etag:
+                request_headers["If-None-Match"] = etag
+            if modified:
+                request_headers["If-Modified-Since"] = modified
+            status, body, response_headers = _download_feed(
+                rss_url, timeout, request_headers
+            )
+            new_etag = response_headers.get("etag", etag)
+            new_modified = response_headers.get("last-modified", modified)
+            feed = None if status == 304 else feedparser.parse(body)
+
+        if status == 304:
+            log.debug("Feed %s not modified since last fetch", rss_url)
+            metrics.count("rss_not_modified")
+            return []
         if feed.bozo:  # Check for malformed feed
-            print(
-                f"Warning: Feed {rss_url} may be malformed. Bozo reason: {feed.bozo_exception}"
+            log.warning(
+                "Feed %s may be malformed. Bozo reason: %s",
+                rss_url,
+                feed.bozo_exception,
             )
         # feed.entries is a list of dictionaries, one for each article
-        print(f"Fetched {len(feed.entries)} entries from {rss_url}")
-        return feed.entries  # These are already dict-like
+        log.info("Fetched %d entries from %s", len(feed.entries), rss_url)
+        if feed_cache is None:
+            return feed.entries  # These are already dict-like
+
+        feed_cache.update_validators(rss_url, etag=new_etag, modified=new_modified)
+        new_entries = feed_cache.filter_new_entries(rss_url, feed.entries)
+        log.info("%d of them are new since the previous fetch", len(new_entries))
+        return new_entries
     except Exception as e:
-        print(f"Error fetching RSS feed {rss_url}: {e}")
+        log.warning("Error fetching RSS feed %s: %s", rss_url, e)
+        metrics.count("rss_fetch_errors")
+        if raise_errors:
+            raise
         return []
 
 
-def parse_rss_article(article_entry: dict) -> dict:
+def parse_rss_article(
+    article_entry: dict, keep_original_entry: bool = False
+) -> ArticleRecord:
     """
-    Parses a single raw article entry from feedparser into a structured format.
+    Parses a single raw article entry from feedparser into a compact ArticleRecord.
     The sentiment analysis part expects a 'content' key.
+    Args:
+        article_entry (dict): Raw feedparser entry.
+        keep_original_entry (bool, optional): Keep the raw entry on the record for detailed
+                                              parsing later. Off by default because the raw
+                                              entries dominate resident memory at volume.
     """
     # Extracting common fields. feedparser entries are dictionaries.
     title = article_entry.get("title", "No Title")
@@ -49,13 +165,71 @@ def parse_rss_article(article_entry: dict) -> dict:
     if not isinstance(content, str):
         content = str(content) if content is not None else ""
 
-    parsed_article = {
-        "title": title,
-        "link": link,
-        "published_date": published_date,
-        "content": content,  # Key expected by sentiment analysis
-        "source_type": "rss",
-        "original_entry": article_entry,  # Keep original for more detailed parsing if needed later
-    }
-    # print(f"Parsed article: {title[:50]}...") # For debugging
+    parsed_article = ArticleRecord(
+        title=title,
+        link=link,
+        published_date=published_date,
+        content=content,  # Key expected by sentiment analysis
+        source_type="rss",
+        original_entry=article_entry if keep_original_entry else None,
+    )
     return parsed_article
+
+
+if __name__ == "__main__":
+    # Memory benchmark: 100k parsed articles as the old dicts carrying `original_entry`
+    # versus compact ArticleRecords.
+    import tracemalloc
+
+    NUM_ARTICLES = 100_000
+
+    def _make_entry(i: int) -> feedparser.FeedParserDict:
+        return feedparser.FeedParserDict(
+            {
+                "id": f"urn:story:{i}",
+                "title": f"Story {i} headline about AAPL earnings",
+                "title_detail": {
+                    "type": "text/plain",
+                    "language": None,
+                    "value": f"Story {i}",
+                },
+                "link": f"https://finance.example.com/news/story-{i}.html",
+                "links": [
+                    {
+                        "rel": "alternate",
+                        "type": "text/html",
+                        "href": f"https://finance.example.com/news/story-{i}.html",
+                    }
+                ],
+                "published": "Mon, 06 Jan 2025 14:30:00 +0000",
+                "published_parsed": time.gmtime(1736173800 + i),
+                "summary": f"Summary text for story {i}. " * 5,
+                "summary_detail": {
+                    "type": "text/html",
+                    "language": None,
+                    "value": f"Summary text for story {i}. " * 5,
+                },
+            }
+        )
+
+    def _measure(build) -> tuple[int, list]:
+        tracemalloc.start()
+        entries = [_make_entry(i) for i in range(NUM_ARTICLES)]
+        articles = build(entries)
+        del entries  # Whatever the articles still reference stays alive
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return retained, articles
+
+    def _build_legacy(entries):
+        legacy = []
+        for entry in entries:
+            record = parse_rss_article(entry, keep_original_entry=True)
+            legacy.append(record.to_dict())
+        return legacy
+
+    legacy_bytes, _ = _measure(_build_legacy)
+    compact_bytes, _ = _measure(lambda entries: [parse_rss_article(e) for e in entries])
+    print(f"Articles: {NUM_ARTICLES}")
+    print(f"dict + original_entry: {legacy_bytes / 1e6:.1f} MB retained")
+    print(f"ArticleRecord:         {compact_bytes / 1e6:.1f} MB retained")
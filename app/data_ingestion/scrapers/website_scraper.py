@@ -1,97 +1,445 @@
 # app/data_ingestion/scrapers/website_scraper.py
-# TODO: Implement website scraping logic using libraries like BeautifulSoup and requests.
+# Website scraping: a shared pooled HTTP session, per-domain token-bucket rate limits
+# for concurrent fetching, and lxml-based extraction that can also run in bulk on
+# pre-fetched HTML in a process pool.
+import heapq
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Iterable, Iterator
+from urllib.parse import urljoin, urlsplit
+
+import lxml.etree
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.logging_utils import get_sampled_logger
+from app.core.metrics import metrics
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_WORKERS = 16
+# Default politeness budget per domain: sustained requests/second and burst size.
+DEFAULT_DOMAIN_RATE = 2.0
+DEFAULT_DOMAIN_BURST = 4
+
+log = get_sampled_logger(__name__)
+
+# Path segments that mark navigation pages rather than articles.
+_NON_ARTICLE_SEGMENTS = {
+    "tag",
+    "tags",
+    "category",
+    "categories",
+    "author",
+    "authors",
+    "login",
+    "signup",
+    "subscribe",
+    "search",
+    "about",
+    "contact",
+    "privacy",
+    "terms",
+}
+
+_session = None
+_session_pool_maxsize = 0
+_session_lock = threading.Lock()
+
+
+def get_http_session(pool_maxsize: int = DEFAULT_MAX_WORKERS) -> requests.Session:
+    """
+    Returns the process-wide HTTP session. Connections are pooled and kept alive, so
+    repeated requests to the same site skip TCP/TLS setup. The per-host pool grows to
+    the largest `pool_maxsize` requested so far.
+    """
+    global _session, _session_pool_maxsize
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers["User-Agent"] = "sentrade/1.0"
+        if pool_maxsize > _session_pool_maxsize:
+            adapter = HTTPAdapter(pool_connections=64, pool_maxsize=pool_maxsize)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session_pool_maxsize = pool_maxsize
+        return _session
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing bursts of up to `capacity` requests and `rate`
+    requests/second sustained. `reserve` claims the next token without blocking and
+    returns how long to wait before using it; `acquire` blocks for that long.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last_refill) * self.rate
+            )
+            self._last_refill = now
+            # Tokens go negative for reservations made ahead of the refill.
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class DomainRateLimiter:
+    """Keeps one TokenBucket per domain so each site gets its own request budget."""
+
+    def __init__(
+        self, rate: float = DEFAULT_DOMAIN_RATE, capacity: int = DEFAULT_DOMAIN_BURST
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        domain = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                bucket = self._buckets[domain] = TokenBucket(self.rate, self.capacity)
+        return bucket
+
+    def reserve(self, url: str) -> float:
+        """Claims a request slot for `url`'s domain; returns seconds until it may be used."""
+        return self._bucket(url).reserve()
+
+    def acquire(self, url: str):
+        self._bucket(url).acquire()
+
+
+def fetch_html(
+    url: str, timeout: float = DEFAULT_TIMEOUT, rate_limiter: DomainRateLimiter = None
+) -> bytes | None:
+    """
+    Fetches a page through the shared session. Returns the raw body, so lxml can honour
+    the page's own encoding declaration, or None on any HTTP or network error.
+    """
+    if rate_limiter is not None:
+        rate_limiter.acquire(url)
+    try:
+        with metrics.timer("html_fetch"):
+            response = get_http_session().get(url, timeout=timeout)
+            response.raise_for_status()
+            return response.content
+    except requests.RequestException as e:
+        log.warning("Error fetching %s: %s", url, e)
+        metrics.count("html_fetch_errors")
+        return None
+
+
+def fetch_html_concurrent(
+    urls: Iterable[str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timeout: float = DEFAULT_TIMEOUT,
+    rate_limiter: DomainRateLimiter = None,
+) -> Iterator[tuple[str, bytes]]:
+    """
+    Fetches many pages on a thread pool, respecting per-domain rate limits, and yields
+    `(url, html)` as each page arrives. Failed pages are skipped.
+    Rate limits are applied before submission: each URL is handed to the pool only once
+    its domain has a token, so a throttled domain never holds worker threads while the
+    others' pages wait behind it.
+    """
+    if rate_limiter is None:
+        rate_limiter = DomainRateLimiter()
+    get_http_session(max_workers)
+    start = time.monotonic()
+    schedule = []  # (due time, input position, url)
+    for position, url in enumerate(urls):
+        heapq.heappush(schedule, (start + rate_limiter.reserve(url), position, url))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {}
+        while schedule or futures:
+            now = time.monotonic()
+            while schedule and schedule[0][0] <= now:
+                _, _, url = heapq.heappop(schedule)
+                futures[pool.submit(fetch_html, url, timeout)] = url
+            next_due = schedule[0][0] - now if schedule else None
+            done, _ = wait(futures, timeout=next_due, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = futures.pop(future)
+                html = future.result()
+                if html is not None:
+                    yield url, html
+
+
+def is_article_link(href: str, base_url: str) -> bool:
+    """
+    Heuristic for whether an absolute `href` points at an article on the same site as
+    `base_url`: same host, and a path that looks like a story slug rather than a
+    section, tag or account page.
+    """
+    parts = urlsplit(href)
+    if parts.scheme not in ("http", "https"):
+        return False
+    if parts.netloc.lower() != urlsplit(base_url).netloc.lower():
+        return False  # External link
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if not segments or _NON_ARTICLE_SEGMENTS.intersection(s.lower() for s in segments):
+        return False
+    slug = segments[-1]
+    # Articles usually live under a dated or sectioned path, or have a hyphenated slug.
+    return len(segments) >= 2 or "-" in slug or any(c.isdigit() for c in slug)
+
+
+def _parse_html(html_content: str | bytes, url: str):
+    """
+    Parses a page with lxml. Returns None (and logs) for pages lxml rejects, such as
+    empty or comment-only documents, or text with an XML encoding declaration.
+    """
+    try:
+        return lxml.html.fromstring(html_content)
+    except (ValueError, lxml.etree.ParserError) as e:
+        log.warning("Could not parse %s: %s", url, e)
+        metrics.count("html_parse_errors")
+        return None
 
 
 def fetch_article_urls_from_site(
-    site_url: str, category: str = None, html_content: str = None
+    site_url: str, category: str = None, html_content: str | bytes = None
 ) -> list[str]:
     """
     Fetches a list of article URLs from a specific website section or provided HTML.
     Args:
         site_url (str): The base URL of the site to scrape (if html_content is not provided).
         category (str, optional): Specific category or path on the site.
-        html_content (str, optional): Pre-fetched HTML content to parse.
+        html_content (str | bytes, optional): Pre-fetched HTML content to parse.
     Returns:
-        list[str]: A list of article URLs.
-    """
-    # Example (requires requests and BeautifulSoup4):
-    # import requests
-    # from bs4 import BeautifulSoup
-    #
-    # if html_content:
-    #     soup = BeautifulSoup(html_content, 'html.parser')
-    # elif site_url:
-    #     try:
-    #         response = requests.get(f"{site_url}/{category}" if category else site_url, timeout=10)
-    #         response.raise_for_status()
-    #         soup = BeautifulSoup(response.content, 'html.parser')
-    #     except requests.RequestException as e:
-    #         print(f"Error fetching {site_url}: {e}")
-    #         return []
-    # else:
-    #     return []
-    #
-    # urls = []
-    # # Placeholder: Add logic to find <a> tags that link to articles
-    # # for link in soup.find_all('a', href=True):
-    # #     href = link['href']
-    # #     if is_article_link(href, site_url): # Implement is_article_link
-    # #         urls.append(href)
-    # print(f"Found {len(urls)} article URLs from {site_url or 'HTML content'}.")
-    pass  # Placeholder
-
-
-def scrape_website_article_content(article_url: str, html_content: str = None) -> dict:
+        list[str]: A list of article URLs, in page order without duplicates.
+    """
+    page_url = f"{site_url.rstrip('/')}/{category}" if category else site_url
+    if html_content is None:
+        html_content = fetch_html(page_url)
+        if html_content is None:
+            return []
+    if not html_content.strip():
+        return []
+
+    tree = _parse_html(html_content, page_url)
+    if tree is None:
+        return []
+    urls = {}
+    for href in tree.xpath("//a/@href"):
+        absolute = urljoin(page_url, href.strip()).split("#", 1)[0]
+        if is_article_link(absolute, site_url):
+            urls.setdefault(absolute, None)
+    log.info("Found %d article URLs from %s.", len(urls), page_url)
+    return list(urls)
+
+
+def _first_text(tree, xpaths: list[str]) -> str:
+    for xpath in xpaths:
+        for value in tree.xpath(xpath):
+            text = value if isinstance(value, str) else value.text_content()
+            text = " ".join(text.split())
+            if text:
+                return text
+    return ""
+
+
+def scrape_website_article_content(
+    article_url: str, html_content: str | bytes = None
+) -> dict:
     """
     Scrapes content, title, published date, etc., from a given article URL or HTML.
     Args:
         article_url (str): The URL of the article to scrape (if html_content is not provided).
-        html_content (str, optional): Pre-fetched HTML content of the article page.
+        html_content (str | bytes, optional): Pre-fetched HTML content of the article page.
     Returns:
         dict: A dictionary containing 'title', 'content', 'published_date', 'link'.
     """
-    # Example (requires requests and BeautifulSoup4):
-    # import requests
-    # from bs4 import BeautifulSoup
-    #
-    # if html_content:
-    #     soup = BeautifulSoup(html_content, 'html.parser')
-    # elif article_url:
-    #     try:
-    #         response = requests.get(article_url, timeout=10)
-    #         response.raise_for_status()
-    #         soup = BeautifulSoup(response.content, 'html.parser')
-    #     except requests.RequestException as e:
-    #         print(f"Error fetching article {article_url}: {e}")
-    #         return {}
-    # else:
-    #     return {}
-    #
-    # # Placeholder: Add logic to extract title, content, date
-    # title = soup.find('h1').get_text(strip=True) if soup.find('h1') else 'No Title'
-    # # Find main content body (this is highly site-specific)
-    # content_body = soup.find('article') or soup.find('div', class_='content') # Example selectors
-    # content = content_body.get_text(separator='\n', strip=True) if content_body else 'No Content'
-    # published_date = '' # Placeholder: find date metadata
-    #
-    # print(f"Scraped content from: {article_url or 'HTML content'}")
-    # return {
-    #     'title': title,
-    #     'link': article_url if article_url else '',
-    #     'published_date': published_date,
-    #     'content': content,
-    #     'source_type': 'website'
-    # }
-    pass  # Placeholder
-
-
-# Helper function (example, needs implementation)
-# def is_article_link(href: str, base_url: str) -> bool:
-#     # Logic to determine if a link is an article link
-#     # e.g., check for certain path patterns, ensure it's not an external link (unless intended)
-#     if not href:
-#         return False
-#     if href.startswith('http') and not href.startswith(base_url):
-#         return False # External link
-#     # Add more specific rules, e.g., path structure like /news/2024/story...
-#     return True
+    if html_content is None:
+        html_content = fetch_html(article_url) if article_url else None
+        if html_content is None:
+            return {}
+    if not html_content.strip():
+        return {}
+
+    tree = _parse_html(html_content, article_url)
+    if tree is None:
+        return {}
+    for junk in tree.xpath("//script|//style|//noscript|//nav|//footer|//aside"):
+        junk.drop_tree()
+
+    title = (
+        _first_text(
+            tree,
+            [
+                "//meta[@property='og:title']/@content",
+                "//h1",
+                "//title",
+            ],
+        )
+        or "No Title"
+    )
+    published_date = _first_text(
+        tree,
+        [
+            "//meta[@property='article:published_time']/@content",
+            "//time/@datetime",
+            "//time",
+        ],
+    )
+    # Prefer paragraphs inside the article body; fall back to every paragraph on the page.
+    paragraphs = tree.xpath("//article//p") or tree.xpath(
+        "//div[contains(@class, 'content')]//p"
+    )
+    if not paragraphs:
+        paragraphs = tree.xpath("//p")
+    content = "\n".join(
+        text
+        for text in (" ".join(p.text_content().split()) for p in paragraphs)
+        if text
+    )
+
+    return {
+        "title": title,
+        "link": article_url if article_url else "",
+        "published_date": published_date,
+        "content": content or "No Content",
+        "source_type": "website",
+    }
+
+
+def _scrape_page(page: tuple[str, str | bytes]) -> dict:
+    # One malformed page must not abort the whole bulk batch.
+    try:
+        return scrape_website_article_content(page[0], html_content=page[1])
+    except Exception as e:
+        log.warning("Error scraping %s: %s", page[0], e)
+        metrics.count("html_parse_errors")
+        return {}
+
+
+def extract_articles_bulk(
+    pages: Iterable[tuple[str, str | bytes]],
+    max_workers: int = None,
+    chunksize: int = 16,
+) -> list[dict]:
+    """
+    Extracts articles from many pre-fetched `(article_url, html_content)` pairs on a
+    process pool, so parsing scales across cores instead of contending for the GIL.
+    Args:
+        pages (Iterable[tuple[str, str | bytes]]): Article URLs with their fetched HTML.
+        max_workers (int, optional): Worker processes. Defaults to the CPU count; 1 runs inline.
+        chunksize (int, optional): Pages handed to a worker per task.
+    Returns:
+        list[dict]: Scraped articles in input order (empty and unparseable pages are dropped).
+    """
+    if max_workers == 1:
+        articles = map(_scrape_page, pages)
+        return [article for article in articles if article]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        articles = pool.map(_scrape_page, pages, chunksize=chunksize)
+        return [article for article in articles if article]
+
+
+def scrape_website_articles(
+    article_urls: Iterable[str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: DomainRateLimiter = None,
+) -> Iterator[dict]:
+    """
+    Fetches and scrapes many articles concurrently, yielding each article dict as soon
+    as its page has been fetched and parsed.
+    """
+    for url, html in fetch_html_concurrent(
+        article_urls, max_workers=max_workers, rate_limiter=rate_limiter
+    ):
+        article = scrape_website_article_content(url, html_content=html)
+        if article:
+            yield article
+
+
+if __name__ == "__main__":
+    # Demo against a local fixture server: an index page linking to article pages,
+    # scraped with a per-domain rate limit, then bulk extraction on a process pool.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    NUM_ARTICLES = 50
+
+    def _article_html(i: int) -> str:
+        return (
+            f"<html><head><title>Story {i}</title>"
+            f'<meta property="article:published_time" content="2025-01-06T14:{i % 60:02d}:00Z">'
+            f"</head><body><nav><a href='/about'>About</a></nav>"
+            f"<article><h1>Story {i}: AAPL beats estimates</h1>"
+            + "".join(f"<p>Paragraph {j} of story {i}.</p>" for j in range(10))
+            + "</article><footer>Footer</footer></body></html>"
+        )
+
+    index_html = (
+        "<html><body>"
+        + "".join(
+            f"<a href='/news/2025/story-{i}'>Story {i}</a>" for i in range(NUM_ARTICLES)
+        )
+        + "<a href='/tag/markets'>Markets</a><a href='https://other.example.com/x-y'>Ext</a></body></html>"
+    )
+
+    class _FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so the session pool is exercised
+
+        def do_GET(self):
+            if self.path.startswith("/news/2025/story-"):
+                body = _article_html(int(self.path.rsplit("-", 1)[1])).encode()
+            else:
+                body = index_html.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    site = f"http://127.0.0.1:{server.server_address[1]}"
+
+    article_urls = fetch_article_urls_from_site(site, category="news")
+    start = time.perf_counter()
+    scraped = list(
+        scrape_website_articles(
+            article_urls, rate_limiter=DomainRateLimiter(rate=200, capacity=20)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"Scraped {len(scraped)} articles in {elapsed:.2f}s (rate-limited to 200 req/s)"
+    )
+    print(f"Sample: {scraped[0]['title']} | {scraped[0]['published_date']}")
+
+    pages = [(f"{site}/news/2025/story-{i}", _article_html(i)) for i in range(2000)]
+    for workers in (1, None):
+        start = time.perf_counter()
+        bulk = extract_articles_bulk(pages, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        print(
+            f"Bulk extraction (workers={workers or 'cpu_count'}): {len(bulk)} pages in {elapsed:.2f}s"
+        )
+    server.shutdown()
@@ -0,0 +1,378 @@
+# app/feature_engineering/feature_store.py
+# Shared, memoized features for strategies. The store keeps each symbol's recent bars
+# and computes a feature for (symbol, feature, params, bar) at most once;
+# every strategy asking for it on that bar gets the cached value. Entries live in a
+# bounded LRU, and revising a symbol's bars drops that symbol's cached features.
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+from app.feature_engineering import technical_indicators as ti
+
+DEFAULT_MAX_ENTRIES = 500_000
+DEFAULT_MAX_HISTORY = 1_000
+
+FIELDS = ("close", "high", "low", "volume")
+
+
+class SymbolHistory:
+    """
+    The last `max_history` bars of one symbol in NumPy arrays (oldest first). Appends are
+    amortized O(1): arrays hold up to twice `max_history` bars before being compacted.
+    """
+
+    def __init__(self, max_history: int = DEFAULT_MAX_HISTORY):
+        self.max_history = max_history
+        capacity = 2 * max_history
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._fields = {name: np.zeros(capacity, dtype=np.float64) for name in FIELDS}
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[self._start : self._end]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._fields["close"][self._start : self._end]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._fields["high"][self._start : self._end]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._fields["low"][self._start : self._end]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._fields["volume"][self._start : self._end]
+
+    @property
+    def last_timestamp(self) -> float | None:
+        return float(self._timestamps[self._end - 1]) if len(self) else None
+
+    def append(self, timestamp: float, values: dict):
+        if self._end == len(self._timestamps):
+            keep = slice(self._end - self.max_history + 1, self._end)
+            size = keep.stop - keep.start
+            for array in (self._timestamps, *self._fields.values()):
+                array[:size] = array[keep]
+            self._start, self._end = 0, size
+        elif len(self) == self.max_history:
+            self._start += 1
+        self._write(self._end, timestamp, values)
+        self._end += 1
+
+    def replace(self, timestamp: float, values: dict) -> bool:
+        """Overwrites the bar at `timestamp`; returns False if no such bar is held."""
+        timestamps = self.timestamps
+        position = int(np.searchsorted(timestamps, timestamp))
+        if position == len(timestamps) or timestamps[position] != timestamp:
+            return False
+        self._write(self._start + position, timestamp, values)
+        return True
+
+    def _write(self, index: int, timestamp: float, values: dict):
+        self._timestamps[index] = timestamp
+        close = values["close"]
+        for name in FIELDS:
+            value = values.get(name)
+            # Missing high/low default to the close, missing volume to 0.
+            if value is None:
+                value = 0.0 if name == "volume" else close
+            self._fields[name][index] = value
+
+
+def _last(values: np.ndarray) -> float:
+    return float(values[-1]) if len(values) else float("nan")
+
+
+def _window_stats(
+    history: SymbolHistory, window: int = 20, lag: int = 0
+) -> tuple[float, float]:
+    """
+    (mean, population std) of the `window` closes ending `lag` bars before the latest,
+    summed left to right like Python's `sum()`.
+    """
+    end = len(history) - lag
+    if end < window or window <= 0:
+        return float("nan"), float("nan")
+    closes = history.close[end - window : end]
+    mean = np.cumsum(closes)[-1] / window
+    deviations = closes - mean
+    return float(mean), float((np.cumsum(deviations * deviations)[-1] / window) ** 0.5)
+
+
+def _last_of_each(values: tuple) -> tuple[float, ...]:
+    return tuple(_last(v) for v in values)
+
+
+# Built-in features: name -> function(history, **params) returning the value at the
+# latest bar (a float or a tuple of floats).
+BUILTIN_FEATURES = {
+    "close": lambda h: _last(h.close),
+    "sma": lambda h, window=20: _last(ti.sma(h.close, window)),
+    "ema": lambda h, span=20: _last(ti.ema(h.close, span)),
+    "rsi": lambda h, period=14: _last(ti.rsi(h.close, period)),
+    "bollinger_bands": lambda h, window=20, num_std=2.0: _last_of_each(
+        ti.bollinger_bands(h.close, window, num_std)
+    ),
+    "atr": lambda h, period=14: _last(ti.atr(h.high, h.low, h.close, period)),
+    "macd": lambda h, fast=12, slow=26, signal=9: _last_of_each(
+        ti.macd(h.close, fast, slow, signal)
+    ),
+    "volatility": lambda h, window=20, periods_per_year=None: _last(
+        ti.rolling_volatility(h.close, window, periods_per_year)
+    ),
+    "window_stats": _window_stats,
+}
+
+
+class FeatureStore:
+    """
+    Bar history plus memoized features for a symbol universe. Thread-safe: concurrent
+    requests for the same uncomputed feature wait for one computation instead of
+    repeating it. Features read the history without copying it, so append a bar's data
+    before strategies evaluate that bar rather than while they run.
+    Typical use:
+        store.append_bar("AAPL", ts, close=189.9, high=190.4, low=188.7)
+        mean, std = store.get("AAPL", "window_stats", window=20, lag=1)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_history: int = DEFAULT_MAX_HISTORY,
+    ):
+        """
+        Args:
+            max_entries (int, optional): Cached feature values kept; least recently used
+                                         ones are evicted beyond it.
+            max_history (int, optional): Bars kept per symbol. Recursive indicators (EMA,
+                                         RSI, ATR, MACD) are computed over this history.
+        """
+        self.max_entries = max_entries
+        self.max_history = max_history
+        self._features = dict(BUILTIN_FEATURES)
+        self._histories = {}  # symbol -> SymbolHistory
+        # (symbol, feature, params, timestamp, revision) -> value
+        self._cache = OrderedDict()
+        self._keys_by_symbol = {}  # symbol -> set of cache keys
+        # symbol -> count of invalidations. A revised bar keeps its timestamp, so keys
+        # carry this counter to tell values computed before a revision from after it.
+        self._revisions = {}
+        self._pending = {}  # key -> Event set when its computation finishes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def register_feature(self, name: str, function: Callable):
+        """
+        Adds a feature: `function(history: SymbolHistory, **params)` returns its value at
+        the latest bar. Re-registering a name drops that feature's cached values.
+        """
+        with self._lock:
+            replaced = name in self._features
+            self._features[name] = function
+            if replaced:
+                for key in [k for k in self._cache if k[1] == name]:
+                    self._drop(key)
+
+    def append_bar(
+        self,
+        symbol: str,
+        timestamp: float,
+        close: float,
+        high: float = None,
+        low: float = None,
+        volume: float = None,
+    ):
+        """
+        Adds a bar for `symbol`. A bar at the symbol's latest timestamp or earlier is a
+        revision: it replaces the held bar and invalidates the symbol's cached features.
+        """
+        values = {"close": close, "high": high, "low": low, "volume": volume}
+        with self._lock:
+            history = self._histories.get(symbol)
+            if history is None:
+                history = self._histories[symbol] = SymbolHistory(self.max_history)
+            last = history.last_timestamp
+            if last is None or timestamp > last:
+                history.append(timestamp, values)
+                return
+            if not history.replace(timestamp, values):
+                raise ValueError(
+                    f"Bar for {symbol} at {timestamp} is older than the held history "
+                    f"and does not match a held bar"
+                )
+            self._invalidate(symbol)
+
+    def load_history(self, symbol: str, closes, timestamps=None):
+        """Replaces `symbol`'s history with `closes` (timestamps default to 0, 1, 2, ...)."""
+        timestamps = range(len(closes)) if timestamps is None else timestamps
+        with self._lock:
+            self._histories[symbol] = SymbolHistory(self.max_history)
+            self._invalidate(symbol)
+        for timestamp, close in zip(timestamps, closes):
+            self.append_bar(symbol, timestamp, close)
+
+    def history(self, symbol: str) -> SymbolHistory | None:
+        return self._histories.get(symbol)
+
+    def symbols(self) -> list[str]:
+        return list(self._histories)
+
+    def invalidate(self, symbol: str = None):
+        """Drops the cached features of `symbol` (or of every symbol)."""
+        with self._lock:
+            for name in [symbol] if symbol is not None else list(self._keys_by_symbol):
+                self._invalidate(name)
+
+    def _invalidate(self, symbol: str):
+        self._revisions[symbol] = self._revisions.get(symbol, 0) + 1
+        keys = self._keys_by_symbol.pop(symbol, ())
+        for key in keys:
+            self._cache.pop(key, None)
+        self.invalidations += len(keys)
+
+    def _drop(self, key: tuple):
+        self._cache.pop(key, None)
+        keys = self._keys_by_symbol.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+
+    def get(self, symbol: str, feature: str, **params):
+        """
+        The value of `feature` (with `params`) for `symbol` at its latest bar, computed at
+        most once per bar. Unknown symbols give None.
+        """
+        while True:
+            with self._lock:
+                history = self._histories.get(symbol)
+                if history is None or not len(history):
+                    return None
+                key = (
+                    symbol,
+                    feature,
+                    tuple(sorted(params.items())),
+                    history.last_timestamp,
+                    self._revisions.get(symbol, 0),
+                )
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return self._cache[key]
+                pending = self._pending.get(key)
+                if pending is None:
+                    function = self._features.get(feature)
+                    if function is None:
+                        raise KeyError(f"Unknown feature: {feature!r}")
+                    pending = self._pending[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Another thread is computing this value; wait and look it up again.
+            pending.wait()
+        try:
+            value = function(history, **params)
+            with self._lock:
+                # Store only if no bar, revision or new definition arrived while
+                # computing; otherwise the value describes data the store no longer holds.
+                if (
+                    key[4] == self._revisions.get(symbol, 0)
+                    and key[3] == history.last_timestamp
+                    and self._features.get(feature) is function
+                ):
+                    self._cache[key] = value
+                    self._keys_by_symbol.setdefault(symbol, set()).add(key)
+                    while len(self._cache) > self.max_entries:
+                        evicted, _ = self._cache.popitem(last=False)
+                        self._keys_by_symbol.get(evicted[0], set()).discard(evicted)
+                        self.evictions += 1
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            pending.set()
+
+    def get_many(self, symbols: list[str], feature: str, **params) -> dict:
+        """`get` for each of `symbols`, as {symbol: value}."""
+        return {symbol: self.get(symbol, feature, **params) for symbol in symbols}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "symbols": len(self._histories),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+if __name__ == "__main__":
+    # Several strategies on one universe: each feature is computed once per bar however
+    # many strategies read it, revisions invalidate, and the cache stays bounded.
+    import time
+
+    from app.strategies.mean_reversion_strategy.main import MeanReversionStrategy
+
+    rng = np.random.default_rng(0)
+    NUM_SYMBOLS, NUM_BARS, NUM_STRATEGIES = 1_000, 500, 4
+    prices = np.round(
+        100 * np.exp(np.cumsum(rng.normal(0, 0.01, (NUM_SYMBOLS, NUM_BARS)), axis=1)), 2
+    )
+    symbols = [f"S{i}" for i in range(NUM_SYMBOLS)]
+    store = FeatureStore(max_entries=10 * NUM_SYMBOLS)
+    for t in range(NUM_BARS):
+        for i, symbol in enumerate(symbols):
+            store.append_bar(symbol, t, prices[i, t])
+
+    # Indicator-driven strategies all reading RSI, MACD and Bollinger bands.
+    wanted = [("rsi", {}), ("macd", {}), ("bollinger_bands", {"window": 20})]
+    start = time.perf_counter()
+    for _ in range(NUM_STRATEGIES):
+        for symbol in symbols:
+            closes = store.history(symbol).close
+            ti.rsi(closes), ti.macd(closes), ti.bollinger_bands(closes, 20)
+    separate_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(NUM_STRATEGIES):
+        for symbol in symbols:
+            for name, params in wanted:
+                store.get(symbol, name, **params)
+    shared_seconds = time.perf_counter() - start
+    print(
+        f"{NUM_STRATEGIES} strategies x {NUM_SYMBOLS:,} symbols x {len(wanted)} indicators: "
+        f"{separate_seconds * 1000:.0f} ms computing separately, "
+        f"{shared_seconds * 1000:.0f} ms through the store"
+    )
+    print(f"Store stats: {store.stats()}")
+
+    # Mean reversion through the store matches generate_signals on the raw data.
+    config = {"lookback_period": 20, "std_dev_threshold": 2.0}
+    via_store, direct = MeanReversionStrategy(config), MeanReversionStrategy(config)
+    via_store.attach_feature_store(store)
+    data = {
+        s: {
+            "prices": prices[i, :-1].tolist(),
+            "current_price": float(prices[i, -1]),
+        }
+        for i, s in enumerate(symbols)
+    }
+    print(
+        "Mean reversion via store matches generate_signals: "
+        f"{via_store.generate_signals_from_store(symbols) == direct.generate_signals(data)}"
+    )
+
+    store.append_bar(symbols[0], NUM_BARS - 1, prices[0, -1] * 1.1)  # revised last bar
+    print(f"After revising {symbols[0]}'s last bar: {store.stats()}")
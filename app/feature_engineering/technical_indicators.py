@@ -0,0 +1,439 @@
+# app/feature_engineering/technical_indicators.py
+# Technical indicators in two forms:
+# - Batch functions over price arrays shaped (..., time), e.g. symbols x bars, for
+#   backtests. Rolling-window indicators use cumulative sums; recursive ones (EMA, RSI,
+#   ATR, MACD) use a closed form of the recursion over blocks of bars.
+# - Streaming classes holding per-symbol state in arrays; `update` takes one bar for
+#   every symbol and costs O(1) per symbol regardless of the window length.
+# Values are NaN until an indicator has enough history. The two forms agree to floating
+# point rounding (see the check in `__main__`).
+import numpy as np
+
+# Rolling sums in the streaming classes are rebuilt from their buffers after this many
+# updates, so rounding errors in the running sums cannot accumulate.
+REFRESH_INTERVAL = 10_000
+# Upper bound on the bars handled per vectorized block of exponential smoothing.
+_MAX_SMOOTHING_BLOCK = 256
+
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum of each trailing `window` along the last axis (NaN before the first full window)."""
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < window:
+        return out
+    cumulative = np.cumsum(values, axis=-1)
+    out[..., window - 1] = cumulative[..., window - 1]
+    out[..., window:] = cumulative[..., window:] - cumulative[..., :-window]
+    return out
+
+
+def _rolling_mean_std(
+    values: np.ndarray, window: int, ddof: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    # Centering on each series' first value keeps the sums small, so the variance does
+    # not lose precision to cancellation.
+    reference = values[..., :1]
+    centered = values - reference
+    total = _rolling_sum(centered, window)
+    total_sq = _rolling_sum(centered * centered, window)
+    mean = total / window
+    variance = np.maximum(total_sq - total * mean, 0.0) / (window - ddof)
+    return mean + reference, np.sqrt(variance)
+
+
+def _seeded_smoothing(
+    values: np.ndarray, alpha: float, period: int, first: int = 0
+) -> np.ndarray:
+    """
+    Exponential smoothing along the last axis, seeded with the mean of the first
+    `period` values from index `first`: the form used by EMA (alpha = 2 / (period + 1))
+    and by Wilder's RSI/ATR averages (alpha = 1 / period).
+    The recursion y[t] = y[t-1] + alpha * (x[t] - y[t-1]) is evaluated in closed form over
+    blocks of bars, y[s+j] = d^j * (y[s] + alpha * sum_{i<=j} x[s+i] * d^-i) with
+    d = 1 - alpha, so the Python loop runs once per block rather than once per bar.
+    """
+    out = np.full(values.shape, np.nan)
+    start = first + period - 1
+    num_bars = values.shape[-1]
+    if num_bars <= start:
+        return out
+    current = values[..., first : start + 1].mean(axis=-1)
+    out[..., start] = current
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[..., start + 1 :] = values[..., start + 1 :]
+        return out
+    # Longest block whose weights d^-i stay below 1e100.
+    block = int(min(_MAX_SMOOTHING_BLOCK, max(1, 100 / -np.log10(decay))))
+    steps = np.arange(1, block + 1)
+    growth, shrink = decay**-steps, decay**steps
+    for begin in range(start + 1, num_bars, block):
+        end = min(begin + block, num_bars)
+        n = end - begin
+        weighted = np.cumsum(values[..., begin:end] * growth[:n], axis=-1)
+        out[..., begin:end] = shrink[:n] * (current[..., None] + alpha * weighted)
+        current = out[..., end - 1]
+    return out
+
+
+def sma(values, window: int = 20) -> np.ndarray:
+    """Simple moving average over the trailing `window` bars."""
+    values = _as_float(values)
+    reference = values[..., :1]
+    return _rolling_sum(values - reference, window) / window + reference
+
+
+def ema(values, span: int = 20) -> np.ndarray:
+    """Exponential moving average (alpha = 2 / (span + 1)), seeded with the first `span`-bar SMA."""
+    return _seeded_smoothing(_as_float(values), 2.0 / (span + 1), span)
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Wilder's relative strength index (0-100); 50 when prices did not move at all."""
+    close = _as_float(close)
+    change = np.diff(close, axis=-1)
+    average_gain = _seeded_smoothing(np.maximum(change, 0.0), 1.0 / period, period)
+    average_loss = _seeded_smoothing(np.maximum(-change, 0.0), 1.0 / period, period)
+    out = np.full(close.shape, np.nan)
+    out[..., 1:] = _rsi_from_averages(average_gain, average_loss)
+    return out
+
+
+def _rsi_from_averages(average_gain, average_loss):
+    # 100 - 100 / (1 + gain / loss), written so a zero loss gives 100 without dividing by 0.
+    total = average_gain + average_loss
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = 100.0 * average_gain / total
+    out[total == 0] = 50.0
+    return out
+
+
+def bollinger_bands(
+    close, window: int = 20, num_std: float = 2.0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(middle, upper, lower) bands: the SMA plus/minus `num_std` population standard deviations."""
+    middle, std = _rolling_mean_std(_as_float(close), window)
+    return middle, middle + num_std * std, middle - num_std * std
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range; the first bar, which has no previous close, uses high - low."""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    out = high - low
+    previous = close[..., :-1]
+    out[..., 1:] = np.maximum(
+        out[..., 1:],
+        np.maximum(np.abs(high[..., 1:] - previous), np.abs(low[..., 1:] - previous)),
+    )
+    return out
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Wilder's average true range."""
+    return _seeded_smoothing(true_range(high, low, close), 1.0 / period, period)
+
+
+def macd(
+    close, fast: int = 12, slow: int = 26, signal: int = 9
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(macd, signal, histogram): EMA(fast) - EMA(slow), its `signal`-bar EMA, and their difference."""
+    close = _as_float(close)
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = _seeded_smoothing(line, 2.0 / (signal + 1), signal, first=slow - 1)
+    return line, signal_line, line - signal_line
+
+
+def rolling_volatility(
+    close, window: int = 20, periods_per_year: float = None
+) -> np.ndarray:
+    """
+    Sample standard deviation of log returns over the trailing `window` returns,
+    annualized by sqrt(`periods_per_year`) when given (e.g. 252 for daily bars).
+    """
+    close = _as_float(close)
+    out = np.full(close.shape, np.nan)
+    out[..., 1:] = _rolling_mean_std(np.diff(np.log(close), axis=-1), window, ddof=1)[1]
+    return out * np.sqrt(periods_per_year) if periods_per_year else out
+
+
+class RollingWindow:
+    """
+    The last `window` values of each of `num_symbols` series in a ring buffer, with
+    running sums (relative to each series' first value) for O(1) mean and variance.
+    """
+
+    def __init__(self, num_symbols: int, window: int):
+        self.window = window
+        # Time-major, so each update writes one contiguous row.
+        self.buffer = np.zeros((window, num_symbols), dtype=np.float64)
+        self.position = 0  # next row to overwrite
+        self.count = 0  # values pushed so far
+        self.reference = None
+        self.sum = np.zeros(num_symbols, dtype=np.float64)
+        self.sum_sq = np.zeros(num_symbols, dtype=np.float64)
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.window
+
+    def push(self, values: np.ndarray):
+        if self.reference is None:
+            self.reference = values.copy()
+        new = values - self.reference
+        if self.full:
+            old = self.buffer[self.position] - self.reference
+            self.sum += new - old
+            self.sum_sq += new * new - old * old
+        else:
+            self.sum += new
+            self.sum_sq += new * new
+        self.buffer[self.position] = values
+        self.position = (self.position + 1) % self.window
+        self.count += 1
+        if self.count % REFRESH_INTERVAL == 0:
+            centered = self.buffer - self.reference
+            self.sum = centered.sum(axis=0)
+            self.sum_sq = (centered * centered).sum(axis=0)
+
+    def mean(self) -> np.ndarray:
+        return self.reference + self.sum / self.window
+
+    def std(self, ddof: int = 0) -> np.ndarray:
+        mean = self.sum / self.window
+        variance = np.maximum(self.sum_sq - self.sum * mean, 0.0)
+        return np.sqrt(variance / (self.window - ddof))
+
+
+class StreamingSMA:
+    """Streaming `sma`."""
+
+    def __init__(self, num_symbols: int, window: int = 20):
+        self._window = RollingWindow(num_symbols, window)
+        self._nan = np.full(num_symbols, np.nan)
+
+    def update(self, values) -> np.ndarray:
+        self._window.push(_as_float(values))
+        return self._window.mean() if self._window.full else self._nan.copy()
+
+
+class StreamingEMA:
+    """
+    Streaming `ema`. With an explicit `alpha` it is the seeded exponential smoothing
+    behind the other indicators (e.g. alpha = 1 / period for Wilder's averages).
+    """
+
+    def __init__(self, num_symbols: int, span: int = 20, alpha: float = None):
+        self.period = span
+        self.alpha = 2.0 / (span + 1) if alpha is None else alpha
+        self.count = 0
+        self.value = np.zeros(num_symbols, dtype=np.float64)
+        self._nan = np.full(num_symbols, np.nan)
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    def update(self, values) -> np.ndarray:
+        values = _as_float(values)
+        self.count += 1
+        if self.count < self.period:
+            self.value += values
+            return self._nan.copy()
+        if self.count == self.period:
+            self.value = (self.value + values) / self.period
+        else:
+            self.value += self.alpha * (values - self.value)
+        return self.value.copy()
+
+
+class StreamingRSI:
+    """Streaming `rsi`."""
+
+    def __init__(self, num_symbols: int, period: int = 14):
+        self._gain = StreamingEMA(num_symbols, period, alpha=1.0 / period)
+        self._loss = StreamingEMA(num_symbols, period, alpha=1.0 / period)
+        self._previous = None
+
+    def update(self, close) -> np.ndarray:
+        close = _as_float(close)
+        previous, self._previous = self._previous, close
+        if previous is None:
+            return np.full(close.shape, np.nan)
+        change = close - previous
+        average_gain = self._gain.update(np.maximum(change, 0.0))
+        average_loss = self._loss.update(np.maximum(-change, 0.0))
+        if not self._gain.ready:
+            return average_gain
+        return _rsi_from_averages(average_gain, average_loss)
+
+
+class StreamingBollingerBands:
+    """Streaming `bollinger_bands`; `update` returns (middle, upper, lower)."""
+
+    def __init__(self, num_symbols: int, window: int = 20, num_std: float = 2.0):
+        self._window = RollingWindow(num_symbols, window)
+        self.num_std = num_std
+
+    def update(self, close) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        close = _as_float(close)
+        self._window.push(close)
+        if not self._window.full:
+            nan = np.full(close.shape, np.nan)
+            return nan, nan, nan
+        middle = self._window.mean()
+        band = self.num_std * self._window.std()
+        return middle, middle + band, middle - band
+
+
+class StreamingATR:
+    """Streaming `atr`."""
+
+    def __init__(self, num_symbols: int, period: int = 14):
+        self._average = StreamingEMA(num_symbols, period, alpha=1.0 / period)
+        self._previous_close = None
+
+    def update(self, high, low, close) -> np.ndarray:
+        high, low, close = _as_float(high), _as_float(low), _as_float(close)
+        value = high - low
+        if self._previous_close is not None:
+            value = np.maximum(
+                value,
+                np.maximum(
+                    np.abs(high - self._previous_close),
+                    np.abs(low - self._previous_close),
+                ),
+            )
+        self._previous_close = close
+        return self._average.update(value)
+
+
+class StreamingMACD:
+    """Streaming `macd`; `update` returns (macd, signal, histogram)."""
+
+    def __init__(
+        self, num_symbols: int, fast: int = 12, slow: int = 26, signal: int = 9
+    ):
+        self._fast = StreamingEMA(num_symbols, fast)
+        self._slow = StreamingEMA(num_symbols, slow)
+        self._signal = StreamingEMA(num_symbols, signal)
+
+    def update(self, close) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        close = _as_float(close)
+        line = self._fast.update(close) - self._slow.update(close)
+        if not self._slow.ready:
+            return line, line.copy(), line.copy()
+        signal_line = self._signal.update(line)
+        return line, signal_line, line - signal_line
+
+
+class StreamingVolatility:
+    """Streaming `rolling_volatility`."""
+
+    def __init__(
+        self, num_symbols: int, window: int = 20, periods_per_year: float = None
+    ):
+        self._window = RollingWindow(num_symbols, window)
+        self._scale = np.sqrt(periods_per_year) if periods_per_year else 1.0
+        self._previous_log = None
+
+    def update(self, close) -> np.ndarray:
+        log_close = np.log(_as_float(close))
+        previous, self._previous_log = self._previous_log, log_close
+        if previous is not None:
+            self._window.push(log_close - previous)
+        if not self._window.full:
+            return np.full(log_close.shape, np.nan)
+        return self._window.std(ddof=1) * self._scale
+
+
+if __name__ == "__main__":
+    # Batch/streaming agreement on random OHLC bars, then cost of each path for large
+    # symbol universes. Exits non-zero if any indicator disagrees.
+    import sys
+    import time
+
+    def random_bars(num_symbols: int, num_bars: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        returns = rng.standard_t(4, size=(num_symbols, num_bars)) * 0.01
+        close = 100 * np.exp(np.cumsum(returns, axis=1))
+        spread = np.abs(rng.normal(0, 0.005, size=close.shape)) * close
+        return close + spread, close - spread, close
+
+    def indicator_pairs(num_symbols: int):
+        """(name, batch function of (high, low, close), streaming object, update arguments)."""
+        return [
+            ("sma", lambda h, l, c: sma(c), StreamingSMA(num_symbols), "c"),
+            ("ema", lambda h, l, c: ema(c), StreamingEMA(num_symbols), "c"),
+            ("rsi", lambda h, l, c: rsi(c), StreamingRSI(num_symbols), "c"),
+            (
+                "bollinger",
+                lambda h, l, c: bollinger_bands(c),
+                StreamingBollingerBands(num_symbols),
+                "c",
+            ),
+            ("atr", atr, StreamingATR(num_symbols), "hlc"),
+            ("macd", lambda h, l, c: macd(c), StreamingMACD(num_symbols), "c"),
+            (
+                "volatility",
+                lambda h, l, c: rolling_volatility(c, periods_per_year=252),
+                StreamingVolatility(num_symbols, periods_per_year=252),
+                "c",
+            ),
+        ]
+
+    def run_streaming(indicator, arguments, high, low, close) -> tuple:
+        bars = []
+        for t in range(close.shape[1]):
+            args = (
+                (high[:, t], low[:, t], close[:, t])
+                if arguments == "hlc"
+                else (close[:, t],)
+            )
+            value = indicator.update(*args)
+            bars.append(value if isinstance(value, tuple) else (value,))
+        return tuple(np.stack(series, axis=1) for series in zip(*bars))
+
+    high, low, close = random_bars(200, 600)
+    print("Batch vs streaming agreement (200 symbols x 600 bars):")
+    disagreeing = []
+    for name, batch_fn, streaming, arguments in indicator_pairs(200):
+        batch = batch_fn(high, low, close)
+        batch = batch if isinstance(batch, tuple) else (batch,)
+        streamed = run_streaming(streaming, arguments, high, low, close)
+        agree = all(
+            np.array_equal(np.isnan(b), np.isnan(s))
+            and np.allclose(b, s, rtol=1e-9, atol=1e-9, equal_nan=True)
+            for b, s in zip(batch, streamed)
+        )
+        worst = max(np.nanmax(np.abs(b - s)) for b, s in zip(batch, streamed))
+        print(f"  {name:<10} agree={agree}  max abs diff {worst:.1e}")
+        if not agree:
+            disagreeing.append(name)
+    if disagreeing:
+        sys.exit(f"Batch and streaming disagree for: {', '.join(disagreeing)}")
+
+    for num_symbols in (5_000, 50_000):
+        high, low, close = random_bars(num_symbols, 252, seed=1)
+        print(f"{num_symbols:,} symbols, 252 bars:")
+        for name, batch_fn, streaming, arguments in indicator_pairs(num_symbols):
+            start = time.perf_counter()
+            batch_fn(high, low, close)
+            batch_seconds = time.perf_counter() - start
+            timings = []
+            for t in range(close.shape[1]):
+                args = (
+                    (high[:, t], low[:, t], close[:, t])
+                    if arguments == "hlc"
+                    else (close[:, t],)
+                )
+                start = time.perf_counter()
+                streaming.update(*args)
+                timings.append(time.perf_counter() - start)
+            print(
+                f"  {name:<10} batch {batch_seconds * 1000:7.1f} ms; "
+                f"streaming {np.median(timings) * 1e6:7.0f} us per bar"
+            )
@@ -1,4 +1,5 @@
 # app/run_pipeline_test.py
+import contextlib
 import sys
 import os
 
@@ -16,6 +17,7 @@ and individual strategies (SentimentStrategy, MeanReversionStrategy).
 from app.portfolio_manager.ewa_allocator import EWAAllocator
 from app.strategies.sentiment_strategy.main import SentimentStrategy
 from app.strategies.mean_reversion_strategy.main import MeanReversionStrategy
+from app.strategies.runner import StrategyRunner
 from app.data_ingestion.news_main import run_news_ingestion_pipeline
 from app.trading_logic.main import DEFAULT_NEWS_SOURCES_CONFIG
 
@@ -23,6 +25,12 @@ from app.trading_logic.main import DEFAULT_NEWS_SOURCES_CONFIG
 
 
 def run_test():
+    # Closing the runner on exit shuts its threads down even if a step below fails.
+    with contextlib.ExitStack() as cleanup:
+        _run_test(cleanup)
+
+
+def _run_test(cleanup: contextlib.ExitStack):
     print("--- Initializing Test Pipeline ---")
 
     # 1. Initialize Portfolio Manager (EWAAllocator)
@@ -111,18 +119,25 @@ def run_test():
     }
     print("Mock data prepared.")
 
-    # 4. Generate Signals from each strategy
-    sentiment_signals = sentiment_strategy.generate_signals(sentiment_input_data)
-    print(f"\nSignals from {sentiment_strategy.get_name()}:")
-    for signal in sentiment_signals:
-        print(f"  {signal}")
-
-    mean_reversion_signals = mean_reversion_strategy.generate_signals(
-        mock_mean_reversion_data
+    # 4. Generate Signals from all strategies concurrently, each within its deadline
+    strategy_runner = cleanup.enter_context(
+        StrategyRunner(
+            [sentiment_strategy, mean_reversion_strategy], default_timeout=5.0
+        )
     )
-    print(f"\nSignals from {mean_reversion_strategy.get_name()}:")
-    for signal in mean_reversion_signals:
-        print(f"  {signal}")
+    run_result = strategy_runner.run(
+        {
+            sentiment_strategy.get_name(): sentiment_input_data,
+            mean_reversion_strategy.get_name(): mock_mean_reversion_data,
+        }
+    )
+    for name, outcome in run_result["strategies"].items():
+        print(
+            f"\nSignals from {name} ({outcome['status']}, {outcome['seconds'] * 1000:.1f} ms):"
+        )
+        for signal in run_result["signals"]:
+            if signal["strategy_name"] == name:
+                print(f"  {signal}")
 
     # 5. (Optional) Simulate Consolidated Trade Decision based on EWA Allocations
     # This would involve taking signals and current EWA weights to form a portfolio trade.
@@ -132,9 +147,12 @@ def run_test():
 
     # 6. Simulate Performance Feedback for EWA Allocator
     # Performance can be P&L, Sharpe, or any agreed-upon metric.
-    # Using the strategy's own get_performance for this test.
-    sentiment_perf = sentiment_strategy.get_performance()
-    mean_reversion_perf = mean_reversion_strategy.get_performance()
+    # Read through the runner, so a strategy that missed its deadline is not credited
+    # with trades for signals that were never emitted.
+    sentiment_perf = strategy_runner.get_performance(sentiment_strategy.get_name())
+    mean_reversion_perf = strategy_runner.get_performance(
+        mean_reversion_strategy.get_name()
+    )
 
     # EWAAllocator expects performance values (higher is better).
     # The current get_performance() in placeholders returns dicts like {'pnl': ..., 'trades_executed': ...}
@@ -179,15 +197,17 @@ def run_test():
             "current_price": 102,  # Moved up
         }
     }
-    sentiment_signals_p2 = sentiment_strategy.generate_signals(
-        mock_sentiment_data_p2
-    )  # Should be no signal or sell
-    mean_reversion_signals_p2 = mean_reversion_strategy.generate_signals(
-        mock_mean_reversion_data_p2
-    )  # Should be sell
-
-    sentiment_perf_p2 = sentiment_strategy.get_performance()
-    mean_reversion_perf_p2 = mean_reversion_strategy.get_performance()
+    run_result_p2 = strategy_runner.run(
+        {
+            sentiment_strategy.get_name(): mock_sentiment_data_p2,  # Should be no signal or sell
+            mean_reversion_strategy.get_name(): mock_mean_reversion_data_p2,  # Should be sell
+        }
+    )
+
+    sentiment_perf_p2 = strategy_runner.get_performance(sentiment_strategy.get_name())
+    mean_reversion_perf_p2 = strategy_runner.get_performance(
+        mean_reversion_strategy.get_name()
+    )
     strategy_performance_feedback_p2 = {
         "SentimentStrategy": sentiment_perf_p2.get(
             "pnl", 0
@@ -207,6 +227,7 @@ def run_test():
         f"\nUpdated EWA Allocations after Period 2 performance: {ewa_allocator.get_allocations()}"
     )
 
+    strategy_runner.close()
     print("\n--- Test Pipeline Run Finished ---")
 
 
@@ -1,13 +1,24 @@
 import re
 
+from app.core.logging_utils import get_sampled_logger
+
+log = get_sampled_logger(__name__)
+
 # Predefined list of example tickers for simple mention identification
 EXAMPLE_TICKERS = ['AAPL', 'GOOG', 'MSFT', 'AMZN', 'TSLA']
 
-def load_sentiment_model(model_path: str):
-    """Loads a pre-trained sentiment analysis model. (Placeholder)"""
-    print(f"Placeholder: Would load model from {model_path}")
-    # For a simple version, no actual model is loaded.
-    return None
+# Cache key component for `get_sentiment_score` results; bump it whenever the scoring
+# logic changes so previously cached scores are not reused.
+SENTIMENT_MODEL_VERSION = 'placeholder-1'
+
+def load_sentiment_model(model_path: str = None):
+    """
+    Returns the sentiment model `model_path` (a spaCy package name, default en_core_web_sm)
+    from the process-wide model registry. It is loaded and warmed up on the first call
+    only; later calls from anywhere in the process get the same instance.
+    """
+    from app.sentiment_analysis.model_registry import DEFAULT_MODEL_NAME, get_model
+    return get_model(model_path or DEFAULT_MODEL_NAME)
 
 def preprocess_text_for_sentiment(text: str) -> str:
     """Cleans and preprocesses text before sentiment analysis. (Placeholder)"""
@@ -15,24 +26,72 @@ def preprocess_text_for_sentiment(text: str) -> str:
     # A real implementation might involve lowercasing, removing punctuation, stopwords, etc.
     return text
 
-def get_sentiment_score(text: str, model) -> dict:
+def get_sentiment_score(text: str, model, cache=None) -> dict:
     """
     Analyzes text and returns sentiment score. (Placeholder)
     Returns a dummy neutral score.
     The structure `{'score': 0.0}` is assumed by `process_articles_for_sentiment`.
+    With a `SentimentCache` (see sentiment_cache.py), repeated texts are answered from it.
+    If `model` is a `CascadeScorer` (see cascade.py), the score is its polarity.
     """
+    from app.sentiment_analysis.cascade import CascadeScorer
+    if isinstance(model, CascadeScorer):
+        return {'score': get_cascade_scores([text], model, cache)[0]}
+    if cache is not None:
+        cached = cache.get(text, SENTIMENT_MODEL_VERSION)
+        if cached is not None:
+            return {'score': cached[0]}
+        result = get_sentiment_score(text, model)
+        cache.put(text, (result['score'],), SENTIMENT_MODEL_VERSION)
+        return result
+
     # In a real scenario, this would use the 'model' to analyze 'text'.
     # For simplicity, return a neutral score.
     # A more complex sentiment might return {'positive': 0.1, 'negative': 0.1, 'neutral': 0.8, 'compound': 0.0}
     # The `process_articles_for_sentiment` function currently expects a simple dict with a 'score' key.
-    print(f"Placeholder: Analyzing sentiment for text (first 50 chars): {text[:50]}...")
+    log.debug("Placeholder: Analyzing sentiment for text (first 50 chars): %s...", text[:50])
     return {'score': 0.7} # Dummy positive score to trigger BUY signals (threshold is > 0.5)
 
-def identify_stock_mentions(text: str) -> list[str]:
+def get_cascade_scores(texts: list[str], model, cache=None) -> list[float]:
     """
-    Identifies stock tickers or company names mentioned in the text. (Simple Placeholder)
-    For testing pipeline connectivity, this will always return ['AAPL'] if text is provided.
+    Batched `get_sentiment_score` for a `CascadeScorer`: one lexicon pass over all texts
+    and one model call for the ones it escalates. Scores are cached like
+    `get_sentiment_score`'s, so both paths share a `cache`.
     """
+    scores = [None] * len(texts)
+    if cache is not None:
+        scores = [None if cached is None else cached[0] for cached in cache.get_many(texts, model.version)]
+    missing = [i for i, score in enumerate(scores) if score is None]
+    if missing:
+        polarity, _ = model.score([texts[i] for i in missing])
+        for i, score in zip(missing, polarity.tolist()):
+            scores[i] = score
+        if cache is not None:
+            cache.put_many([texts[i] for i in missing], [(scores[i],) for i in missing], model.version)
+    return scores
+
+def get_sentiment_scores_batch(texts, model=None, batch_size: int = 256, n_process: int = 1, cache=None):
+    """
+    Batched counterpart of `get_sentiment_score` for many texts at once.
+    Runs one spaCy `nlp.pipe` pass (optionally over `n_process` worker processes) and
+    returns a float32 array of shape (n_texts, 2) with polarity and subjectivity columns
+    (see `batch_scorer.POLARITY` / `batch_scorer.SUBJECTIVITY`).
+    `model` is an optional pre-loaded spaCy pipeline with spacytextblob; `cache` an optional
+    SentimentCache so that only texts not scored before are run through the model.
+    """
+    from app.sentiment_analysis.batch_scorer import score_texts
+    return score_texts(texts, batch_size=batch_size, n_process=n_process, nlp=model, cache=cache)
+
+def identify_stock_mentions(text: str, matcher=None) -> list[str]:
+    """
+    Identifies stock tickers or company names mentioned in the text.
+    With a `TickerMatcher` (see ticker_matcher.py), all symbols and aliases are found in a
+    single pass over the text. Without one this is still a placeholder: for testing
+    pipeline connectivity, it will always return ['AAPL'] if text is provided.
+    """
+    if matcher is not None:
+        return matcher.find_symbols(text)
+
     # Original logic commented out for testing pipeline flow:
     # mentioned_tickers = []
     # text_upper = text.upper() 
@@ -45,6 +104,6 @@ def identify_stock_mentions(text: str) -> list[str]:
     # return unique_mentions
 
     if text: # If there's any text content
-        print(f"Placeholder: Forcing stock mention 'AAPL' for text (first 50 chars): {text[:50]}...")
+        log.debug("Placeholder: Forcing stock mention 'AAPL' for text (first 50 chars): %s...", text[:50])
         return ['AAPL'] # Force a ticker for every processed article
     return []
@@ -0,0 +1,295 @@
+# app/sentiment_analysis/cascade.py
+# Two-tier sentiment scoring.
+# Tier 1 scores a whole batch with a word-polarity lexicon: texts are tokenized as one
+# Polars column, turned into a sparse token-index matrix (row, token id) and scored with
+# NumPy gathers and bincounts, with no Python work per token. Tier 2 is the spaCy /
+# TextBlob model from batch_scorer, run only on the texts tier 1 is least sure about:
+# few lexicon hits, or a score close to a trading threshold.
+import math
+from typing import Iterable
+
+import numpy as np
+import polars as pl
+
+from app.sentiment_analysis.batch_scorer import (
+    DEFAULT_BATCH_SIZE,
+    POLARITY,
+    model_version,
+    score_texts,
+)
+from app.sentiment_analysis.model_registry import DEFAULT_MODEL_NAME
+
+TOKEN_PATTERN = r"[a-z][a-z']*"
+NEGATIONS = ("no", "not", "never", "n't")
+# Factor applied to a word's polarity after a negation, as TextBlob does.
+NEGATION_FACTOR = -0.5
+# Score thresholds that trading decisions are taken at (decision_engine buys above 0.6).
+DEFAULT_DECISION_THRESHOLDS = (0.6,)
+# Tier 1 confidence below which a text is escalated to tier 2 (see `CascadeScorer.confidence`).
+DEFAULT_CONFIDENCE_THRESHOLD = 0.1
+
+
+def textblob_lexicon() -> dict[str, float]:
+    """Word polarities from TextBlob's lexicon, the same one spacytextblob scores with."""
+    from textblob.en import sentiment
+
+    lexicon = {}
+    for word, tags in sentiment.items():
+        values = tags.get(None) or next(iter(tags.values()))
+        if " " not in word:
+            lexicon[word.lower()] = float(values[0])
+    return lexicon
+
+
+class LexiconScorer:
+    """
+    Vectorized lexicon scorer. A text's polarity is the mean polarity of its lexicon words,
+    with a word's polarity scaled by NEGATION_FACTOR when the preceding token is a negation.
+    """
+
+    def __init__(self, lexicon: dict[str, float] = None):
+        """
+        Args:
+            lexicon (dict[str, float], optional): Word -> polarity in [-1, 1]. Defaults to
+                                                  TextBlob's lexicon.
+        """
+        lexicon = lexicon if lexicon is not None else textblob_lexicon()
+        words = sorted(set(lexicon) | set(NEGATIONS))
+        self.vocabulary = {word: index for index, word in enumerate(words)}
+        self.polarity = np.array([lexicon.get(w, 0.0) for w in words], dtype=np.float64)
+        self.in_lexicon = np.array([w in lexicon for w in words], dtype=bool)
+        self.is_negation = np.array([w in NEGATIONS for w in words], dtype=bool)
+        self._vocabulary_frame = pl.DataFrame(
+            {"token": words, "token_id": np.arange(len(words), dtype=np.int32)}
+        )
+
+    def token_matrix(self, texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sparse token-index matrix of `texts` in coordinate form: parallel `rows` and
+        `token_ids` arrays, sorted by row, holding only tokens in the vocabulary.
+        """
+        tokens = (
+            pl.DataFrame({"text": texts}, schema={"text": pl.String})
+            .with_row_index("row")
+            .select(
+                "row",
+                pl.col("text")
+                .fill_null("")
+                .str.to_lowercase()
+                .str.replace_all("n't", " n't", literal=True)
+                .str.extract_all(TOKEN_PATTERN)
+                .alias("token"),
+            )
+            .explode("token")
+            .with_row_index("position")
+            .join(self._vocabulary_frame, on="token", how="inner")
+            .sort("position")
+        )
+        return (
+            tokens.get_column("row").to_numpy().astype(np.int64),
+            tokens.get_column("token_id").to_numpy(),
+        )
+
+    def score(self, texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Scores `texts`.
+        Returns:
+            tuple[np.ndarray, np.ndarray]: float32 polarity per text (0 when no lexicon
+                                           word occurs) and the int32 lexicon hit count.
+        """
+        n = len(texts)
+        rows, token_ids = self.token_matrix(texts)
+        # Negation applies to the next vocabulary token in the same text.
+        negated = np.zeros(len(token_ids), dtype=bool)
+        if len(token_ids) > 1:
+            negated[1:] = self.is_negation[token_ids[:-1]] & (rows[1:] == rows[:-1])
+        hit = self.in_lexicon[token_ids]
+        weights = self.polarity[token_ids] * np.where(negated, NEGATION_FACTOR, 1.0)
+        sums = np.bincount(rows[hit], weights=weights[hit], minlength=n)
+        hits = np.bincount(rows[hit], minlength=n)
+        polarity = np.divide(sums, hits, out=np.zeros(n), where=hits > 0)
+        return np.clip(polarity, -1.0, 1.0).astype(np.float32), hits.astype(np.int32)
+
+
+class CascadeScorer:
+    """
+    Scores with the lexicon first and sends only the texts it is unsure about (confidence
+    below `confidence_threshold`) to the spaCy model. Confidence grows with the number of
+    lexicon hits and with the distance of the score from the nearest decision threshold,
+    so texts with no lexicon evidence are always escalated. Escalation depends only on
+    each text, so a batch of one is treated like any other.
+    """
+
+    def __init__(
+        self,
+        confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+        max_escalation_rate: float = None,
+        lexicon_scorer: LexiconScorer = None,
+        decision_thresholds: Iterable[float] = DEFAULT_DECISION_THRESHOLDS,
+        model_name: str = DEFAULT_MODEL_NAME,
+        nlp=None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        cache=None,
+    ):
+        """
+        Args:
+            confidence_threshold (float, optional): Texts with a lower tier 1 confidence are
+                                                    re-scored by the model; 0 is lexicon only.
+            max_escalation_rate (float, optional): Cap on the fraction of a batch escalated
+                                                   (the least confident texts win). No cap
+                                                   if None.
+            lexicon_scorer (LexiconScorer, optional): Tier 1. Defaults to the TextBlob lexicon.
+            decision_thresholds (Iterable[float], optional): Scores at which trading decisions flip.
+            model_name (str, optional): Tier 2 model, from the model registry.
+            nlp (optional): Pre-loaded tier 2 pipeline instead of `model_name`.
+            batch_size (int, optional): `nlp.pipe` batch size for tier 2.
+            cache (SentimentCache, optional): Result cache for tier 2 scores.
+        """
+        if confidence_threshold < 0.0:
+            raise ValueError("confidence_threshold must not be negative")
+        if max_escalation_rate is not None and not 0.0 <= max_escalation_rate <= 1.0:
+            raise ValueError("max_escalation_rate must be between 0 and 1")
+        self.confidence_threshold = confidence_threshold
+        self.max_escalation_rate = max_escalation_rate
+        self.lexicon_scorer = (
+            lexicon_scorer if lexicon_scorer is not None else LexiconScorer()
+        )
+        self.decision_thresholds = np.asarray(
+            tuple(decision_thresholds), dtype=np.float32
+        )
+        self.model_name = model_name
+        self.nlp = nlp
+        self.batch_size = batch_size
+        self.cache = cache
+        self.texts_scored = 0
+        self.texts_escalated = 0
+
+    @property
+    def version(self) -> str:
+        """Identifies the scorer configuration for result caches."""
+        return (
+            f"cascade-{self.confidence_threshold:g}-{self.max_escalation_rate}-"
+            f"{model_version(self.nlp, self.model_name)}"
+        )
+
+    def confidence(self, polarity: np.ndarray, hits: np.ndarray) -> np.ndarray:
+        """Tier 1 confidence in [0, 1) per text; 0 for texts without lexicon hits."""
+        if len(self.decision_thresholds):
+            margin = np.abs(polarity[:, None] - self.decision_thresholds[None, :]).min(
+                axis=1
+            )
+        else:
+            margin = np.ones_like(polarity)
+        return margin * (hits / (hits + 1.0))
+
+    def score(self, texts: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Scores `texts` through the cascade.
+        Returns:
+            tuple[np.ndarray, np.ndarray]: float32 polarity per text and a boolean mask of
+                                           the texts that were scored by tier 2.
+        """
+        texts = [text if isinstance(text, str) else str(text or "") for text in texts]
+        polarity, hits = self.lexicon_scorer.score(texts)
+        escalated = np.zeros(len(texts), dtype=bool)
+        confidence = self.confidence(polarity, hits)
+        chosen = np.flatnonzero(confidence < self.confidence_threshold)
+        if self.max_escalation_rate is not None:
+            limit = math.ceil(self.max_escalation_rate * len(texts))
+            if len(chosen) > limit:
+                least_confident = np.argsort(confidence[chosen], kind="stable")
+                chosen = np.sort(chosen[least_confident[:limit]])
+        if len(chosen):
+            escalated[chosen] = True
+            model_scores = score_texts(
+                [texts[i] for i in chosen],
+                batch_size=self.batch_size,
+                model_name=self.model_name,
+                nlp=self.nlp,
+                cache=self.cache,
+            )
+            polarity[chosen] = model_scores[:, POLARITY]
+        self.texts_scored += len(texts)
+        self.texts_escalated += len(chosen)
+        return polarity, escalated
+
+
+if __name__ == "__main__":
+    # Accuracy versus throughput: agreement of the cascade's BUY decisions (and its
+    # polarity error) with the full spaCy model's, across escalation rates.
+    import random
+    import sys
+    import time
+
+    from app.sentiment_analysis.model_registry import get_model
+
+    model = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MODEL_NAME
+    NUM_HEADLINES = 20_000
+    random.seed(0)
+    subjects = ["Apple", "Tesla", "Microsoft", "Shares", "The stock", "Investors"]
+    phrases = [
+        "posted excellent results",
+        "had a great quarter",
+        "reported good sales",
+        "saw weak demand",
+        "faced a terrible week",
+        "is not happy with guidance",
+        "had a bad day",
+        "was upgraded to buy",
+        "trades sideways ahead of earnings",
+        "announced a new product",
+        "beat expectations with amazing growth",
+        "is never a safe bet",
+        "had a very good quarter!",
+        "posted extremely strong numbers",
+        "is not very good at cost control",
+        "delivered really disappointing results",
+        "looks pretty good",
+    ]
+    headlines = [
+        f"{random.choice(subjects)} {random.choice(phrases)} as {random.choice(phrases)}"
+        for _ in range(NUM_HEADLINES)
+    ]
+    nlp = get_model(model)
+
+    lexicon = LexiconScorer()
+    lexicon.score(headlines[:100])
+    start = time.perf_counter()
+    lexicon.score(headlines)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Tier 1 alone: {NUM_HEADLINES / elapsed / 1000:,.0f} headlines/ms "
+        f"({NUM_HEADLINES:,} in {elapsed * 1000:.0f} ms)"
+    )
+
+    start = time.perf_counter()
+    reference = score_texts(headlines, nlp=nlp)[:, POLARITY]
+    model_elapsed = time.perf_counter() - start
+    reference_buy = reference > DEFAULT_DECISION_THRESHOLDS[0]
+    print(f"Tier 2 alone: {NUM_HEADLINES / model_elapsed / 1000:,.1f} headlines/ms")
+
+    for threshold in (0.0, 0.05, 0.1, 0.2, 0.4, math.inf):
+        cascade = CascadeScorer(
+            confidence_threshold=threshold, lexicon_scorer=lexicon, nlp=nlp
+        )
+        start = time.perf_counter()
+        polarity, escalated = cascade.score(headlines)
+        elapsed = time.perf_counter() - start
+        agreement = np.mean(
+            (polarity > DEFAULT_DECISION_THRESHOLDS[0]) == reference_buy
+        )
+        error = np.abs(polarity - reference).mean()
+        print(
+            f"confidence < {threshold:<4g}: escalated {escalated.mean():4.0%}, "
+            f"{NUM_HEADLINES / elapsed / 1000:7.1f} headlines/ms, "
+            f"decision agreement {agreement:.2%}, mean |polarity error| {error:.3f}"
+        )
+
+    # One text at a time escalates exactly the texts a whole batch would.
+    cascade = CascadeScorer(lexicon_scorer=lexicon, nlp=nlp)
+    _, batch_escalated = cascade.score(headlines[:200])
+    single_escalated = [cascade.score([text])[1][0] for text in headlines[:200]]
+    assert list(batch_escalated) == single_escalated
+    print(
+        f"Single-text calls escalated {np.mean(single_escalated):.0%} (same as batch)"
+    )
@@ -1,45 +1,41 @@
-import nltk
-from nltk.tokenize import RegexpTokenizer
-from nltk.stem import WordNetLemmatizer,PorterStemmer
-from nltk.corpus import stopwords
-import re
+# Scores the apple_reviews.csv descriptions for subjectivity and polarity.
+# Importing this module does no work; run it as a script (or call `score_reviews`) to
+# load the data and the model.
 import polars as pl
-import spacy
-from spacytextblob.spacytextblob import SpacyTextBlob 
-lemmatizer = WordNetLemmatizer()
-stemmer = PorterStemmer() 
-df = pl.read_csv('apple_reviews.csv')
+
+from app.sentiment_analysis.batch_scorer import score_texts, POLARITY, SUBJECTIVITY
+from app.sentiment_analysis.model_registry import get_model
+from app.sentiment_analysis.text_preprocessing import preprocess_frame, preprocess_text
+
+REVIEWS_PATH = 'apple_reviews.csv'
+MODEL_NAME = "en_core_web_sm"
+
 def preprocess(sentence):
-    sentence=str(sentence)
-    sentence = sentence.lower()
-    sentence=sentence.replace('{html}',"") 
-    cleanr = re.compile('<.*?>')
-    cleantext = re.sub(cleanr, '', sentence)
-    rem_url=re.sub(r'http\S+', '',cleantext)
-    rem_num = re.sub('[0-9]+', '', rem_url)
-    tokenizer = RegexpTokenizer(r'\w+')
-    tokens = tokenizer.tokenize(rem_num)  
-    filtered_words = [w for w in tokens if len(w) > 2 if not w in stopwords.words('english')]
-    stem_words=[stemmer.stem(w) for w in filtered_words]
-    lemma_words=[lemmatizer.lemmatize(w) for w in stem_words]
-    return " ".join(filtered_words)
-
-
-nlp = spacy.load("en_core_web_sm")
-
-nlp.add_pipe("spacytextblob")
+    # Precompiled patterns and a frozenset stopword lookup; see text_preprocessing.
+    # (Stems and lemmas were computed here but never used, so they are no longer built.)
+    return preprocess_text(sentence)
+
+
 def get_subjectivity(text):
-    doc = nlp(text)
+    doc = get_model(MODEL_NAME)(text)
     return doc._.blob.subjectivity
 
 def get_polarity(text):
-    doc = nlp(text)
+    doc = get_model(MODEL_NAME)(text)
     return doc._.blob.polarity
-df = df.with_columns(
-    pl.col("description").map_elements(preprocess).alias("cleaned_text"),
-    pl.col("cleaned_text").map_elements(get_subjectivity).alias("subjectivity"),
-    pl.col("cleaned_text").map_elements(get_polarity).alias("polarity"),
 
-)
+def score_reviews(path: str = REVIEWS_PATH) -> pl.DataFrame:
+    """Reads the reviews CSV, cleans the descriptions and adds subjectivity/polarity columns."""
+    df = pl.read_csv(path)
+    df = preprocess_frame(df, "description", output_column="cleaned_text")
+    # One batched nlp.pipe pass gives both scores, instead of two nlp() calls per row.
+    scores = score_texts(df["cleaned_text"].to_list(), nlp=get_model(MODEL_NAME))
+    return df.with_columns(
+        pl.Series("subjectivity", scores[:, SUBJECTIVITY]),
+        pl.Series("polarity", scores[:, POLARITY]),
+    )
 
 
+if __name__ == "__main__":
+    df = score_reviews()
+    print(df.select("cleaned_text", "subjectivity", "polarity"))
@@ -1,6 +1,13 @@
+from typing import Iterable, Iterator
+
+from app.core.metrics import metrics
+
 def generate_trading_signals(analyzed_articles: list[dict]) -> list[dict]:
     """Applies the basic sentiment strategy to analyzed articles to generate trading signals."""
-    trading_signals = []
+    return list(iter_trading_signals(analyzed_articles))
+
+def iter_trading_signals(analyzed_articles: Iterable[dict]) -> Iterator[dict]:
+    """Streaming form of `generate_trading_signals`: yields each signal as soon as its article is judged."""
     strategy_params = {'positive_threshold': 0.6}
 
     from app.trading_logic.sentiment_strategy import evaluate_basic_sentiment_strategy
@@ -8,6 +15,45 @@ def generate_trading_signals(analyzed_articles: list[dict]) -> list[dict]:
     for article in analyzed_articles:
         signal = evaluate_basic_sentiment_strategy(article, strategy_params)
         if signal:
-            trading_signals.append(signal)
+            metrics.count('signals_generated')
+            yield signal
 
-    return trading_signals
+def iter_aggregated_trading_signals(analyzed_articles: Iterable[dict], aggregator, strategy_params: dict = None) -> Iterator[dict]:
+    """
+    Signals from per-ticker aggregate sentiment instead of individual articles.
+    Each `{'ticker', 'sentiment_score'}` row (optionally with a 'timestamp') is folded into
+    `aggregator` (a TickerSentimentAggregator), and a BUY is yielded only when a ticker's
+    aggregate state changes into BUY: its decayed mean score exceeds 'positive_threshold'
+    with at least 'min_weight' of decayed article weight behind it. The ticker re-arms once
+    its aggregate falls back to or below the threshold, so a burst of stories on one name
+    yields one signal.
+    """
+    from app.sentiment_analysis.aggregator import ACTION_BUY, ACTION_NONE
+
+    strategy_params = strategy_params or {}
+    positive_threshold = strategy_params.get('positive_threshold', 0.6)
+    min_weight = strategy_params.get('min_weight', 1.0)
+
+    for article in analyzed_articles:
+        symbol = article.get('ticker')
+        score = article.get('sentiment_score')
+        if not symbol or score is None:
+            continue
+        slot = aggregator.update(symbol, score, article.get('timestamp'))
+        aggregate_score = aggregator.score[slot]
+        if aggregate_score > positive_threshold and aggregator.weight[slot] >= min_weight:
+            action = ACTION_BUY
+        else:
+            action = ACTION_NONE
+        if action == aggregator.last_action[slot]:
+            continue
+        aggregator.last_action[slot] = action
+        if action == ACTION_BUY:
+            metrics.count('signals_generated')
+            yield {
+                'action': 'BUY',
+                'symbol': symbol,
+                'confidence': 0.8,
+                'aggregate_score': float(aggregate_score),
+                'article_count': int(aggregator.count[slot]),
+            }
@@ -1,16 +1,67 @@
-from app.sentiment_analysis.analyzer import get_sentiment_score, identify_stock_mentions
+import itertools
+import queue
+from typing import Iterable, Iterator
 
-def process_articles_for_sentiment(raw_articles: list[dict]) -> list[dict]:
-    """Processes a batch of raw articles to add sentiment scores and stock mentions."""
-    processed_articles = []
-    # Assuming a dummy model for now, or that get_sentiment_score handles model loading
-    model = None 
+import numpy as np
+
+from app.core.metrics import metrics
+from app.sentiment_analysis.analyzer import get_cascade_scores, get_sentiment_score, identify_stock_mentions
+from app.sentiment_analysis.batch_scorer import POLARITY, model_version, score_texts
+
+# Articles scored per call when the model is a CascadeScorer.
+CASCADE_BATCH_SIZE = 64
+
+def process_articles_for_sentiment(raw_articles: list[dict], matcher=None, cache=None, pool=None, targeted: bool = False, model=None) -> list[dict]:
+    """
+    Processes a batch of raw articles to add sentiment scores and stock mentions.
+    `matcher` is an optional TickerMatcher used to find the mentioned tickers, and `cache`
+    an optional SentimentCache so repeated (e.g. syndicated) texts are scored only once.
+    `pool` is an optional SentimentWorkerPool that scores the articles on worker processes
+    (a `cache` is consulted before texts are sent to it).
+    With `targeted` (requires `matcher`), each ticker is scored only on the sentences that
+    mention it, instead of sharing one whole-article score (see targeted.py).
+    `model` is an optional scorer for `get_sentiment_score`; a CascadeScorer is run on
+    batches of articles rather than one article at a time. With `targeted` it scores the
+    mention windows instead (a CascadeScorer or a spaCy pipeline with spacytextblob).
+    `pool` scores with the pool's own model, so it cannot be combined with `targeted`
+    or `model`; those combinations raise ValueError.
+    """
+    return list(iter_articles_for_sentiment(raw_articles, matcher, cache, pool, targeted, model))
+
+def iter_articles_for_sentiment(raw_articles: Iterable[dict], matcher=None, cache=None, pool=None, targeted: bool = False, model=None) -> Iterator[dict]:
+    """
+    Streaming form of `process_articles_for_sentiment`: consumes articles one at a time
+    and yields each `{'ticker', 'sentiment_score', ...}` row as soon as it is scored.
+    """
+    if pool is not None and (targeted or model is not None):
+        raise ValueError("a SentimentWorkerPool scores with its own model; it cannot be combined with `targeted` or `model`")
+    from app.sentiment_analysis.cascade import CascadeScorer
+    if targeted:
+        if matcher is None:
+            raise ValueError("targeted sentiment needs a TickerMatcher to locate mentions")
+        from app.sentiment_analysis.targeted import iter_ticker_sentiment
+        score_fn = None
+        if isinstance(model, CascadeScorer):
+            score_fn = lambda texts: np.asarray(get_cascade_scores(texts, model, cache))
+        elif model is not None:
+            score_fn = lambda texts: score_texts(texts, nlp=model, cache=cache)[:, POLARITY]
+        yield from iter_ticker_sentiment(raw_articles, matcher, score_fn=score_fn, cache=cache)
+        return
+    if pool is not None:
+        yield from _iter_articles_on_pool(raw_articles, matcher, pool, cache)
+        return
+    if isinstance(model, CascadeScorer):
+        yield from _iter_articles_with_cascade(raw_articles, matcher, model, cache)
+        return
+    # Without a model get_sentiment_score falls back to its placeholder score
     for article in raw_articles:
         # Assuming article content is in 'content' key
         text_content = article.get('content', '') 
         if text_content:
-            sentiment_result = get_sentiment_score(text_content, model) # model might be None if not needed by dummy
-            stock_mentions = identify_stock_mentions(text_content)
+            with metrics.timer('sentiment_score'):
+                sentiment_result = get_sentiment_score(text_content, model, cache) # model might be None if not needed by dummy
+            with metrics.timer('mention_detection'):
+                stock_mentions = identify_stock_mentions(text_content, matcher)
             
             # Create a new dictionary or update the existing one
             # For simplicity, let's assume we are creating a new structure for analyzed articles
@@ -29,15 +80,94 @@ def process_articles_for_sentiment(raw_articles: list[dict]) -> list[dict]:
             # This is a simplification. A real system might aggregate sentiment per ticker.
             if stock_mentions and sentiment_result:
                 for ticker in stock_mentions:
-                    processed_articles.append({
+                    yield {
                         'ticker': ticker,
                         'sentiment_score': sentiment_result.get('score', 0.0), # Assuming 'score' key
                         'original_article_title': article.get('title', '') # Keep some context
-                    })
+                    }
         # If no content or no mentions, the article is skipped for trading signals
-    return processed_articles
 
-from app.sentiment_analysis.decision_engine import generate_trading_signals
+def _iter_articles_with_cascade(raw_articles: Iterable[dict], matcher, model, cache=None, batch_size: int = CASCADE_BATCH_SIZE) -> Iterator[dict]:
+    """
+    Cascade scoring in batches of `batch_size` articles, so the lexicon tier is vectorized
+    over the batch and the escalated texts reach the model in one call.
+    """
+    iterator = iter(raw_articles)
+    while chunk := list(itertools.islice(iterator, batch_size)):
+        batch = [article for article in chunk if article.get('content', '')]
+        texts = [article['content'] for article in batch]
+        with metrics.timer('sentiment_score', len(texts)):
+            scores = get_cascade_scores(texts, model, cache) if texts else []
+        for article, text_content, score in zip(batch, texts, scores):
+            with metrics.timer('mention_detection'):
+                stock_mentions = identify_stock_mentions(text_content, matcher)
+            for ticker in stock_mentions:
+                yield {
+                    'ticker': ticker,
+                    'sentiment_score': score,
+                    'original_article_title': article.get('title', '')
+                }
+
+def _iter_articles_on_pool(raw_articles: Iterable[dict], matcher, pool, cache=None) -> Iterator[dict]:
+    """
+    Pool-backed scoring: article texts go to the worker processes in batches of
+    `pool.batch_size` (ingestion blocks in `pool.submit` when the pool is saturated) and
+    polarity comes back as the score; each batch's rows are yielded once it finishes.
+    With a `cache`, texts it already holds are answered on the spot without going through
+    the pool, and fresh scores are added to it under the same keys `score_texts` uses for
+    the pool's model.
+    """
+    results = queue.Queue()  # finished batches: (batch_id, articles, scores)
+    in_flight = 0
+    batch = []  # articles waiting for the next batch to fill
+    version = model_version(model_name=pool.model_name) if cache is not None else None
+
+    def rows(article, polarity):
+        with metrics.timer('mention_detection'):
+            stock_mentions = identify_stock_mentions(article.get('content', ''), matcher)
+        for ticker in stock_mentions:
+            yield {
+                'ticker': ticker,
+                'sentiment_score': polarity,
+                'original_article_title': article.get('title', '')
+            }
+
+    def finished(block: bool):
+        nonlocal in_flight
+        while in_flight:
+            try:
+                _, articles, scores = results.get(block=block)
+            except queue.Empty:
+                return
+            in_flight -= 1
+            for article, (polarity, subjectivity) in zip(articles, scores):
+                if polarity != polarity:  # NaN: the batch could not be scored
+                    continue
+                if cache is not None:
+                    cache.put(article['content'], (polarity, subjectivity), version)
+                yield from rows(article, polarity)
+
+    for article in raw_articles:
+        text_content = article.get('content', '')
+        if not text_content:
+            continue
+        if cache is not None:
+            cached = cache.get(text_content, version)
+            if cached is not None:
+                yield from rows(article, cached[0])
+                continue
+        batch.append(article)
+        if len(batch) == pool.batch_size:
+            pool.submit(batch, [a['content'] for a in batch], results)
+            in_flight += 1
+            batch = []
+        yield from finished(block=False)
+    if batch:
+        pool.submit(batch, [a['content'] for a in batch], results)
+        in_flight += 1
+    yield from finished(block=True)
+
+from app.sentiment_analysis.decision_engine import generate_trading_signals, iter_aggregated_trading_signals, iter_trading_signals
 
 def update_articles_with_sentiment(analyzed_articles: list[dict]):
     """Updates stored articles with their sentiment analysis results."""
@@ -47,3 +177,13 @@ def analyze_sentiment_and_generate_signals(analyzed_articles: list[dict]):
     """Analyzes sentiment and generates trading signals."""
     trading_signals = generate_trading_signals(analyzed_articles)
     return trading_signals
+
+def iter_sentiment_signals(analyzed_articles: Iterable[dict], aggregator=None) -> Iterator[dict]:
+    """
+    Streaming form of `analyze_sentiment_and_generate_signals`. With a
+    TickerSentimentAggregator, signals come from per-ticker aggregate state changes
+    instead of one judgement per article.
+    """
+    if aggregator is not None:
+        return iter_aggregated_trading_signals(analyzed_articles, aggregator)
+    return iter_trading_signals(analyzed_articles)
@@ -0,0 +1,160 @@
+# app/sentiment_analysis/model_registry.py
+# Process-wide registry of loaded sentiment models.
+# Nothing is loaded at import: a model is built the first time it is requested (or when
+# `warm_up` is called explicitly at worker start), exactly once per process even under
+# concurrent first use, and the time each load and warm-up took is recorded so cold
+# start cost can be tracked.
+import threading
+import time
+from typing import Callable, Iterable
+
+DEFAULT_MODEL_NAME = "en_core_web_sm"
+# Short text run through a freshly loaded pipeline so lazily initialised state (vocab
+# lookups, lexicons) is built before the first real article arrives.
+WARM_UP_TEXT = "Shares rallied after strong results, but guidance was weak."
+
+
+def load_spacy_sentiment_pipeline(model_name: str):
+    """
+    Builds a spaCy pipeline with the spacytextblob component. `model_name` is an installed
+    package name ("en_core_web_sm") or "blank:<lang>" for a tokenizer-only pipeline.
+    """
+    import spacy
+    from spacytextblob.spacytextblob import SpacyTextBlob  # registers the factory
+
+    if model_name.startswith("blank:"):
+        nlp = spacy.blank(model_name.split(":", 1)[1])
+    else:
+        nlp = spacy.load(model_name)
+    nlp.add_pipe("spacytextblob")
+    return nlp
+
+
+def _warm_up_spacy(nlp):
+    nlp(WARM_UP_TEXT)._.blob.sentiment
+
+
+class ModelRegistry:
+    """
+    Lazily loads models by name and keeps them for the life of the process.
+    Loaders are registered per name; any other name goes to `default_loader`.
+    """
+
+    def __init__(
+        self,
+        default_loader: Callable = load_spacy_sentiment_pipeline,
+        default_warm_up: Callable = _warm_up_spacy,
+    ):
+        self.default_loader = default_loader
+        self.default_warm_up = default_warm_up
+        self._loaders = {}  # name -> (loader, warm_up)
+        self._models = {}
+        self._load_locks = {}
+        self._lock = threading.Lock()
+        self._timings = {}  # name -> {'load_seconds', 'warm_up_seconds', 'loaded_at'}
+
+    def register(self, name: str, loader: Callable, warm_up: Callable = None):
+        """Registers a loader (and optional warm-up callable) for `name`."""
+        with self._lock:
+            self._loaders[name] = (loader, warm_up)
+
+    def get(self, name: str = DEFAULT_MODEL_NAME):
+        """Returns the model `name`, loading and warming it up on first use."""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+        # Per-name lock: concurrent first requests wait for a single load, and loading one
+        # model does not block lookups of others.
+        with load_lock:
+            model = self._models.get(name)
+            if model is not None:
+                return model
+            loader, warm_up = self._loaders.get(
+                name, (self.default_loader, self.default_warm_up)
+            )
+            start = time.perf_counter()
+            model = loader(name)
+            loaded = time.perf_counter()
+            if warm_up is not None:
+                warm_up(model)
+            finished = time.perf_counter()
+            self._timings[name] = {
+                "load_seconds": loaded - start,
+                "warm_up_seconds": finished - loaded,
+                "loaded_at": time.time(),
+            }
+            self._models[name] = model
+            return model
+
+    def warm_up(self, names: Iterable[str] = (DEFAULT_MODEL_NAME,)) -> dict:
+        """
+        Loads and warms up `names` now (e.g. at worker start) so no article pays the cold
+        start. Returns the timings of those models.
+        """
+        for name in names:
+            self.get(name)
+        return {name: self._timings[name] for name in names}
+
+    def is_loaded(self, name: str = DEFAULT_MODEL_NAME) -> bool:
+        return name in self._models
+
+    def stats(self) -> dict:
+        """Load and warm-up timings of every model loaded so far in this process."""
+        with self._lock:
+            return {name: dict(timing) for name, timing in self._timings.items()}
+
+    def unload(self, name: str):
+        """Drops a loaded model (the next `get` loads it again)."""
+        with self._lock:
+            self._models.pop(name, None)
+            self._timings.pop(name, None)
+
+
+# The process-wide registry used by the sentiment modules.
+registry = ModelRegistry()
+
+
+def get_model(name: str = DEFAULT_MODEL_NAME):
+    """Returns the process-wide instance of model `name`, loading it on first use."""
+    return registry.get(name)
+
+
+def warm_up(names: Iterable[str] = (DEFAULT_MODEL_NAME,)) -> dict:
+    """Eagerly loads `names` into the process-wide registry; see `ModelRegistry.warm_up`."""
+    return registry.warm_up(names)
+
+
+if __name__ == "__main__":
+    # Startup measurement: import cost of the sentiment modules (in fresh interpreters,
+    # so nothing is already cached) and the cold load + warm-up of a model.
+    import subprocess
+    import sys
+
+    model = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MODEL_NAME
+    for module in (
+        "app.sentiment_analysis.model_registry",
+        "app.sentiment_analysis.analyzer",
+        "app.sentiment_analysis.clean_nlp_more",
+    ):
+        code = (
+            "import time; start = time.perf_counter(); "
+            f"import {module}; print(time.perf_counter() - start)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True
+        )
+        if result.returncode == 0:
+            print(f"import {module}: {float(result.stdout) * 1000:.0f} ms")
+        else:
+            print(f"import {module}: failed\n{result.stderr}")
+
+    timings = warm_up([model])[model]
+    print(
+        f"{model}: load {timings['load_seconds']:.2f}s, "
+        f"warm-up {timings['warm_up_seconds'] * 1000:.0f} ms"
+    )
+    start = time.perf_counter()
+    get_model(model)
+    print(f"Subsequent get_model: {(time.perf_counter() - start) * 1e6:.1f} us")
@@ -0,0 +1,254 @@
+# app/sentiment_analysis/sentiment_cache.py
+# Two-level cache of sentiment results keyed on a hash of the normalized text plus the
+# model version that produced them. Syndicated and re-published articles repeat the
+# same text many times, so each distinct (text, model) pair only needs scoring once.
+# Lookups go to an in-process LRU first, then to a SQLite table that survives restarts
+# and is held to `max_disk_entries` rows by evicting the least recently used ones.
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Iterable
+
+DEFAULT_MEMORY_ENTRIES = 100_000
+DEFAULT_DISK_ENTRIES = 5_000_000
+# Fraction of `max_disk_entries` removed per eviction, so eviction runs rarely.
+_EVICTION_CHUNK = 0.1
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes text for cache keying: Unicode NFKC and collapsed whitespace. Case and
+    punctuation are kept, since they can change a sentiment score.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text or "").split())
+
+
+def cache_key(text: str, model_version: str) -> bytes:
+    """128-bit key for `text` as scored by `model_version`."""
+    payload = (
+        model_version.encode("utf-8") + b"\0" + normalize_text(text).encode("utf-8")
+    )
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _pack(values: tuple[float, ...]) -> bytes:
+    return array("d", values).tobytes()
+
+
+def _unpack(blob: bytes) -> tuple[float, ...]:
+    values = array("d")
+    values.frombytes(blob)
+    return tuple(values)
+
+
+class SentimentCache:
+    """
+    Thread-safe sentiment result cache. Values are tuples of floats (e.g. `(score,)` or
+    `(polarity, subjectivity)`). Hit and miss counters are kept per layer; see `stats()`.
+    """
+
+    def __init__(
+        self,
+        db_path: str = None,
+        max_memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_disk_entries: int = DEFAULT_DISK_ENTRIES,
+    ):
+        """
+        Args:
+            db_path (str, optional): SQLite file for the persistent layer. If omitted the
+                                     cache is in-process only.
+            max_memory_entries (int, optional): Capacity of the in-process LRU.
+            max_disk_entries (int, optional): Row limit of the persistent layer; least recently
+                                              used rows are evicted beyond it.
+        """
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._conn = None
+        self._disk_rows = 0
+        if db_path is not None:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache "
+                "(key BLOB PRIMARY KEY, value BLOB NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS sentiment_cache_last_access "
+                "ON sentiment_cache (last_access)"
+            )
+            self._disk_rows = self._conn.execute(
+                "SELECT COUNT(*) FROM sentiment_cache"
+            ).fetchone()[0]
+
+    def _remember(self, key: bytes, value: tuple):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """Deletes the least recently used rows once the table exceeds its limit."""
+        if self._disk_rows <= self.max_disk_entries:
+            return
+        excess = self._disk_rows - self.max_disk_entries
+        count = max(excess, int(self.max_disk_entries * _EVICTION_CHUNK), 1)
+        deleted = self._conn.execute(
+            "DELETE FROM sentiment_cache WHERE key IN "
+            "(SELECT key FROM sentiment_cache ORDER BY last_access LIMIT ?)",
+            (count,),
+        ).rowcount
+        self._disk_rows -= deleted
+        self.evictions += deleted
+
+    def get_many(self, texts: list[str], model_version: str) -> list[tuple | None]:
+        """Looks up many texts at once; returns a cached value or None for each."""
+        keys = [cache_key(text, model_version) for text in texts]
+        results = [None] * len(keys)
+        with self._lock:
+            pending = {}  # key -> positions still to look up on disk
+            for i, key in enumerate(keys):
+                value = self._memory.get(key)
+                if value is not None:
+                    self._memory.move_to_end(key)
+                    results[i] = value
+                    self.memory_hits += 1
+                else:
+                    pending.setdefault(key, []).append(i)
+            if pending and self._conn is not None:
+                found = []
+                pending_keys = list(pending)
+                # Stay under SQLite's bound-parameter limit.
+                for start in range(0, len(pending_keys), 500):
+                    chunk = pending_keys[start : start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    found.extend(
+                        self._conn.execute(
+                            f"SELECT key, value FROM sentiment_cache WHERE key IN ({placeholders})",
+                            chunk,
+                        ).fetchall()
+                    )
+                if found:
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE sentiment_cache SET last_access = ? WHERE key = ?",
+                        [(now, key) for key, _ in found],
+                    )
+                    self._conn.commit()
+                for key, blob in found:
+                    value = _unpack(blob)
+                    self._remember(key, value)
+                    for i in pending.pop(key):
+                        results[i] = value
+                        self.disk_hits += 1
+            self.misses += sum(len(positions) for positions in pending.values())
+        return results
+
+    def put_many(
+        self, texts: Iterable[str], values: Iterable[tuple], model_version: str
+    ):
+        """Stores a value for each text, in memory and (if configured) on disk."""
+        rows = [
+            (cache_key(text, model_version), tuple(float(v) for v in value))
+            for text, value in zip(texts, values)
+        ]
+        with self._lock:
+            for key, value in rows:
+                self._remember(key, value)
+            if self._conn is not None and rows:
+                now = time.time()
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO sentiment_cache (key, value, last_access) VALUES (?, ?, ?)",
+                    [(key, _pack(value), now) for key, value in rows],
+                )
+                self._disk_rows += self._conn.total_changes - before
+                self._evict_disk()
+                self._conn.commit()
+
+    def get(self, text: str, model_version: str) -> tuple | None:
+        """Cached value for `text` under `model_version`, or None."""
+        return self.get_many([text], model_version)[0]
+
+    def put(self, text: str, value: tuple, model_version: str):
+        """Stores `value` for `text` under `model_version`."""
+        self.put_many([text], [value], model_version)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current sizes of both layers."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (
+                    (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+                ),
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_rows,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        """Empties both layers (counters are kept)."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM sentiment_cache")
+                self._conn.commit()
+                self._disk_rows = 0
+
+    def close(self):
+        """Closes the backing database."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+if __name__ == "__main__":
+    # Demo: a stream where most texts are syndicated repeats. Scoring cost is replaced by
+    # a fixed delay so the effect of the hit rate is visible without a spaCy model.
+    import os
+    import random
+    import tempfile
+
+    def _slow_score(text):
+        time.sleep(0.0005)
+        return (len(text) % 7 / 7,)
+
+    random.seed(0)
+    stories = [
+        f"Story {i}: shares moved after the quarterly report." for i in range(2_000)
+    ]
+    stream = [
+        random.choice(stories) + random.choice(["", " ", "\n"]) for _ in range(20_000)
+    ]
+    path = os.path.join(tempfile.mkdtemp(prefix="sentiment_cache_"), "cache.sqlite")
+
+    for label in ("cold", "warm restart"):
+        cache = SentimentCache(path, max_memory_entries=500)
+        start = time.perf_counter()
+        for text in stream:
+            if cache.get(text, "demo-v1") is None:
+                cache.put(text, _slow_score(text), "demo-v1")
+        elapsed = time.perf_counter() - start
+        print(f"{label}: {elapsed:.2f}s, {cache.stats()}")
+        cache.close()
+
+    start = time.perf_counter()
+    for text in stream:
+        _slow_score(text)
+    print(f"uncached: {time.perf_counter() - start:.2f}s")
+    os.remove(path)
@@ -0,0 +1,217 @@
+# app/sentiment_analysis/targeted.py
+# Ticker-targeted sentiment: instead of scoring a whole article and copying the score to
+# every ticker it mentions, split the article into sentences with a cheap regex, keep
+# the sentences (plus optional neighbours) that mention each ticker, and score only
+# those windows. Long articles that mention a name once send a fraction of their text
+# to the model, and each ticker gets a score from its own context.
+import bisect
+import itertools
+import re
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+
+from app.sentiment_analysis.batch_scorer import POLARITY, score_texts
+from app.sentiment_analysis.ticker_matcher import TickerMatcher
+
+# A sentence ends at ., ! or ? (optionally followed by closing quotes/brackets) and
+# whitespace, when the next sentence starts with an upper-case letter, digit, quote or
+# bracket; blank lines and line breaks before bullets also end sentences.
+_SENTENCE_END_RE = re.compile(
+    r"""(?<=[.!?])["')\]]*\s+(?=["'(\[A-Z0-9$])|\n\s*\n|\n(?=\s*[-*•])"""
+)
+# Abbreviations that end in a period without ending the sentence.
+_ABBREVIATIONS = frozenset(
+    {
+        "inc",
+        "corp",
+        "co",
+        "ltd",
+        "plc",
+        "mr",
+        "mrs",
+        "ms",
+        "dr",
+        "st",
+        "jr",
+        "sr",
+        "vs",
+        "u.s",
+        "u.k",
+        "e.g",
+        "i.e",
+        "jan",
+        "feb",
+        "mar",
+        "apr",
+        "jun",
+        "jul",
+        "aug",
+        "sep",
+        "sept",
+        "oct",
+        "nov",
+        "dec",
+    }
+)
+_LAST_WORD_RE = re.compile(r"([A-Za-z.]+)\.$")
+
+
+def split_sentences(text: str) -> list[tuple[int, int]]:
+    """Splits `text` into sentences, returned as `(start, end)` character offsets."""
+    spans = []
+    start = 0
+    for boundary in _SENTENCE_END_RE.finditer(text):
+        last_word = _LAST_WORD_RE.search(text, start, boundary.start())
+        if last_word and last_word.group(1).lower() in _ABBREVIATIONS:
+            continue
+        if boundary.start() > start:
+            spans.append((start, boundary.start()))
+        start = boundary.end()
+    if start < len(text) and text[start:].strip():
+        spans.append((start, len(text)))
+    return spans
+
+
+def ticker_windows(
+    text: str, matcher: TickerMatcher, context_sentences: int = 0
+) -> dict[str, str]:
+    """
+    Maps each ticker mentioned in `text` to the sentences that mention it (plus
+    `context_sentences` neighbours on each side), joined in article order.
+    """
+    mentions = matcher.find_mentions(text)
+    if not mentions:
+        return {}
+    spans = split_sentences(text)
+    starts = [start for start, _ in spans]
+    sentences_by_ticker = {}
+    for symbol, mention_start, _ in mentions:
+        index = max(0, bisect.bisect_right(starts, mention_start) - 1)
+        selected = sentences_by_ticker.setdefault(symbol, set())
+        low = max(0, index - context_sentences)
+        high = min(len(spans) - 1, index + context_sentences)
+        selected.update(range(low, high + 1))
+    return {
+        symbol: " ".join(
+            text[spans[i][0] : spans[i][1]].strip() for i in sorted(indices)
+        )
+        for symbol, indices in sentences_by_ticker.items()
+    }
+
+
+def iter_ticker_sentiment(
+    raw_articles: Iterable[dict],
+    matcher: TickerMatcher,
+    score_fn: Callable[[list[str]], np.ndarray] = None,
+    context_sentences: int = 0,
+    batch_size: int = 256,
+    cache=None,
+) -> Iterator[dict]:
+    """
+    Scores each (article, ticker) pair on the ticker's own sentences.
+    Articles are processed in batches of `batch_size`, and all windows of a batch are
+    scored in one call.
+    Args:
+        raw_articles (Iterable[dict]): Articles with 'content' (and 'title').
+        matcher (TickerMatcher): Finds tickers and their positions.
+        score_fn (Callable, optional): Maps a list of texts to an array of scores. Defaults to
+                                       spaCy/TextBlob polarity via `score_texts`; a
+                                       `CascadeScorer`'s `lambda t: scorer.score(t)[0]` also fits.
+        context_sentences (int, optional): Neighbouring sentences added on each side.
+        batch_size (int, optional): Articles per scoring call.
+        cache (SentimentCache, optional): Result cache for the default scorer.
+    Yields:
+        dict: `{'ticker', 'sentiment_score', 'original_article_title'}` rows.
+    """
+    if score_fn is None:
+
+        def score_fn(texts: list[str]) -> np.ndarray:
+            return score_texts(texts, cache=cache)[:, POLARITY]
+
+    iterator = iter(raw_articles)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        rows, windows = [], []
+        for article in batch:
+            text_content = article.get("content", "")
+            if not text_content:
+                continue
+            for ticker, window in ticker_windows(
+                text_content, matcher, context_sentences
+            ).items():
+                rows.append((ticker, article.get("title", "")))
+                windows.append(window)
+        if not windows:
+            continue
+        scores = score_fn(windows)
+        for (ticker, title), score in zip(rows, scores):
+            yield {
+                "ticker": ticker,
+                "sentiment_score": float(score),
+                "original_article_title": title,
+            }
+
+
+if __name__ == "__main__":
+    # Text sent to the model, whole-article versus ticker windows, on long synthetic
+    # articles that mention each name in one or two sentences.
+    import random
+    import sys
+    import time
+
+    from app.sentiment_analysis.model_registry import get_model
+
+    model = sys.argv[1] if len(sys.argv) > 1 else "en_core_web_sm"
+    random.seed(0)
+    filler = [
+        "Markets were mixed in early trading as investors weighed the latest data.",
+        "Treasury yields edged higher after the Fed minutes were released.",
+        "Oil prices slipped on concerns about global demand.",
+        "Analysts said volumes were light ahead of the holiday weekend.",
+        "The dollar was little changed against a basket of currencies.",
+    ]
+    company_lines = {
+        "AAPL": "Apple Inc. posted excellent iPhone sales and a great outlook.",
+        "TSLA": "Tesla had a terrible quarter with weak deliveries.",
+        "MSFT": "Microsoft shares were flat after the announcement.",
+    }
+    articles = []
+    for i in range(500):
+        sentences = random.choices(filler, k=40)
+        for ticker in random.sample(list(company_lines), 2):
+            sentences.insert(random.randrange(len(sentences)), company_lines[ticker])
+        articles.append({"title": f"Market wrap {i}", "content": " ".join(sentences)})
+    matcher = TickerMatcher(
+        {"AAPL": ["Apple"], "TSLA": ["Tesla"], "MSFT": ["Microsoft"]}
+    )
+    nlp = get_model(model)
+
+    start = time.perf_counter()
+    whole = score_texts([a["content"] for a in articles], nlp=nlp)[:, POLARITY]
+    whole_elapsed = time.perf_counter() - start
+    whole_chars = sum(len(a["content"]) for a in articles)
+
+    window_lengths = []
+
+    def _score(texts):
+        window_lengths.extend(len(t) for t in texts)
+        return score_texts(texts, nlp=nlp)[:, POLARITY]
+
+    start = time.perf_counter()
+    rows = list(iter_ticker_sentiment(articles, matcher, score_fn=_score))
+    targeted_elapsed = time.perf_counter() - start
+    sent_chars = sum(window_lengths)
+
+    print(f"Whole articles: {whole_chars:,} chars scored in {whole_elapsed:.2f}s")
+    print(
+        f"Ticker windows: {sent_chars:,} chars scored in {targeted_elapsed:.2f}s "
+        f"({whole_chars / sent_chars:.0f}x less text, {whole_elapsed / targeted_elapsed:.1f}x faster)"
+    )
+    by_ticker = {}
+    for row in rows:
+        by_ticker.setdefault(row["ticker"], []).append(row["sentiment_score"])
+    print(f"Mean whole-article score copied to every ticker: {whole.mean():.3f}")
+    for ticker, scores in sorted(by_ticker.items()):
+        print(
+            f"{ticker}: mean targeted score {np.mean(scores):.3f} over {len(scores)} mentions"
+        )
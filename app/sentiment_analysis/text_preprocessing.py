@@ -0,0 +1,190 @@
+# app/sentiment_analysis/text_preprocessing.py
+# Column-wise text preprocessing on Polars.
+# Produces the same cleaned text as `clean_nlp_more.preprocess` (lowercase, strip
+# '{html}', tags, URLs and digits, keep \w+ tokens longer than two characters that are
+# not English stopwords), but as native Polars string/list expressions over whole
+# columns instead of a Python call per row.
+import functools
+
+import polars as pl
+import regex
+
+# Patterns shared by the column engine (Polars/Rust regex) and the scalar fallback.
+HTML_MARKER = "{html}"
+TAG_PATTERN = r"<.*?>"
+# \S spelled out: stdlib `re` (the original tokenizer) also treats \x1c-\x1f as space.
+URL_PATTERN = r"http[^\s\x1c-\x1f]+"
+DIGIT_PATTERN = r"[0-9]+"
+TOKEN_PATTERN = r"\w+"
+MIN_TOKEN_LENGTH = 3
+
+# The scalar path compiles them with `regex` rather than `re`: its Unicode classes
+# match Polars' engine and NLTK's RegexpTokenizer (which also uses `regex`), e.g. \w
+# includes combining marks and excludes circled digits, where stdlib `re` differs.
+_TAG_RE = regex.compile(TAG_PATTERN)
+_URL_RE = regex.compile(URL_PATTERN)
+_DIGIT_RE = regex.compile(DIGIT_PATTERN)
+_TOKEN_RE = regex.compile(TOKEN_PATTERN)
+
+
+@functools.lru_cache(maxsize=None)
+def english_stopwords() -> frozenset:
+    """NLTK's English stopword list, loaded once as a frozenset for O(1) lookups."""
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.words("english"))
+
+
+@functools.lru_cache(maxsize=None)
+def _lemmatizer():
+    from nltk.stem import WordNetLemmatizer
+
+    return WordNetLemmatizer()
+
+
+@functools.lru_cache(maxsize=1_000_000)
+def lemmatize_token(token: str) -> str:
+    """WordNet lemma of `token`, memoized so each distinct word is lemmatized once."""
+    return _lemmatizer().lemmatize(token)
+
+
+def preprocess_text(sentence) -> str:
+    """Scalar version of the cleaning pipeline, for single texts outside a DataFrame."""
+    text = str(sentence).lower().replace(HTML_MARKER, "")
+    text = _DIGIT_RE.sub("", _URL_RE.sub("", _TAG_RE.sub("", text)))
+    stop = english_stopwords()
+    return " ".join(
+        token
+        for token in _TOKEN_RE.findall(text)
+        if len(token) >= MIN_TOKEN_LENGTH and token not in stop
+    )
+
+
+def tokens_expr(column: str | pl.Expr) -> pl.Expr:
+    """
+    Expression producing the filtered token list for each row of a string column.
+    Args:
+        column (str | pl.Expr): Column name or expression holding raw text.
+    """
+    expr = pl.col(column) if isinstance(column, str) else column
+    stop = pl.Series(sorted(english_stopwords()), dtype=pl.String)
+    return (
+        expr.cast(pl.String)
+        .fill_null("None")  # matches str(None) in the scalar path
+        .str.to_lowercase()
+        .str.replace_all(HTML_MARKER, "", literal=True)
+        .str.replace_all(TAG_PATTERN, "")
+        .str.replace_all(URL_PATTERN, "")
+        .str.replace_all(DIGIT_PATTERN, "")
+        .str.extract_all(TOKEN_PATTERN)
+        .list.eval(
+            pl.element().filter(
+                (pl.element().str.len_chars() >= MIN_TOKEN_LENGTH)
+                & ~pl.element().is_in(stop.implode())
+            )
+        )
+    )
+
+
+def preprocess_column(column: str | pl.Expr) -> pl.Expr:
+    """Expression producing the cleaned, space-joined text for each row of a string column."""
+    return tokens_expr(column).list.join(" ")
+
+
+def preprocess_frame(
+    df: pl.DataFrame,
+    column: str,
+    output_column: str = "cleaned_text",
+    lemmatize: bool = False,
+) -> pl.DataFrame:
+    """
+    Adds `output_column` with the cleaned text of `column`.
+    Args:
+        df (pl.DataFrame): Input frame.
+        column (str): Raw text column.
+        output_column (str, optional): Name of the cleaned text column.
+        lemmatize (bool, optional): Replace tokens with their WordNet lemmas. Each distinct
+                                    token in the frame is lemmatized once (and memoized
+                                    across calls), then mapped back over the column.
+    Returns:
+        pl.DataFrame: `df` with the cleaned column added.
+    """
+    if not lemmatize:
+        return df.with_columns(preprocess_column(column).alias(output_column))
+
+    df = df.with_columns(tokens_expr(column).alias(output_column))
+    vocabulary = df.get_column(output_column).explode().drop_nulls().unique()
+    lemmas = {token: lemmatize_token(token) for token in vocabulary.to_list()}
+    changed = {token: lemma for token, lemma in lemmas.items() if token != lemma}
+    tokens = pl.col(output_column)
+    if changed:
+        tokens = tokens.list.eval(pl.element().replace(changed))
+    return df.with_columns(tokens.list.join(" ").alias(output_column))
+
+
+if __name__ == "__main__":
+    # Benchmark on a 1M-row synthetic corpus: the old row-by-row preprocess (timed on a
+    # sample and extrapolated, as it is O(tokens x stopwords)) versus the column engine.
+    import random
+    import re
+    import time
+
+    from nltk.corpus import stopwords
+    from nltk.tokenize import RegexpTokenizer
+
+    NUM_ROWS = 1_000_000
+    SAMPLE_ROWS = 2_000
+
+    def _legacy_preprocess(sentence):
+        sentence = str(sentence).lower().replace("{html}", "")
+        cleantext = re.sub(re.compile("<.*?>"), "", sentence)
+        rem_num = re.sub("[0-9]+", "", re.sub(r"http\S+", "", cleantext))
+        tokens = RegexpTokenizer(r"\w+").tokenize(rem_num)
+        return " ".join(
+            w for w in tokens if len(w) > 2 if not w in stopwords.words("english")
+        )
+
+    random.seed(0)
+    words = (
+        "the apple iphone sales were strong but margins and guidance for the next "
+        "quarter look weak according to analysts who cover this company closely"
+    ).split()
+    corpus = [
+        f"<p>Review {i}: "
+        + " ".join(random.choices(words, k=25))
+        + f" see https://example.com/{i} {{html}}</p>"
+        for i in range(NUM_ROWS)
+    ]
+    df = pl.DataFrame({"description": corpus})
+
+    start = time.perf_counter()
+    legacy = [_legacy_preprocess(text) for text in corpus[:SAMPLE_ROWS]]
+    legacy_rate = SAMPLE_ROWS / (time.perf_counter() - start)
+    print(
+        f"Row-by-row (legacy): {legacy_rate:,.0f} rows/s -> ~{NUM_ROWS / legacy_rate:,.0f}s for {NUM_ROWS:,} rows"
+    )
+
+    start = time.perf_counter()
+    cleaned = preprocess_frame(df, "description")
+    elapsed = time.perf_counter() - start
+    print(
+        f"Column engine: {NUM_ROWS:,} rows in {elapsed:.2f}s ({NUM_ROWS / elapsed:,.0f} rows/s)"
+    )
+    assert cleaned["cleaned_text"][:SAMPLE_ROWS].to_list() == legacy
+
+    # All three paths must agree on Unicode case mapping and word classes too.
+    unicode_texts = [
+        "İstanbul rises",
+        "①②③ gains",
+        "x\u0301yz abc",
+        "ΣΊΣΥΦΟΣ straße",
+        "٣٤٥ Ⅻ ﬁnance",
+        "tab\x1chttp://a.b\x1cend",
+    ]
+    unicode_frame = preprocess_frame(pl.DataFrame({"t": unicode_texts}), "t")
+    for text, framed in zip(unicode_texts, unicode_frame["cleaned_text"]):
+        assert preprocess_text(text) == _legacy_preprocess(text) == framed, text
+
+    start = time.perf_counter()
+    preprocess_frame(df, "description", lemmatize=True)
+    print(f"Column engine + lemmatization: {time.perf_counter() - start:.2f}s")
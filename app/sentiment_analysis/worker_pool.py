@@ -0,0 +1,534 @@
+# app/sentiment_analysis/worker_pool.py
+# Supervised pool of sentiment scoring processes.
+# Each worker process loads and warms up the model once at start, then scores batches
+# of (article_id, text) pairs from its own task queue and answers on its own pipe, so a
+# worker that dies mid-write cannot wedge the others. A supervisor thread in the parent
+# collects results, restarts workers that die (re-dispatching the batches they held),
+# and a bounded number of in-flight batches makes producers block when the pool is busy.
+# A worker that keeps dying before it is ready (e.g. the model is not installed) is
+# restarted with exponential backoff and retired after `max_startup_failures`; once every
+# worker is retired the pool fails its pending batches and rejects new ones.
+import itertools
+import math
+import multiprocessing
+import multiprocessing.connection
+import queue
+import threading
+import time
+from typing import Hashable, Iterable, Iterator
+
+from app.core.logging_utils import get_sampled_logger
+from app.core.metrics import metrics
+from app.sentiment_analysis.model_registry import DEFAULT_MODEL_NAME
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_MAX_STARTUP_FAILURES = 5
+# Result sentinel for articles whose batch could not be scored.
+FAILED_SCORE = (math.nan, math.nan)
+
+log = get_sampled_logger(__name__)
+
+_pool_ids = itertools.count()
+
+
+def _worker_main(worker_id: int, model_name: str, tasks, results):
+    """Worker process loop: warm up once, then score batches until a None task arrives."""
+    from app.sentiment_analysis.batch_scorer import score_texts
+    from app.sentiment_analysis.model_registry import get_model, warm_up
+
+    start = time.perf_counter()
+    warm_up([model_name])
+    results.send(("ready", worker_id, time.perf_counter() - start))
+    nlp = get_model(model_name)
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        batch_id, texts = task
+        try:
+            scores = score_texts(texts, batch_size=len(texts) or 1, nlp=nlp)
+            results.send(("done", worker_id, batch_id, scores.tolist()))
+        except Exception as e:
+            results.send(("error", worker_id, batch_id, repr(e)))
+
+
+class _Worker:
+    __slots__ = (
+        "worker_id",
+        "process",
+        "tasks",
+        "results",
+        "outstanding",
+        "ready",
+        "startup_failures",
+        "restart_at",
+    )
+
+    def __init__(self, worker_id: int, process, tasks, results, startup_failures: int):
+        self.worker_id = worker_id
+        self.process = process
+        self.tasks = tasks
+        self.results = results  # read end of the worker's result pipe
+        self.outstanding = set()  # batch IDs dispatched to this worker and not finished
+        self.ready = False  # set once the worker has loaded its model
+        self.startup_failures = startup_failures  # consecutive deaths before ready
+        self.restart_at = None  # monotonic time of the pending restart, once dead
+
+
+class _Batch:
+    __slots__ = (
+        "batch_id",
+        "article_ids",
+        "texts",
+        "results",
+        "attempts",
+        "submitted_at",
+    )
+
+    def __init__(
+        self, batch_id: int, article_ids: list, texts: list[str], results: queue.Queue
+    ):
+        self.batch_id = batch_id
+        self.article_ids = article_ids
+        self.texts = texts
+        self.results = results  # where the finished batch is delivered
+        self.attempts = 0
+        self.submitted_at = time.perf_counter()
+
+
+class SentimentWorkerPool:
+    """
+    Multi-process sentiment scorer. Use `score_stream` to score an iterable of
+    `(article_id, text)` pairs; results come back as `(article_id, polarity, subjectivity)`
+    either in input order or as soon as each batch finishes.
+    """
+
+    def __init__(
+        self,
+        num_workers: int = None,
+        model_name: str = DEFAULT_MODEL_NAME,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_pending_batches: int = None,
+        max_retries: int = 2,
+        mp_context: str = None,
+        restart_backoff: float = 0.5,
+        max_restart_backoff: float = 30.0,
+        max_startup_failures: int = DEFAULT_MAX_STARTUP_FAILURES,
+    ):
+        """
+        Starts the workers (they load the model in the background).
+        Args:
+            num_workers (int, optional): Worker processes. Defaults to the CPU count.
+            model_name (str, optional): Model each worker loads from its model registry.
+            batch_size (int, optional): Articles per batch sent to a worker.
+            max_pending_batches (int, optional): Batches allowed in flight; submitting more
+                                                 blocks. Defaults to 2 per worker.
+            max_retries (int, optional): Times a batch is re-dispatched after its worker dies
+                                         or raises, before its articles get FAILED_SCORE.
+            mp_context (str, optional): multiprocessing start method ('spawn', 'fork', ...).
+            restart_backoff (float, optional): Delay before restarting a worker that died
+                                               before it was ready; doubles on each
+                                               consecutive failure.
+            max_restart_backoff (float, optional): Upper bound of that delay, in seconds.
+            max_startup_failures (int, optional): Consecutive startup failures after which a
+                                                  worker is not restarted again.
+        """
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+        self.max_startup_failures = max_startup_failures
+        self._ctx = multiprocessing.get_context(mp_context)
+        self._slots = threading.BoundedSemaphore(
+            max_pending_batches or 2 * self.num_workers
+        )
+        self._lock = threading.Lock()
+        self._batches = {}  # batch_id -> _Batch, until finished
+        self._waiting = []  # batch IDs to send once a worker is running again
+        self._batch_ids = itertools.count()
+        self._closing = threading.Event()
+        self._failure = None  # why the pool gave up, once every worker is retired
+        self.restarts = 0
+        self.failed_batches = 0
+        self.startup_seconds = []  # model load + warm-up time of every worker start
+        self._workers = [self._start_worker(i) for i in range(self.num_workers)]
+        # Per-pool name, so several pools in one process don't share a gauge.
+        self._gauge_name = f"sentiment_pool_{next(_pool_ids)}_in_flight_batches"
+        metrics.register_gauge(self._gauge_name, lambda: len(self._batches))
+        self._supervisor = threading.Thread(
+            target=self._supervise, name="sentiment-pool-supervisor", daemon=True
+        )
+        self._supervisor.start()
+
+    def _start_worker(self, worker_id: int, startup_failures: int = 0) -> _Worker:
+        tasks = self._ctx.Queue()
+        reader, writer = self._ctx.Pipe(duplex=False)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.model_name, tasks, writer),
+            name=f"sentiment-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        writer.close()  # the worker holds the only write end, so its exit shows as EOF
+        return _Worker(worker_id, process, tasks, reader, startup_failures)
+
+    def _dispatch(self, batch: _Batch):
+        """Counts an attempt of `batch` and sends it to a running worker. Holds `_lock`."""
+        batch.attempts += 1
+        self._send(batch)
+
+    def _send(self, batch: _Batch):
+        """
+        Sends `batch` to the running worker with the fewest outstanding batches, or parks
+        it until one is restarted. Holds `_lock`.
+        """
+        running = [w for w in self._workers if w.restart_at is None]
+        if not running:
+            self._waiting.append(batch.batch_id)
+            return
+        worker = min(running, key=lambda w: len(w.outstanding))
+        worker.outstanding.add(batch.batch_id)
+        worker.tasks.put((batch.batch_id, batch.texts))
+
+    def _finish(self, batch_id: int, scores: list | None):
+        """Hands a finished batch to the consumer and frees its in-flight slot. Holds `_lock`."""
+        batch = self._batches.pop(batch_id, None)
+        if batch is None:
+            return  # a late duplicate from a batch that was already re-dispatched
+        if scores is None:
+            self.failed_batches += 1
+            metrics.count("sentiment_pool_failed_batches")
+            scores = [FAILED_SCORE] * len(batch.article_ids)
+        metrics.observe(
+            "sentiment_pool_batch",
+            time.perf_counter() - batch.submitted_at,
+            len(batch.article_ids),
+        )
+        batch.results.put((batch_id, batch.article_ids, scores))
+        self._slots.release()
+
+    def _retry_or_fail(self, batch_id: int, reason: str):
+        batch = self._batches.get(batch_id)
+        if batch is None:
+            return
+        if batch.attempts > self.max_retries:
+            log.warning(
+                "Sentiment batch %d failed after %d attempts: %s",
+                batch_id,
+                batch.attempts,
+                reason,
+            )
+            self._finish(batch_id, None)
+        else:
+            self._dispatch(batch)
+
+    def _handle(self, message: tuple):
+        """Applies one worker message. Holds `_lock`."""
+        kind, worker_id = message[0], message[1]
+        if kind == "ready":
+            self._workers[worker_id].ready = True
+            self._workers[worker_id].startup_failures = 0
+            self.startup_seconds.append(message[2])
+            return
+        batch_id = message[2]
+        self._workers[worker_id].outstanding.discard(batch_id)
+        if kind == "done":
+            self._finish(batch_id, message[3])
+        else:
+            self._retry_or_fail(batch_id, message[3])
+
+    def _fail_all(self):
+        """Finishes every unfinished batch with FAILED_SCORE. Holds `_lock`."""
+        self._waiting = []
+        for worker in self._workers:
+            worker.outstanding.clear()
+        for batch_id in list(self._batches):
+            self._finish(batch_id, None)
+
+    def _restart_due_workers(self):
+        """Starts workers whose restart delay has passed. Holds `_lock`."""
+        now = time.monotonic()
+        restarted = False
+        for i, worker in enumerate(self._workers):
+            if worker.restart_at is not None and worker.restart_at <= now:
+                self.restarts += 1
+                metrics.count("sentiment_pool_restarts")
+                self._workers[i] = self._start_worker(
+                    worker.worker_id, worker.startup_failures
+                )
+                restarted = True
+        if restarted and self._waiting:
+            waiting, self._waiting = self._waiting, []
+            for batch_id in waiting:
+                if batch_id in self._batches:
+                    self._send(self._batches[batch_id])
+
+    def _on_worker_exit(self, worker: _Worker):
+        """Schedules the restart of a dead worker, or retires it. Holds `_lock`."""
+        # Drain anything the worker sent before it died.
+        while worker.results.poll():
+            try:
+                self._handle(worker.results.recv())
+            except (EOFError, OSError):
+                break
+        worker.results.close()
+        delay = 0.0
+        if not worker.ready:
+            worker.startup_failures += 1
+            delay = min(
+                self.restart_backoff * 2 ** (worker.startup_failures - 1),
+                self.max_restart_backoff,
+            )
+        if worker.startup_failures >= self.max_startup_failures:
+            log.error(
+                "Sentiment worker %d failed to start %d times in a row (exit code %s); "
+                "not restarting it",
+                worker.worker_id,
+                worker.startup_failures,
+                worker.process.exitcode,
+            )
+            worker.restart_at = math.inf
+        else:
+            log.warning(
+                "Sentiment worker %d exited with code %s; restarting in %.1fs",
+                worker.worker_id,
+                worker.process.exitcode,
+                delay,
+            )
+            worker.restart_at = time.monotonic() + delay
+        lost, worker.outstanding = worker.outstanding, set()
+        for batch_id in sorted(lost):
+            self._retry_or_fail(batch_id, "worker died")
+        if all(w.restart_at == math.inf for w in self._workers):
+            self._failure = (
+                f"every worker failed to start {self.max_startup_failures} times "
+                f"(is model '{self.model_name}' installed?)"
+            )
+            log.error("SentimentWorkerPool giving up: %s", self._failure)
+            self._fail_all()
+
+    def _supervise(self):
+        """Collects worker results and restarts dead workers until the pool is closed."""
+        while not self._closing.is_set() and self._failure is None:
+            with self._lock:
+                self._restart_due_workers()
+                connections = [
+                    worker.results
+                    for worker in self._workers
+                    if worker.restart_at is None
+                ]
+            ready = multiprocessing.connection.wait(connections, timeout=0.2)
+            with self._lock:
+                for connection in ready:
+                    try:
+                        message = connection.recv()
+                    except (EOFError, OSError):
+                        continue  # worker exited; handled by the liveness check below
+                    self._handle(message)
+                for worker in self._workers:
+                    if (
+                        worker.restart_at is not None
+                        or worker.process.is_alive()
+                        or self._closing.is_set()
+                    ):
+                        continue
+                    self._on_worker_exit(worker)
+
+    def _check_usable(self):
+        if self._closing.is_set():
+            raise RuntimeError("SentimentWorkerPool is closed")
+        if self._failure is not None:
+            raise RuntimeError(f"SentimentWorkerPool failed: {self._failure}")
+
+    def submit(self, article_ids: list, texts: list[str], results: queue.Queue) -> int:
+        """
+        Queues one batch for scoring and returns its batch ID. Blocks while
+        `max_pending_batches` batches are already in flight. The finished batch is put on
+        `results` as `(batch_id, article_ids, scores)`.
+        Raises RuntimeError if the pool is closed or has given up on its workers.
+        """
+        self._check_usable()
+        self._slots.acquire()
+        texts = [text if isinstance(text, str) else str(text or "") for text in texts]
+        with self._lock:
+            try:
+                # The pool may have closed or failed while this call waited for a slot.
+                self._check_usable()
+            except RuntimeError:
+                self._slots.release()
+                raise
+            batch = _Batch(next(self._batch_ids), list(article_ids), texts, results)
+            self._batches[batch.batch_id] = batch
+            self._dispatch(batch)
+        return batch.batch_id
+
+    def score_stream(
+        self, items: Iterable[tuple[Hashable, str]], ordered: bool = True
+    ) -> Iterator[tuple[Hashable, float, float]]:
+        """
+        Scores `(article_id, text)` pairs on the pool, consuming `items` lazily on a feeder
+        thread that blocks when the pool is saturated.
+        Args:
+            items (Iterable[tuple]): Article IDs and texts.
+            ordered (bool, optional): Yield results in input order. If False, each batch is
+                                      yielded as soon as it finishes.
+        Yields:
+            tuple: `(article_id, polarity, subjectivity)`; FAILED_SCORE values (NaN) for
+                   articles whose batch could not be scored.
+        """
+        # Each stream collects its batches on its own queue, so results of a stream the
+        # consumer abandoned can never surface in another one.
+        results = queue.Queue()
+        submitted = []  # batch IDs in input order; the feeder appends, then sets done
+        feeder_done = threading.Event()
+        stop = threading.Event()
+        feeder_error = []
+
+        def feed():
+            try:
+                iterator = iter(items)
+                while not stop.is_set() and (
+                    chunk := list(itertools.islice(iterator, self.batch_size))
+                ):
+                    ids, texts = zip(*chunk)
+                    submitted.append(self.submit(ids, texts, results))
+            except BaseException as e:
+                feeder_error.append(e)
+            finally:
+                feeder_done.set()
+                results.put(None)  # wake the consumer
+
+        feeder = threading.Thread(
+            target=feed, name="sentiment-pool-feeder", daemon=True
+        )
+        feeder.start()
+        ready = {}
+        yielded = 0
+        try:
+            while True:
+                if ordered:
+                    while yielded < len(submitted) and submitted[yielded] in ready:
+                        article_ids, scores = ready.pop(submitted[yielded])
+                        yield from (
+                            (article_id, polarity, subjectivity)
+                            for article_id, (polarity, subjectivity) in zip(
+                                article_ids, scores
+                            )
+                        )
+                        yielded += 1
+                if feeder_done.is_set() and yielded == len(submitted):
+                    break
+                result = results.get()
+                if result is None:
+                    continue
+                batch_id, article_ids, scores = result
+                if ordered:
+                    ready[batch_id] = (article_ids, scores)
+                else:
+                    yielded += 1
+                    yield from (
+                        (article_id, polarity, subjectivity)
+                        for article_id, (polarity, subjectivity) in zip(
+                            article_ids, scores
+                        )
+                    )
+        finally:
+            # Also runs on GeneratorExit: a consumer that stops early stops the feeder
+            # from submitting batches nobody will read.
+            stop.set()
+        feeder.join()
+        if feeder_error:
+            raise feeder_error[0]
+
+    def stats(self) -> dict:
+        """Worker count, restarts, failed batches, in-flight batches and startup times."""
+        with self._lock:
+            return {
+                "workers": self.num_workers,
+                "alive": sum(w.process.is_alive() for w in self._workers),
+                "retired": sum(w.restart_at == math.inf for w in self._workers),
+                "restarts": self.restarts,
+                "failed_batches": self.failed_batches,
+                "in_flight_batches": len(self._batches),
+                "startup_seconds": list(self.startup_seconds),
+            }
+
+    def close(self, timeout: float = 10.0):
+        """
+        Stops the workers after their current batch and shuts down the supervisor.
+        Batches still unfinished get FAILED_SCORE, so streams reading them and producers
+        blocked in `submit` wake up instead of waiting forever.
+        """
+        self._closing.set()
+        self._supervisor.join()
+        with self._lock:
+            self._fail_all()
+        metrics.unregister_gauge(self._gauge_name)
+        for worker in self._workers:
+            if worker.restart_at is None:
+                worker.tasks.put(None)
+        deadline = time.monotonic() + timeout
+        for worker in self._workers:
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+            if worker.process.is_alive():
+                worker.process.terminate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    # Scaling benchmark: throughput with 1, 2, 4, ... workers up to the CPU count, then a
+    # supervision check where a worker is killed mid-stream.
+    import os
+    import signal
+    import sys
+
+    model = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MODEL_NAME
+    NUM_ARTICLES = 20_000
+    articles = [
+        (
+            i,
+            f"Shares of company {i % 500} rallied {i % 9}% after strong quarterly sales, "
+            f"although analysts remain cautious about weak guidance and rising costs.",
+        )
+        for i in range(NUM_ARTICLES)
+    ]
+
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, *(2**k for k in range(1, cpus.bit_length())), cpus})
+    baseline = None
+    for count in counts:
+        with SentimentWorkerPool(num_workers=count, model_name=model) as pool:
+            list(pool.score_stream(articles[: count * 64]))  # wait for warm-up
+            start = time.perf_counter()
+            results = list(pool.score_stream(articles))
+            elapsed = time.perf_counter() - start
+            rate = NUM_ARTICLES / elapsed
+            baseline = baseline or rate
+            assert [r[0] for r in results] == [a[0] for a in articles]
+            startup = max(pool.stats()["startup_seconds"])
+            print(
+                f"{count:>3} workers: {rate:8,.0f} articles/s ({rate / baseline:.2f}x), "
+                f"worker startup {startup:.2f}s"
+            )
+
+    with SentimentWorkerPool(num_workers=2, model_name=model) as pool:
+        killed = False
+        results = []
+        for row in pool.score_stream(articles):
+            results.append(row)
+            if not killed and len(results) == 1_000:
+                os.kill(pool._workers[0].process.pid, signal.SIGKILL)
+                killed = True
+        failed = sum(1 for row in results if math.isnan(row[1]))
+        print(
+            f"Killed a worker mid-stream: {len(results):,} results in order, "
+            f"{failed} failed, stats {pool.stats()}"
+        )
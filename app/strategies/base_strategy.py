@@ -18,6 +18,20 @@ class BaseStrategy(ABC):
         """
         self.strategy_name = strategy_name
         self.strategy_config = strategy_config if strategy_config else {}
+        self.feature_store = None
+
+    def attach_feature_store(self, feature_store):
+        """
+        Shares a `FeatureStore` (app.feature_engineering.feature_store) with this strategy,
+        so features other strategies already computed for the current bar are reused.
+        """
+        self.feature_store = feature_store
+
+    def feature(self, symbol: str, name: str, **params):
+        """Value of feature `name` for `symbol` at its latest bar, from the attached store."""
+        if self.feature_store is None:
+            raise RuntimeError(f"{self.strategy_name} has no feature store attached")
+        return self.feature_store.get(symbol, name, **params)
 
     @abstractmethod
     def generate_signals(self, data: dict) -> list[dict]:
@@ -44,6 +58,37 @@ class BaseStrategy(ABC):
         """
         pass
 
+    # Event-driven interface. A strategy that overrides these keeps only the incremental
+    # state it needs and is driven by an EventDispatcher (app.strategies.dispatcher)
+    # instead of receiving its full input on every `generate_signals` call.
+
+    def on_bar(self, symbol: str, bar: dict) -> list[dict]:
+        """
+        Handles a new price bar for `symbol`.
+        Args:
+            symbol (str): The bar's symbol.
+            bar (dict): At least 'close'; optionally 'timestamp', 'high', 'low', 'volume'.
+        Returns:
+            list[dict]: Trading signals, as from `generate_signals`.
+        """
+        return []
+
+    def on_article(self, article: dict) -> list[dict]:
+        """
+        Handles a new article (with 'content' and 'tickers_mentioned').
+        Returns:
+            list[dict]: Trading signals, as from `generate_signals`.
+        """
+        return []
+
+    def on_timer(self, timestamp: float) -> list[dict]:
+        """
+        Called periodically by the dispatcher (see its `timer_interval`).
+        Returns:
+            list[dict]: Trading signals, as from `generate_signals`.
+        """
+        return []
+
     def get_name(self) -> str:
         """
         Returns the name of the strategy.
@@ -0,0 +1,319 @@
+# app/strategies/mean_reversion_strategy/engine.py
+# Vectorized engines for the mean reversion z-score rule used by MeanReversionStrategy:
+# a bar's price is compared with the mean and (population) standard deviation of the
+# previous `lookback` prices; z < -threshold is a BUY, z > threshold a SELL, and flat
+# windows produce nothing.
+# - Batch: z-scores for a whole symbol x time price matrix, or for one bar across many
+#   symbols, with NumPy.
+# - Streaming: per-symbol ring buffers with rolling sums, so each new bar costs O(1) per
+#   symbol regardless of the lookback.
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+DEFAULT_LOOKBACK = 20
+DEFAULT_THRESHOLD = 2.0
+DEFAULT_QUANTITY = 10
+
+ACTION_SELL = -1
+ACTION_NONE = 0
+ACTION_BUY = 1
+
+
+def window_stats(windows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and population standard deviation along the last axis of `windows`, summed
+    left to right (`cumsum`) like the original strategy's `sum()`, so results are
+    bit-for-bit identical to it, including std == 0 for flat windows.
+    """
+    length = windows.shape[-1]
+    mean = np.cumsum(windows, axis=-1)[..., -1] / length
+    squared = (windows - mean[..., None]) ** 2
+    std = np.sqrt(np.cumsum(squared, axis=-1)[..., -1] / length)
+    return mean, std
+
+
+def zscore_actions(
+    current: np.ndarray, mean: np.ndarray, std: np.ndarray, threshold: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Z-scores and actions (ACTION_BUY / ACTION_SELL / ACTION_NONE) for prices `current`
+    against window `mean` and `std`. Positions with std == 0 or NaN inputs get z = NaN.
+    """
+    valid = std > 0
+    z = np.full(np.shape(current), np.nan)
+    np.divide(current - mean, std, out=z, where=valid)
+    actions = np.zeros(np.shape(current), dtype=np.int8)
+    actions[valid & (z < -threshold)] = ACTION_BUY
+    actions[valid & (z > threshold)] = ACTION_SELL
+    return z, actions
+
+
+def rolling_zscores(
+    prices: np.ndarray, lookback: int = DEFAULT_LOOKBACK, chunk_size: int = 256
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling z-scores for a (symbols, time) price matrix: column t is scored against
+    columns t - lookback .. t - 1. The first `lookback` columns (and any window with a NaN)
+    are NaN. Time is processed in chunks so memory stays at about
+    symbols x chunk_size x lookback values.
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (z, mean), both shaped like `prices`.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    num_symbols, num_bars = prices.shape
+    z = np.full(prices.shape, np.nan)
+    means = np.full(prices.shape, np.nan)
+    if num_bars <= lookback:
+        return z, means
+    # windows[:, i] holds prices[:, i : i + lookback], the window for bar i + lookback.
+    windows = sliding_window_view(prices[:, :-1], lookback, axis=1)
+    for start in range(0, windows.shape[1], chunk_size):
+        chunk = windows[:, start : start + chunk_size]
+        mean, std = window_stats(chunk)
+        bars = slice(start + lookback, start + lookback + chunk.shape[1])
+        z[:, bars], _ = zscore_actions(prices[:, bars], mean, std, 0.0)
+        means[:, bars] = mean
+    return z, means
+
+
+def make_signal(
+    symbol: str, action: int, current_price: float, z_score: float, mean_price: float
+) -> dict:
+    """Signal dict in MeanReversionStrategy's format."""
+    if action == ACTION_BUY:
+        return {
+            "symbol": symbol,
+            "action": "BUY",
+            "quantity": DEFAULT_QUANTITY,
+            "reason": f"Price {current_price} is {-z_score:.2f} std devs below mean {mean_price:.2f}",
+        }
+    return {
+        "symbol": symbol,
+        "action": "SELL",
+        "quantity": DEFAULT_QUANTITY,
+        "reason": f"Price {current_price} is {z_score:.2f} std devs above mean {mean_price:.2f}",
+    }
+
+
+class StreamingMeanReversionEngine:
+    """
+    Incremental z-score engine for a fixed symbol universe. Each symbol keeps its last
+    `lookback` prices in a ring buffer plus their running sum and sum of squares, so a new
+    bar updates every symbol in O(1). Sums are kept relative to a per-symbol reference
+    price to avoid cancellation, and symbols whose approximate z-score lies within
+    rounding distance of the threshold (or whose window is nearly flat) are re-checked
+    exactly against their buffer, so actions match the batch engine and the original
+    strategy.
+    """
+
+    # Running sums are rebuilt from the buffers after this many pushes to stop drift.
+    REFRESH_INTERVAL = 10_000
+    # Relative z-score band around the threshold that is re-checked exactly.
+    RECHECK_TOLERANCE = 1e-6
+
+    def __init__(
+        self,
+        symbols: list[str],
+        lookback: int = DEFAULT_LOOKBACK,
+        threshold: float = DEFAULT_THRESHOLD,
+    ):
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.lookback = lookback
+        self.threshold = threshold
+        n = len(self.symbols)
+        self._all = np.arange(n)
+        self.buffer = np.zeros((n, lookback), dtype=np.float64)
+        self.position = np.zeros(n, dtype=np.int64)  # next slot to overwrite
+        self.filled = np.zeros(n, dtype=np.int64)  # prices seen, capped at lookback
+        self.reference = np.full(n, np.nan)
+        self.sum = np.zeros(n, dtype=np.float64)  # of (price - reference)
+        self.sum_sq = np.zeros(n, dtype=np.float64)
+        self._pushes_since_refresh = 0
+
+    def windows(self, rows: np.ndarray = None) -> np.ndarray:
+        """The selected symbols' buffered prices, oldest first."""
+        rows = self._all if rows is None else rows
+        order = (self.position[rows, None] + np.arange(self.lookback)) % self.lookback
+        return self.buffer[rows[:, None], order]
+
+    def _refresh(self):
+        in_window = np.arange(self.lookback) < self.filled[:, None]
+        deviations = np.where(in_window, self.buffer - self.reference[:, None], 0.0)
+        self.sum = deviations.sum(axis=1)
+        self.sum_sq = (deviations**2).sum(axis=1)
+        self._pushes_since_refresh = 0
+
+    def evaluate(
+        self, prices: np.ndarray, rows: np.ndarray = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate z-scores and exact actions of `prices` against the current windows,
+        without adding them. `rows` selects the symbols `prices` belongs to (all symbols
+        if None). Symbols with fewer than `lookback` prices get z = NaN and no action.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        select = slice(None) if rows is None else rows
+        ready = self.filled[select] >= self.lookback
+        mean = self.sum[select] / self.lookback
+        variance = self.sum_sq[select] / self.lookback - mean * mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = (prices - self.reference[select] - mean) / np.sqrt(variance)
+        z[~ready] = np.nan
+        distance = np.abs(np.abs(z) - self.threshold)
+        recheck = ready & ~(
+            (distance > self.RECHECK_TOLERANCE * self.threshold)
+            & (variance > 1e-9 * (mean * mean + 1.0))
+        )
+        actions = np.zeros(len(prices), dtype=np.int8)
+        actions[ready & (z < -self.threshold)] = ACTION_BUY
+        actions[ready & (z > self.threshold)] = ACTION_SELL
+        if recheck.any():
+            exact_rows = (self._all if rows is None else np.asarray(rows))[recheck]
+            exact_mean, exact_std = window_stats(self.windows(exact_rows))
+            z[recheck], actions[recheck] = zscore_actions(
+                prices[recheck], exact_mean, exact_std, self.threshold
+            )
+        return z, actions
+
+    def push(self, prices: np.ndarray, rows: np.ndarray = None):
+        """Adds one new price per selected symbol (all symbols if `rows` is None)."""
+        prices = np.asarray(prices, dtype=np.float64)
+        if rows is None:
+            rows, select = self._all, slice(None)
+        else:
+            rows = select = np.asarray(rows)
+        reference = self.reference[select]
+        new_symbols = np.isnan(reference)
+        if new_symbols.any():
+            reference[new_symbols] = prices[new_symbols]
+            self.reference[select] = reference
+        slots = self.position[select]
+        filled = self.filled[select]
+        flat_index = rows * self.lookback + slots
+        flat_buffer = self.buffer.reshape(-1)
+        old = flat_buffer.take(flat_index) - reference
+        old[filled < self.lookback] = 0.0
+        new = prices - reference
+        self.sum[select] += new - old
+        self.sum_sq[select] += new * new - old * old
+        flat_buffer[flat_index] = prices
+        slots += 1
+        slots[slots == self.lookback] = 0
+        self.position[select] = slots
+        np.minimum(filled + 1, self.lookback, out=filled)
+        self.filled[select] = filled
+        self._pushes_since_refresh += 1
+        if self._pushes_since_refresh >= self.REFRESH_INTERVAL:
+            self._refresh()
+
+    def on_bar(
+        self, prices: np.ndarray, rows: np.ndarray = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Evaluates `prices` against the current windows, then adds them. Returns (z, actions)."""
+        result = self.evaluate(prices, rows)
+        self.push(prices, rows)
+        return result
+
+    def seed(self, history: np.ndarray):
+        """Loads a (symbols, time) price history; only the last `lookback` bars are kept."""
+        for column in np.asarray(history, dtype=np.float64)[:, -self.lookback :].T:
+            self.push(column)
+
+    def signals(self, prices: np.ndarray) -> list[dict]:
+        """
+        Evaluates and adds a full bar of prices (one per symbol, in `symbols` order) and
+        returns signal dicts, with exact z-scores and means, for the symbols that fire.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        _, actions = self.evaluate(prices)
+        firing = np.flatnonzero(actions)
+        mean, std = window_stats(self.windows(firing))
+        z, _ = zscore_actions(prices[firing], mean, std, self.threshold)
+        self.push(prices)
+        return [
+            make_signal(self.symbols[i], actions[i], prices[i], z_i, mean_i)
+            for i, z_i, mean_i in zip(firing, z.tolist(), mean.tolist())
+        ]
+
+
+if __name__ == "__main__":
+    # Agreement with the original per-symbol loop, and per-bar cost for 5,000 symbols.
+    import time
+
+    from app.strategies.mean_reversion_strategy.main import MeanReversionStrategy
+
+    rng = np.random.default_rng(0)
+    NUM_SYMBOLS, NUM_BARS, LOOKBACK, THRESHOLD = 5_000, 260, 20, 2.0
+    returns = rng.standard_t(4, size=(NUM_SYMBOLS, NUM_BARS)) * 0.01
+    prices = np.round(100 * np.exp(np.cumsum(returns, axis=1)), 2)
+    prices[:10] = 50.0  # flat symbols must never signal
+    symbols = [f"S{i}" for i in range(NUM_SYMBOLS)]
+    check_bars = range(NUM_BARS - 40, NUM_BARS)
+
+    def strategy():
+        return MeanReversionStrategy(
+            {"lookback_period": LOOKBACK, "std_dev_threshold": THRESHOLD}
+        )
+
+    original, reference, original_seconds = strategy(), [], 0.0
+    for t in check_bars:
+        data = {
+            s: {
+                "prices": prices[i, t - LOOKBACK : t].tolist(),
+                "current_price": float(prices[i, t]),
+            }
+            for i, s in enumerate(symbols)
+        }
+        start = time.perf_counter()
+        reference.append(original.generate_signals(data))
+        original_seconds += time.perf_counter() - start
+
+    vectorized = strategy()
+    per_bar = [
+        vectorized.generate_signals_from_matrix(
+            symbols, prices[:, t - LOOKBACK : t + 1]
+        )
+        for t in check_bars
+    ]
+
+    start = time.perf_counter()
+    z, means = rolling_zscores(prices, LOOKBACK)
+    batch_seconds = time.perf_counter() - start
+    batch = []
+    for t in check_bars:
+        actions = np.where(z[:, t] < -THRESHOLD, ACTION_BUY, ACTION_NONE)
+        actions[z[:, t] > THRESHOLD] = ACTION_SELL
+        batch.append(
+            [
+                make_signal(symbols[i], actions[i], prices[i, t], z[i, t], means[i, t])
+                for i in np.flatnonzero(actions)
+            ]
+        )
+
+    streaming = strategy()
+    streaming.start_streaming(symbols, prices[:, : check_bars.start])
+    streamed = [streaming.on_universe_bar(prices[:, t]) for t in check_bars]
+
+    engine = StreamingMeanReversionEngine(symbols, LOOKBACK, THRESHOLD)
+    engine.seed(prices[:, : check_bars.start])
+    timings = []
+    for t in check_bars:
+        start = time.perf_counter()
+        engine.on_bar(prices[:, t])
+        timings.append(time.perf_counter() - start)
+
+    print(f"Bars checked: {len(check_bars)}, signals: {sum(map(len, reference)):,}")
+    print(
+        f"Matches original -- per-bar matrix: {per_bar == reference}, "
+        f"rolling batch: {batch == reference}, streaming: {streamed == reference}, "
+        f"performance: {vectorized.get_performance() == streaming.get_performance() == original.get_performance()}"
+    )
+    print(
+        f"Original loop: {original_seconds / len(check_bars) * 1000:.1f} ms per bar; "
+        f"streaming on_bar (z-scores + actions): median {np.median(timings) * 1e6:.0f} us "
+        f"per bar for {NUM_SYMBOLS:,} symbols"
+    )
+    print(
+        f"Rolling batch: {NUM_SYMBOLS:,} x {NUM_BARS} matrix in {batch_seconds * 1000:.0f} ms"
+    )
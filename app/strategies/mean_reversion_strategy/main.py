@@ -1,5 +1,17 @@
 # app/strategies/mean_reversion_strategy/main.py
+from collections import deque
+
+import numpy as np
+
 from app.strategies.base_strategy import BaseStrategy
+from app.strategies.mean_reversion_strategy.engine import (
+    ACTION_BUY,
+    ACTION_SELL,
+    StreamingMeanReversionEngine,
+    make_signal,
+    window_stats,
+    zscore_actions,
+)
 
 # Placeholder for actual data models or specific data handling
 # from app.core.data_models import TradingSignal
@@ -19,6 +31,9 @@ class MeanReversionStrategy(BaseStrategy):
         self.lookback_period = self.strategy_config.get("lookback_period", 20)
         self.std_dev_threshold = self.strategy_config.get("std_dev_threshold", 2.0)
         self.historical_performance = {"pnl": 0.0, "trades_executed": 0}  # Simplified
+        self.engine = None  # StreamingMeanReversionEngine, see start_streaming
+        # symbol -> deque of the last lookback closes, for on_bar
+        self._recent_closes = {}
 
     def generate_signals(self, data: dict) -> list[dict]:
         """
@@ -88,6 +103,122 @@ class MeanReversionStrategy(BaseStrategy):
 
         return signals
 
+    def _record_trades(self, signals: list[dict]):
+        for signal in signals:
+            # Same mock P&L as generate_signals.
+            self.historical_performance["pnl"] += (
+                10 if signal["action"] == "BUY" else -5
+            )
+            self.historical_performance["trades_executed"] += 1
+
+    def generate_signals_from_matrix(
+        self, symbols: list[str], prices: np.ndarray
+    ) -> list[dict]:
+        """
+        Vectorized `generate_signals` for aligned price histories: the last column of
+        `prices` (symbols x time) is each symbol's current price and the `lookback_period`
+        columns before it are its window. Produces the same signals as `generate_signals`.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.shape[1] <= self.lookback_period:
+            return []
+        mean, std = window_stats(prices[:, -self.lookback_period - 1 : -1])
+        current = prices[:, -1]
+        z, actions = zscore_actions(current, mean, std, self.std_dev_threshold)
+        signals = [
+            make_signal(symbols[i], actions[i], current[i], z[i], mean[i])
+            for i in np.flatnonzero(actions)
+        ]
+        self._record_trades(signals)
+        return signals
+
+    def generate_signals_from_store(self, symbols: list[str] = None) -> list[dict]:
+        """
+        `generate_signals` on bars held by the attached feature store: each symbol's
+        latest close is scored against the `lookback_period` closes before it. Window
+        statistics are shared with any other strategy reading the same feature.
+        """
+        signals = []
+        store = self.feature_store
+        for symbol in store.symbols() if symbols is None else symbols:
+            history = store.history(symbol)
+            if history is None or len(history) <= self.lookback_period:
+                continue
+            current_price = self.feature(symbol, "close")
+            mean_price, std_dev = self.feature(
+                symbol, "window_stats", window=self.lookback_period, lag=1
+            )
+            if std_dev == 0:
+                continue
+            z_score = (current_price - mean_price) / std_dev
+            if z_score < -self.std_dev_threshold:
+                signals.append(
+                    make_signal(symbol, ACTION_BUY, current_price, z_score, mean_price)
+                )
+            elif z_score > self.std_dev_threshold:
+                signals.append(
+                    make_signal(symbol, ACTION_SELL, current_price, z_score, mean_price)
+                )
+        self._record_trades(signals)
+        return signals
+
+    def start_streaming(
+        self, symbols: list[str], history: np.ndarray = None
+    ) -> StreamingMeanReversionEngine:
+        """
+        Creates the streaming engine for `symbols`, optionally seeded with a
+        (symbols x time) price history; feed it bars with `on_universe_bar`.
+        """
+        self.engine = StreamingMeanReversionEngine(
+            symbols, self.lookback_period, self.std_dev_threshold
+        )
+        if history is not None:
+            self.engine.seed(history)
+        return self.engine
+
+    def on_universe_bar(self, prices: np.ndarray) -> list[dict]:
+        """
+        Streaming `generate_signals`: scores one new price per symbol (in the order given
+        to `start_streaming`) against the previous `lookback_period` prices, then adds it.
+        """
+        signals = self.engine.signals(prices)
+        self._record_trades(signals)
+        return signals
+
+    def on_bar(self, symbol: str, bar: dict) -> list[dict]:
+        """
+        Event-driven `generate_signals` for one symbol: scores the bar's close against
+        the previous `lookback_period` closes, then keeps it. Only the last
+        `lookback_period` closes per symbol are held.
+        """
+        current_price = bar["close"]
+        window = self._recent_closes.get(symbol)
+        if window is None:
+            window = self._recent_closes[symbol] = deque(maxlen=self.lookback_period)
+        signals = []
+        if len(window) == self.lookback_period:
+            mean_price = sum(window) / self.lookback_period
+            std_dev = (
+                sum([(p - mean_price) ** 2 for p in window]) / self.lookback_period
+            ) ** 0.5
+            if std_dev != 0:
+                z_score = (current_price - mean_price) / std_dev
+                if z_score < -self.std_dev_threshold:
+                    signals.append(
+                        make_signal(
+                            symbol, ACTION_BUY, current_price, z_score, mean_price
+                        )
+                    )
+                elif z_score > self.std_dev_threshold:
+                    signals.append(
+                        make_signal(
+                            symbol, ACTION_SELL, current_price, z_score, mean_price
+                        )
+                    )
+        window.append(current_price)
+        self._record_trades(signals)
+        return signals
+
     def get_performance(self) -> dict:
         """
         Reports the performance of the mean reversion strategy.
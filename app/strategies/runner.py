@@ -0,0 +1,297 @@
+# app/strategies/runner.py
+# Runs several strategies' `generate_signals` concurrently, each with its own deadline,
+# and merges their signals with strategy attribution. Total latency is the slowest
+# strategy within its budget instead of the sum over all strategies.
+# Strategies run on threads: NumPy-heavy strategy code releases the GIL, and strategy
+# objects keep their in-memory state (P&L, streaming engines) across runs. A thread
+# cannot be killed, so a strategy that overruns its deadline is reported as timed out,
+# its late result is discarded, and it is skipped on later runs until that call returns.
+# The late call still runs to completion on its thread; when it returns, the performance
+# it recorded for signals that were never emitted is rolled back (see `get_performance`).
+import copy
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from app.core.logging_utils import get_sampled_logger
+from app.core.metrics import metrics
+from app.strategies.base_strategy import BaseStrategy
+
+log = get_sampled_logger(__name__)
+
+DEFAULT_TIMEOUT_SECONDS = 5.0
+
+STATUS_OK = "ok"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+STATUS_SKIPPED = "skipped"  # previous call still running past its deadline
+
+
+class StrategyRunner:
+    """
+    Concurrent, deadline-bounded execution of a set of strategies.
+    Typical use:
+        runner = StrategyRunner([sentiment, mean_reversion], timeouts={"SentimentStrategy": 2.0})
+        result = runner.run({"SentimentStrategy": {...}, "MeanReversionStrategy": {...}})
+        result["signals"]     # merged, each with 'strategy_name'
+        result["strategies"]  # per strategy: status, seconds, num_signals, error
+        runner.get_performance("SentimentStrategy")  # excludes calls that timed out
+    A call that misses its deadline keeps running and may update its strategy's state.
+    When it returns, the strategy attribute holding its performance dict (the object
+    `get_performance` returns, as the built-in strategies do) is set back to a copy of
+    its value before the call, whether the call mutated that dict or replaced it.
+    Changes made to it by anyone else while the call overran are undone as well. Other
+    state, such as streaming engines, is not rolled back. Until then, read performance
+    through the runner's `get_performance`, which serves the pre-call value.
+    """
+
+    def __init__(
+        self,
+        strategies: list[BaseStrategy],
+        default_timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        timeouts: dict = None,
+        max_workers: int = None,
+    ):
+        """
+        Args:
+            strategies (list[BaseStrategy]): Strategies to run; names must be unique.
+            default_timeout (float, optional): Deadline in seconds for each strategy's call.
+            timeouts (dict, optional): Per-strategy deadlines by strategy name.
+            max_workers (int, optional): Thread count. Defaults to two per strategy, so
+                                         strategies stuck past their deadline still
+                                         leave a thread for every other strategy.
+        """
+        names = [strategy.get_name() for strategy in strategies]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Strategy names must be unique: {names}")
+        self.strategies = list(strategies)
+        self.default_timeout = default_timeout
+        self.timeouts = dict(timeouts or {})
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or 2 * max(1, len(strategies)),
+            thread_name_prefix="strategy",
+        )
+        # name -> (future, performance before the call) of a call that overran its
+        # deadline; removed once it has returned and its performance is rolled back.
+        self._running = {}
+        self._lock = threading.Lock()
+        self.late_completions = 0
+
+    def timeout_for(self, name: str) -> float:
+        return self.timeouts.get(name, self.default_timeout)
+
+    def get_performance(self, name: str) -> dict:
+        """
+        `get_performance()` of strategy `name`, without the effects of a call that missed
+        its deadline: while such a call is still running, its pre-call value is returned.
+        """
+        strategy = next(s for s in self.strategies if s.get_name() == name)
+        with self._lock:
+            running = self._running.get(name)
+            if running is not None:
+                return copy.deepcopy(running[1][1])
+            return strategy.get_performance()
+
+    def _late_completion(self, strategy: BaseStrategy, performance: tuple, future):
+        """Done callback of a call that overran its deadline: undoes its P&L, flags it."""
+        name = strategy.get_name()
+        live, before, attribute = performance
+        with self._lock:
+            if attribute is not None:
+                setattr(strategy, attribute, before)
+            elif isinstance(live, dict) and strategy.get_performance() is live:
+                live.clear()
+                live.update(before)
+            else:
+                log.warning(
+                    "%s keeps its performance outside an attribute; the late call's "
+                    "changes to it cannot be rolled back",
+                    name,
+                )
+            self._running.pop(name, None)
+            self.late_completions += 1
+        metrics.count("strategy_late_completions")
+        log.warning(
+            "%s returned after its deadline; its signals and performance changes were discarded",
+            name,
+        )
+
+    @staticmethod
+    def _call(strategy: BaseStrategy, data: dict) -> tuple[list[dict], float]:
+        start = time.perf_counter()
+        signals = strategy.generate_signals(data)
+        return signals, time.perf_counter() - start
+
+    def run(self, data: dict, shared: bool = False) -> dict:
+        """
+        Runs every strategy once and waits until each has finished or passed its deadline.
+        Args:
+            data (dict): Input per strategy name ({name: data}), or, with `shared=True`,
+                         one input dict given to every strategy.
+            shared (bool, optional): Whether `data` is a single input for all strategies.
+        Returns:
+            dict: `{'signals': [...], 'strategies': {name: {...}}, 'elapsed_seconds': float}`.
+                  Signals are copies carrying 'strategy_name', in strategy order.
+        """
+        start = time.perf_counter()
+        report, futures = {}, {}
+        for strategy in self.strategies:
+            name = strategy.get_name()
+            with self._lock:
+                previous = self._running.get(name)
+            if previous is not None:
+                report[name] = _outcome(STATUS_SKIPPED, 0.0)
+                log.warning("Skipping %s: its previous run is still in progress", name)
+                continue
+            strategy_data = data if shared else data.get(name, {})
+            live = strategy.get_performance()
+            performance = (
+                live,
+                copy.deepcopy(live),
+                _attribute_holding(strategy, live),
+            )
+            future = self._executor.submit(self._call, strategy, strategy_data)
+            futures[future] = (
+                name,
+                start + self.timeout_for(name),
+                strategy,
+                performance,
+            )
+
+        pending = set(futures)
+        while pending:
+            now = time.perf_counter()
+            expired = {f for f in pending if futures[f][1] <= now}
+            for future in expired:
+                name, _, strategy, performance = futures[future]
+                with self._lock:
+                    self._running[name] = (future, performance)
+                future.add_done_callback(
+                    functools.partial(self._late_completion, strategy, performance)
+                )
+                report[name] = _outcome(STATUS_TIMEOUT, now - start)
+                log.warning(
+                    "%s missed its %.3fs deadline; result discarded",
+                    name,
+                    self.timeout_for(name),
+                )
+            pending -= expired
+            if not pending:
+                break
+            next_deadline = min(futures[f][1] for f in pending)
+            done, pending = wait(
+                pending,
+                timeout=max(0.0, next_deadline - now),
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                name = futures[future][0]
+                try:
+                    signals, seconds = future.result()
+                except Exception as e:
+                    report[name] = _outcome(
+                        STATUS_ERROR, time.perf_counter() - start, error=repr(e)
+                    )
+                    log.exception("%s failed while generating signals", name)
+                    continue
+                report[name] = _outcome(STATUS_OK, seconds, signals)
+
+        merged, ordered_report = [], {}
+        for strategy in self.strategies:
+            name = strategy.get_name()
+            outcome = ordered_report[name] = report[name]
+            metrics.observe(
+                f"strategy_{name}", outcome["seconds"], outcome["num_signals"]
+            )
+            if outcome["status"] != STATUS_OK:
+                metrics.count(f"strategy_{outcome['status']}")
+            merged.extend(
+                {**signal, "strategy_name": name} for signal in outcome.pop("signals")
+            )
+        return {
+            "signals": merged,
+            "strategies": ordered_report,
+            "elapsed_seconds": time.perf_counter() - start,
+        }
+
+    def close(self, wait_for_running: bool = False):
+        """Shuts the thread pool down (without waiting for overrunning strategies by default)."""
+        self._executor.shutdown(wait=wait_for_running, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def _attribute_holding(strategy: BaseStrategy, value) -> str | None:
+    """Name of the instance attribute of `strategy` that holds `value` itself, if any."""
+    for attribute, held in getattr(strategy, "__dict__", {}).items():
+        if held is value:
+            return attribute
+    return None
+
+
+def _outcome(status: str, seconds: float, signals: list = None, error: str = None):
+    signals = signals or []
+    return {
+        "status": status,
+        "seconds": seconds,
+        "num_signals": len(signals),
+        "error": error,
+        "signals": signals,
+    }
+
+
+if __name__ == "__main__":
+    # Three strategies that each take ~0.2s, plus one that hangs: the run finishes at
+    # about the slowest healthy strategy's time, the hung one times out and is skipped
+    # on the next run while the others carry on. Its late trades are not counted.
+    class SleepyStrategy(BaseStrategy):
+        def __init__(self, name: str, seconds: float):
+            super().__init__(strategy_name=name)
+            self.seconds = seconds
+            self.historical_performance = {"pnl": 0.0, "trades_executed": 0}
+
+        def generate_signals(self, data: dict) -> list[dict]:
+            time.sleep(self.seconds)
+            # Replaces the dict rather than mutating it; the rollback handles both.
+            performance = self.historical_performance
+            self.historical_performance = {
+                "pnl": performance["pnl"] + 10,  # mock P&L
+                "trades_executed": performance["trades_executed"] + 1,
+            }
+            return [
+                {"symbol": data.get("symbol", "AAPL"), "action": "BUY", "quantity": 1}
+            ]
+
+        def get_performance(self) -> dict:
+            return self.historical_performance
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    strategies = [SleepyStrategy(f"Strategy{i}", 0.2) for i in range(3)]
+    strategies.append(SleepyStrategy("HungStrategy", 3.0))
+
+    start = time.perf_counter()
+    for strategy in strategies[:3]:
+        strategy.generate_signals({})
+    print(f"Sequential (healthy strategies only): {time.perf_counter() - start:.2f}s")
+
+    with StrategyRunner(strategies, default_timeout=0.5) as runner:
+        for run in range(2):
+            result = runner.run({"symbol": "MSFT"}, shared=True)
+            print(
+                f"Run {run + 1}: {result['elapsed_seconds']:.2f}s, "
+                f"{len(result['signals'])} signals from "
+                f"{sorted({s['strategy_name'] for s in result['signals']})}"
+            )
+            for name, outcome in result["strategies"].items():
+                print(f"  {name}: {outcome['status']} in {outcome['seconds']:.2f}s")
+    runner.close(wait_for_running=True)  # let the hung call return
+    for strategy in strategies:
+        print(f"{strategy.get_name()} performance: {strategy.get_performance()}")
+    print(f"Late completions rolled back: {runner.late_completions}")
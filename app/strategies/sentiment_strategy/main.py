@@ -43,41 +43,51 @@ class SentimentStrategy(BaseStrategy):
         # 4. Applying rules/models to convert sentiment + tickers into trade signals.
         # For now, a placeholder:
         for article in articles:
-            content = article.get("content", "")
-            tickers = article.get("tickers_mentioned", [])
-            # sentiment_score = get_sentiment_score(content, self.sentiment_model) # Example
-            # identified_tickers = identify_stock_mentions(content) # Example
-
-            # Placeholder logic: if "positive" sentiment (mocked) and AAPL mentioned, buy.
-            if "positive" in content.lower() and "AAPL" in tickers:
-                signals.append(
-                    {
-                        "symbol": "AAPL",
-                        "action": "BUY",
-                        "quantity": 10,
-                        "confidence": 0.7,  # Example metric
-                        "source_article_id": article.get("id"),
-                    }
-                )
-                # Simulate P&L for this hypothetical trade for performance tracking
-                self.historical_performance["pnl"] += 10  # mock P&L
-                self.historical_performance["trades_executed"] += 1
-
-            elif "negative" in content.lower() and "TSLA" in tickers:
-                signals.append(
-                    {
-                        "symbol": "TSLA",
-                        "action": "SELL",
-                        "quantity": 5,
-                        "confidence": 0.65,
-                        "source_article_id": article.get("id"),
-                    }
-                )
-                self.historical_performance["pnl"] += 5  # mock P&L
-                self.historical_performance["trades_executed"] += 1
+            signals.extend(self._article_signals(article))
 
         return signals
 
+    def _article_signals(self, article: dict) -> list[dict]:
+        signals = []
+        content = article.get("content", "")
+        tickers = article.get("tickers_mentioned", [])
+        # sentiment_score = get_sentiment_score(content, self.sentiment_model) # Example
+        # identified_tickers = identify_stock_mentions(content) # Example
+
+        # Placeholder logic: if "positive" sentiment (mocked) and AAPL mentioned, buy.
+        if "positive" in content.lower() and "AAPL" in tickers:
+            signals.append(
+                {
+                    "symbol": "AAPL",
+                    "action": "BUY",
+                    "quantity": 10,
+                    "confidence": 0.7,  # Example metric
+                    "source_article_id": article.get("id"),
+                }
+            )
+            # Simulate P&L for this hypothetical trade for performance tracking
+            self.historical_performance["pnl"] += 10  # mock P&L
+            self.historical_performance["trades_executed"] += 1
+
+        elif "negative" in content.lower() and "TSLA" in tickers:
+            signals.append(
+                {
+                    "symbol": "TSLA",
+                    "action": "SELL",
+                    "quantity": 5,
+                    "confidence": 0.65,
+                    "source_article_id": article.get("id"),
+                }
+            )
+            self.historical_performance["pnl"] += 5  # mock P&L
+            self.historical_performance["trades_executed"] += 1
+
+        return signals
+
+    def on_article(self, article: dict) -> list[dict]:
+        """Event-driven `generate_signals` for a single article."""
+        return self._article_signals(article)
+
     def get_performance(self) -> dict:
         """
         Reports the performance of the sentiment strategy.
@@ -1,9 +1,25 @@
-from app.data_ingestion.news_main import run_news_ingestion_pipeline
+import logging
+import queue
+import threading
+from typing import Iterable, Iterator
+
+from app.core.logging_utils import get_sampled_logger
+from app.core.metrics import metrics
+from app.data_ingestion.dedup import ArticleDeduplicator
+from app.data_ingestion.news_main import (
+    iter_news_ingestion_concurrent,
+    run_news_ingestion_pipeline,
+)
+from app.data_ingestion.scrapers.feed_cache import FeedValidatorCache
 from app.sentiment_analysis.main import (
     process_articles_for_sentiment,
     analyze_sentiment_and_generate_signals,
+    iter_articles_for_sentiment,
+    iter_sentiment_signals,
 )
 
+log = get_sampled_logger(__name__)
+
 # Define a default configuration for news sources for simplicity
 DEFAULT_NEWS_SOURCES_CONFIG = [
     {
@@ -14,29 +30,46 @@ DEFAULT_NEWS_SOURCES_CONFIG = [
 ]
 
 
-def run_trading_logic_pipeline(news_sources_config: list[dict] = None) -> list[dict]:
+def run_trading_logic_pipeline(
+    news_sources_config: list[dict] = None,
+    deduplicator: ArticleDeduplicator = None,
+    feed_cache: FeedValidatorCache = None,
+    matcher=None,
+    cache=None,
+    pool=None,
+    model=None,
+    targeted: bool = False,
+) -> list[dict]:
     """
     Orchestrates the full pipeline:
-    1. Ingests news articles.
+    1. Ingests news articles (dropping ones already seen if a deduplicator is given).
     2. Processes articles for sentiment.
     3. Analyzes sentiment to generate trading signals.
+    `feed_cache` is passed to `run_news_ingestion_pipeline`; `matcher`, `cache`, `pool`,
+    `model` and `targeted` to `process_articles_for_sentiment` (see there).
     """
     if news_sources_config is None:
         news_sources_config = DEFAULT_NEWS_SOURCES_CONFIG
 
     # 1. Ingest news articles
     # Assuming run_news_ingestion_pipeline returns articles with 'content' key
-    raw_articles = run_news_ingestion_pipeline(sources_config=news_sources_config)
+    raw_articles = run_news_ingestion_pipeline(
+        sources_config=news_sources_config,
+        feed_cache=feed_cache,
+        deduplicator=deduplicator,
+    )
     if not raw_articles:
-        print("No articles ingested. Skipping further processing.")
+        log.info("No articles ingested. Skipping further processing.")
         return []
 
     # 2. Process articles for sentiment
     # process_articles_for_sentiment expects list of dicts with 'content'
     # and returns list of dicts like {'ticker': 'AAPL', 'sentiment_score': 0.7, ...}
-    analyzed_articles_with_sentiment = process_articles_for_sentiment(raw_articles)
+    analyzed_articles_with_sentiment = process_articles_for_sentiment(
+        raw_articles, matcher, cache, pool, targeted, model
+    )
     if not analyzed_articles_with_sentiment:
-        print("No articles processed for sentiment. Skipping signal generation.")
+        log.info("No articles processed for sentiment. Skipping signal generation.")
         return []
 
     # 3. Analyze sentiment to generate trading signals
@@ -48,6 +81,99 @@ def run_trading_logic_pipeline(news_sources_config: list[dict] = None) -> list[d
     return trading_signals
 
 
+# Maximum number of items buffered between two streaming stages. A full buffer blocks the
+# upstream stage, so memory stays flat however many feeds or articles flow through.
+DEFAULT_STREAM_BUFFER_SIZE = 256
+
+_END_OF_STREAM = object()
+
+
+def _buffered(items: Iterable, maxsize: int) -> Iterator:
+    """
+    Runs `items` on a background thread, handing results over through a bounded queue.
+    Lets an upstream stage (e.g. network ingestion) keep working while downstream stages
+    process what it has produced so far. Exceptions are re-raised in the consumer.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def _put(item) -> bool:
+        """Blocks until `item` is queued or the consumer has gone away."""
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        source = None
+        try:
+            source = iter(items)
+            for item in source:
+                if not _put(item):
+                    return
+            _put(_END_OF_STREAM)
+        except BaseException as e:
+            _put(e)
+        finally:
+            # Closing a generator source runs its cleanup (pool shutdown, cache save)
+            # even when the consumer stopped early. It must happen on this thread,
+            # the one that was running the generator.
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
+
+    threading.Thread(target=_produce, daemon=True).start()
+    try:
+        while True:
+            metrics.set_gauge("stream_buffer_depth", buffer.qsize())
+            item = buffer.get()
+            if item is _END_OF_STREAM:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def stream_trading_logic_pipeline(
+    news_sources_config: list[dict] = None,
+    deduplicator: ArticleDeduplicator = None,
+    buffer_size: int = DEFAULT_STREAM_BUFFER_SIZE,
+    aggregator=None,
+    feed_cache: FeedValidatorCache = None,
+    matcher=None,
+    cache=None,
+    pool=None,
+    model=None,
+    targeted: bool = False,
+) -> Iterator[dict]:
+    """
+    Streaming form of `run_trading_logic_pipeline`, taking the same options.
+    Feeds are fetched concurrently and every stage consumes and yields items incrementally,
+    so the first signals are produced while ingestion is still running. Ingestion runs
+    ahead of scoring by at most `buffer_size` articles. An optional
+    TickerSentimentAggregator turns per-article scores into per-ticker aggregate signals.
+    Yields:
+        dict: Trading signals, in the order their articles finished scoring.
+    """
+    if news_sources_config is None:
+        news_sources_config = DEFAULT_NEWS_SOURCES_CONFIG
+
+    articles = iter_news_ingestion_concurrent(
+        news_sources_config, feed_cache=feed_cache
+    )
+    if deduplicator is not None:
+        articles = deduplicator.filter_new(articles)
+    analyzed_articles = iter_articles_for_sentiment(
+        _buffered(articles, buffer_size), matcher, cache, pool, targeted, model
+    )
+    yield from iter_sentiment_signals(analyzed_articles, aggregator)
+
+
 def log_trading_signals(signals: list[dict]):
     """Logs the generated trading signals."""
     if signals:
@@ -65,6 +191,7 @@ def log_trading_signals(signals: list[dict]):
 
 # Example of how to run the pipeline (optional, can be in a main script)
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     print("Running trading logic pipeline...")
     # To make this runnable, we need to ensure dummy implementations for:
     # - app.data_ingestion.scrapers.rss_scraper.fetch_articles_from_rss
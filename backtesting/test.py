@@ -1,10 +1,43 @@
+import os
+
 import yfinance as yf
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+from app.data_ingestion.price_store import PriceStore
+
+# Run from the repository root: python -m backtesting.test
+
+START, END = "2020-01-01", "2025-01-01"  # END is exclusive, as in yf.download
+
+
+def ensure_bars(store: PriceStore, symbol: str, start: str, end: str):
+    """Downloads whatever part of [start, end) the store does not hold yet for `symbol`."""
+    first = store.first_timestamp(symbol)
+    # `start` may be a holiday or weekend, so allow a few days before the first bar.
+    if first is not None and first > (pd.Timestamp(start) + pd.Timedelta(days=7)).value:
+        # Bars are append-only, so earlier history means reloading the symbol.
+        store.drop_symbol(symbol)
+        first = None
+    if first is None:
+        fetch_start = pd.Timestamp(start)
+    else:
+        fetch_start = pd.Timestamp(store.last_timestamp(symbol)).normalize() + pd.Timedelta(days=1)
+    if fetch_start < pd.Timestamp(end):
+        store.append_dataframe(
+            symbol, yf.download(symbol, start=fetch_start.strftime("%Y-%m-%d"), end=end)
+        )
+
+
 # --- Load historical stock data
+# Bars are cached in the local price store; later runs only download missing dates.
 ticker = "AAPL"
-df = yf.download(ticker, start="2020-01-01", end="2025-01-01")
+store = PriceStore(os.path.join(os.path.dirname(__file__), "..", "data", "prices"))
+ensure_bars(store, ticker, START, END)
+bars = store.read_bars(ticker, START, pd.Timestamp(END) - pd.Timedelta(1))
+df = pd.DataFrame(
+    {column.capitalize(): values for column, values in bars.items() if column != "timestamp"},
+    index=pd.to_datetime(bars["timestamp"]),
+)
 #df = df[['Close']].copy()
-